@@ -0,0 +1,53 @@
+# Time taken to build an element with more and more children, created inside its `with`
+# block or created beforehand and passed to it, up to the given number of children
+# (defaulting to 1M), e.g. `uv run python benchmarks/builder_stack.py 100000`. The time
+# per child should stay the same as the number of children grows.
+
+from __future__ import annotations
+
+import sys
+import time
+from collections.abc import Callable
+
+from domify import html_elements as e
+from domify.base_element import BaseElement
+
+
+def with_block(children: int) -> BaseElement:
+    with e.Select() as select:
+        for i in range(children):
+            e.Option(i, value=i)
+    return select
+
+
+def prebuilt(children: int) -> BaseElement:
+    with e.Form():
+        # Created inside another block, so that each of them is looked up in its
+        # pending children when added to the select
+        options = [e.Option(i, value=i) for i in range(children)]
+        return e.Select(*options)
+
+
+def main() -> None:
+    max_children = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    builders: list[tuple[str, Callable[[int], BaseElement]]] = [
+        ("with block", with_block),
+        ("prebuilt", prebuilt),
+    ]
+    print(f"Python {sys.version.split()[0]}")
+    children = 1000
+    while children <= max_children:
+        for name, builder in builders:
+            start = time.perf_counter()
+            element = builder(children)
+            elapsed = time.perf_counter() - start
+            assert len(element) == children
+            print(
+                f"{name:10} {children:9,} children: {elapsed:8.3f} s, "
+                f"{elapsed / children * 1e6:6.2f} us/child"
+            )
+        children *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Throughput of threads building and rendering their own pages, for 1 up to the given
+# number of threads (defaulting to the number of CPUs). Throughput only scales with the
+# number of threads on free-threaded builds, e.g. `uv run -p 3.14t python
+# benchmarks/free_threading.py`.
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from domify import html_elements as e
+from domify.base_element import BaseElement
+
+PAGES_PER_THREAD = 200
+NAV = e.Nav(*(e.A(f"link {i}", href=f"/{i}") for i in range(50))).freeze()
+
+
+def page(i: int) -> BaseElement:
+    with e.Html() as html:
+        with e.Head():
+            e.Title(f"Page {i}")
+        with e.Body(NAV), e.Table(class_="data"), e.Tbody():
+            for row in range(100):
+                e.Tr(*(e.Td(f"{row}-{col}", class_="cell") for col in range(5)))
+    return html
+
+
+def run(barrier: threading.Barrier) -> None:
+    barrier.wait()
+    for i in range(PAGES_PER_THREAD):
+        page(i).render()
+
+
+def main() -> None:
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    gil = sys.version_info < (3, 13) or sys._is_gil_enabled()  # noqa: SLF001
+    print(f"Python {sys.version.split()[0]}, GIL enabled: {gil}")
+
+    baseline = 0.0
+    for threads in range(1, max_threads + 1):
+        barrier = threading.Barrier(threads + 1)
+        with ThreadPoolExecutor(threads) as executor:
+            futures = [executor.submit(run, barrier) for _ in range(threads)]
+            barrier.wait()
+            start = time.perf_counter()
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - start
+        throughput = threads * PAGES_PER_THREAD / elapsed
+        baseline = baseline or throughput
+        print(
+            f"{threads:3} threads: {throughput:8.1f} pages/s, "
+            f"{throughput / baseline:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Attribute validations per second for the attributes specific to a few elements, each
+# with a value which is valid for it, e.g. `uv run python benchmarks/validation.py`.
+
+from __future__ import annotations
+
+import functools
+import sys
+import timeit
+from collections.abc import Callable
+
+from domify import html_elements as e
+from domify.base_element import BaseElement, _T_attribute
+
+ELEMENTS = [e.Input(), e.A(), e.Link(), e.Meta()]
+CANDIDATES: list[_T_attribute] = ["a b", "utf-8", "allow-forms", "any", 3, 2.5, True]
+NUMBER = 2000
+
+
+def valid_values(element: BaseElement) -> list[tuple[str, _T_attribute]]:
+    values: list[tuple[str, _T_attribute]] = []
+    for key, expected in sorted(element.element_attributes.items()):
+        if not callable(expected):
+            values.append((key, max(expected)))
+            continue
+        for candidate in CANDIDATES:
+            if expected(candidate):
+                values.append((key, candidate))
+                break
+    return values
+
+
+def validate_all(
+    validate: Callable[[str, _T_attribute], bool],
+    values: list[tuple[str, _T_attribute]],
+) -> None:
+    for key, val in values:
+        validate(key, val)
+
+
+def main() -> None:
+    print(f"Python {sys.version.split()[0]}")
+    for element in ELEMENTS:
+        values = valid_values(element)
+        validate = element._validate_attribute  # noqa: SLF001
+        assert all(validate(key, val) for key, val in values)
+        run = functools.partial(validate_all, validate, values)
+        elapsed = min(timeit.repeat(run, number=NUMBER, repeat=20))
+        rate = len(values) * NUMBER / elapsed
+        print(
+            f"{element.name:6} {len(values):3} attributes: {rate:12,.0f} validations/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,9 @@ class FileWriter:
         self,
         class_name: str,
         docstring: str,
-        **kwargs: tuple[bool, bool] | tuple[dict[str, str | None], str, bool],
+        **kwargs: tuple[bool, bool]
+        | tuple[dict[str, str | None], bool]
+        | tuple[set[str]],
     ) -> None:
         super_class = "BaseElement" if class_name == "HtmlElement" else "HtmlElement"
         docstring = "\n".join(
@@ -35,6 +37,8 @@ class FileWriter:
             '    """',
             f"{docstring}",
             '    """',
+            "    __slots__ = ()",
+            "",
         ]
 
         for key, val in kwargs.items():
@@ -43,18 +47,15 @@ class FileWriter:
                 if attrib_value is not default_value:
                     data.append(f"    {key} = {attrib_value}")
             elif isinstance(val[0], dict):
-                attrib_raw_data, annotation_str, sort = val
+                attrib_raw_data, sort = val
                 if attrib_raw_data:
-                    annotation = ""
-                    if any(
-                        x
-                        for x in attrib_raw_data.values()
-                        if x is not None and x.startswith("lambda ")
-                    ):
-                        annotation = f": {annotation_str}"
                     attrib_data = self._format_data_dict(attrib_raw_data, sort=sort)
                     if attrib_data:
-                        data.append(f"    {key}{annotation} = {attrib_data}")
+                        data.append(f"    {key} = {attrib_data}")
+            elif isinstance(val[0], set):
+                if val[0]:
+                    values = ",".join(f"'{x}'" for x in sorted(val[0]))
+                    data.append(f"    {key} = {{{values}}}")
 
         self._classes.append("\n".join(data))
 
@@ -16,6 +16,9 @@ class ElementData:
     global_attributes: bool = False
     element_attributes: dict[str, str | None] = field(default_factory=dict)
     any_attribute: bool = False
+    optional_tags: rules.optional_tags.OptionalTags = field(
+        default_factory=rules.optional_tags.OptionalTags
+    )
 
 
 class Parser:
@@ -25,6 +28,7 @@ class Parser:
 
         self._get_elements()
         self._get_attributes()
+        self._get_optional_tags()
 
         self._write_data()
 
@@ -102,6 +106,10 @@ class Parser:
 
                             attributes[attribute.text] = value
 
+    def _get_optional_tags(self) -> None:
+        for element, optional_tags in rules.optional_tags.parse().items():
+            self._elements[element].optional_tags = optional_tags
+
     def _write_data(self) -> None:
         f = FileWriter(
             Path(__file__).parent.parent.parent.parent
@@ -112,7 +120,7 @@ class Parser:
         f.add_class(
             "HtmlElement",
             "Base class for html elements, contains global attributes.",
-            global_attributes=(self._global_attributes, "_T_attributes_dict", False),
+            global_attributes=(self._global_attributes, False),
         )
         for element_name, element_data in self._elements.items():
             if not element_data.global_attributes:
@@ -122,13 +130,18 @@ class Parser:
                 element_name.capitalize(),
                 element_data.description,
                 is_empty=(element_data.is_empty, False),
-                element_attributes=(
-                    element_data.element_attributes,
-                    "_T_attributes_dict",
-                    False,
-                ),
+                element_attributes=(element_data.element_attributes, False),
                 any_attribute=(element_data.any_attribute, False),
                 _default_prepend_doctype=(element_name == "html", False),
+                _optional_start_tag=(element_data.optional_tags.start_tag,),
+                _optional_start_tag_except=(
+                    element_data.optional_tags.start_tag_except,
+                ),
+                _optional_start_tag_not_after=(
+                    element_data.optional_tags.start_tag_not_after,
+                ),
+                _optional_end_tag=(element_data.optional_tags.end_tag,),
+                _optional_end_tag_not_in=(element_data.optional_tags.end_tag_not_in,),
             )
         f.write()
 
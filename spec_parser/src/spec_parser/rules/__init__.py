@@ -1,3 +1,4 @@
 from __future__ import annotations
 
 from spec_parser.rules import attributes as attributes
+from spec_parser.rules import optional_tags as optional_tags
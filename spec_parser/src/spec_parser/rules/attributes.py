@@ -10,6 +10,12 @@ from bs4.element import Tag
 from spec_parser import util
 
 
+def _enumeration(values: list[str]) -> str:
+    # Turned into a validator by `validators.attribute_enumeration`, which also accepts
+    # booleans when both the empty string and the name of the attribute are allowed
+    return "frozenset({" + ",".join(f"'{x}'" for x in values) + "})"
+
+
 def parse(content: Tag) -> str:
     content_text = content.text.strip()
     value: str
@@ -18,20 +24,20 @@ def parse(content: Tag) -> str:
     if content_text == "Boolean attribute":
         value = "v.attribute_bool"
     elif content_text == "Valid integer":
-        value = "v.attribute_int"
+        value = "v.attribute_number()"
     elif content_text == "Valid non-negative integer":
-        value = "v.attribute_int_ge_zero"
+        value = "v.attribute_number(ge=0)"
     elif content_text == "Valid non-negative integer greater than zero":
-        value = "v.attribute_int_gt_zero"
+        value = "v.attribute_number(gt=0)"
     elif match := re.fullmatch(
         r"Valid non-negative integer between (\d+) and (\d+)", content_text, re.ASCII
     ):
-        value = f"partial(v.attribute_int, ge={match[1]}, le={match[2]})"
+        value = f"v.attribute_number(ge={match[1]}, le={match[2]})"
     elif content_text in (
         "Valid floating-point number",
         "Valid floating-point number*",
     ):
-        value = "v.attribute_float"
+        value = "v.attribute_number(is_float=True)"
     elif (
         content_text
         in (
@@ -41,16 +47,14 @@ def parse(content: Tag) -> str:
             "Unordered set of unique space-separated tokens consisting of valid absolute URLs, defined property names, or text*",  # TODO
         )
     ):
-        value = "v.attribute_unique_set"
+        value = "v.attribute_tokens()"
     elif (
         content_text
         == "Ordered set of unique space-separated tokens, none of which are identical to another, each consisting of one code point in length"
     ):
-        value = "v.attribute_all(v.attribute_unique_set, lambda x: max(len(t) for t in str(x).split()) <= 1)"
+        value = "v.attribute_tokens('[^ ]')"
     elif content_text == 'Valid floating-point number greater than zero, or "any"':
-        value = (
-            "v.attribute_any(v.attribute_float_gt_zero, v.attribute_str_literal('any'))"
-        )
+        value = "v.attribute_number(is_float=True, gt=0, keywords=('any',))"
     elif content_text == 'ASCII case-insensitive match for "UTF-8"':
         value = "v.attribute_str_literal_ci('utf-8')"
     elif content_text.startswith(
@@ -101,7 +105,7 @@ def parse(content: Tag) -> str:
     ):
         value = "v.attribute_str"
     elif content_text == "input type keyword":
-        value = "{" + ",".join(f"'{x}'" for x in util.get_input_type_keywords()) + "}"
+        value = _enumeration(util.get_input_type_keywords())
     elif not any(content.find_all("a", recursive=False)) and (
         possible_code_values := content.find_all("code")
     ):
@@ -111,7 +115,7 @@ def parse(content: Tag) -> str:
         )
         if "the empty string" in possible_string_values:
             possible_values.append("")
-        value = "{" + ",".join(f"'{x}'" for x in possible_values) + "}"
+        value = _enumeration(possible_values)
     else:
         value = "v.attribute_str"
         print(f"Unhandled attribute value: {content_text}")
@@ -0,0 +1,140 @@
+# ruff: noqa: E501
+
+from __future__ import annotations
+
+import re
+import sys
+from dataclasses import dataclass, field
+
+from spec_parser import util
+
+# What the first child, previous sibling or next sibling of an element can be, as
+# understood by `domify.base_element`:
+# - the name of an element
+# - `*`: any element
+# - `#text`: text not starting with ASCII whitespace
+# - `#space`: text starting with ASCII whitespace
+# - `#empty`: nothing, the element has no children
+# - `#end`: nothing, the element is the last child of its parent
+_ANY_ELEMENT = "*"
+_TEXT = "#text"
+_SPACE = "#space"
+_EMPTY = "#empty"
+_END = "#end"
+
+_ELEMENTS = r"((?:an?|another) .+ element)"
+
+
+@dataclass
+class OptionalTags:
+    start_tag: set[str] = field(default_factory=set)
+    start_tag_except: set[str] = field(default_factory=set)
+    start_tag_not_after: set[str] = field(default_factory=set)
+    end_tag: set[str] = field(default_factory=set)
+    end_tag_not_in: set[str] = field(default_factory=set)
+
+
+def _element_names(text: str) -> set[str]:
+    # "an rt or rp element", "another dt element or a dd element"
+    return {
+        re.sub(r"^(?:an?|another) | element$", "", x)
+        for x in re.split(r",? or |, ", text)
+        if x
+    }
+
+
+def _parse_conditions(
+    element: str, tag: str, conditions: str, data: OptionalTags
+) -> None:
+    # Notes in parentheses only restate the conditions
+    conditions = re.sub(r"\s*\([^)]*\)", "", conditions).rstrip(".")
+    excluded = False
+    for clause in re.split(r",? (?:(or|and|except) )?if ", conditions):
+        if clause in (None, "or", "and"):
+            continue
+        if clause == "except":
+            excluded = True
+            continue
+
+        if tag == "start":
+            if clause == "the element is empty":
+                data.start_tag.add(_EMPTY)
+            elif (
+                clause == f"the first thing inside the {element} element is an element"
+            ):
+                data.start_tag.add(_ANY_ELEMENT)
+            elif (
+                clause
+                == f"the first thing inside the {element} element is not a comment"
+            ):
+                data.start_tag |= {_ANY_ELEMENT, _TEXT, _SPACE, _EMPTY}
+            elif (
+                clause
+                == f"the first thing inside the {element} element is not ASCII whitespace or a comment"
+            ):
+                data.start_tag |= {_ANY_ELEMENT, _TEXT}
+            elif match := re.fullmatch(
+                rf"the first thing inside the {element} element is {_ELEMENTS}", clause
+            ):
+                if excluded:
+                    data.start_tag_except |= _element_names(match[1])
+                else:
+                    data.start_tag |= _element_names(match[1])
+            elif match := re.fullmatch(
+                rf"the element is not immediately preceded by {_ELEMENTS} whose end tag has been omitted",
+                clause,
+            ):
+                data.start_tag_not_after |= _element_names(match[1])
+            else:
+                print(f"Unhandled start tag condition for {element}: {clause}")
+                sys.exit(1)
+            continue
+
+        # Later conditions can refer to the element as "it"
+        clause = re.sub(r"^it ", f"the {element} element ", clause)
+        if clause == f"the {element} element is not immediately followed by a comment":
+            data.end_tag |= {_ANY_ELEMENT, _TEXT, _SPACE, _END}
+        elif (
+            clause
+            == f"the {element} element is not immediately followed by ASCII whitespace or a comment"
+        ):
+            data.end_tag |= {_ANY_ELEMENT, _TEXT, _END}
+        elif match := re.fullmatch(
+            rf"the {element} element is immediately followed by {_ELEMENTS}", clause
+        ):
+            data.end_tag |= _element_names(match[1])
+        elif clause == "there is no more content in the parent element":
+            data.end_tag.add(_END)
+        elif match := re.fullmatch(
+            rf"there is no more content in the parent element and the parent element is an HTML element that is not {_ELEMENTS}, or an autonomous custom element",
+            clause,
+        ):
+            data.end_tag.add(_END)
+            data.end_tag_not_in |= _element_names(match[1])
+        else:
+            print(f"Unhandled end tag condition for {element}: {clause}")
+            sys.exit(1)
+
+
+def parse() -> dict[str, OptionalTags]:
+    soup = util.request_cache("syntax")
+
+    title = soup.find(id="optional-tags")
+    assert title is not None
+    optional_tags: dict[str, OptionalTags] = {}
+    for sibling in title.find_next_siblings():
+        if sibling.name in ("h2", "h3", "h4", "h5", "h6"):
+            break
+        if sibling.name != "p":
+            continue
+        text = " ".join(sibling.text.split())
+        match = re.fullmatch(
+            r"An? (\S+) element's (start|end) tag may be omitted if (.+)", text
+        )
+        if match is None:
+            continue
+        element, tag, conditions = match.groups()
+        data = optional_tags.setdefault(element, OptionalTags())
+        _parse_conditions(element, tag, conditions, data)
+
+    return optional_tags
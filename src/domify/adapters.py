@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import codecs
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable, Iterator
+from contextlib import aclosing
+
+from domify.base_element import BaseElement
+
+# The end tags after which the buffered output is sent right away, so that browsers can
+# start fetching stylesheets and scripts as early as possible
+_FLUSH_AFTER = ("head",)
+
+
+def _headers(
+    headers: Iterable[tuple[str, str]], encoding: str, content_encoding: str | None
+) -> list[tuple[str, str]]:
+    headers = list(headers)
+    if not any(key.lower() == "content-type" for key, _ in headers):
+        headers.insert(0, ("Content-Type", f"text/html; charset={encoding}"))
+    if content_encoding is not None:
+        headers.append(("Content-Encoding", content_encoding))
+    return headers
+
+
+def _encode(chunks: Iterator[str], encoding: str) -> Iterator[bytes]:
+    # The state of the encoding is kept between chunks, so that for example a byte
+    # order mark is only written at the start
+    encoder = codecs.getincrementalencoder(encoding)()
+    for chunk in chunks:
+        yield encoder.encode(chunk)
+    data = encoder.encode("", final=True)
+    if data:
+        yield data
+
+
+async def _aencode(
+    chunks: AsyncGenerator[str, None], encoding: str
+) -> AsyncGenerator[bytes, None]:
+    encoder = codecs.getincrementalencoder(encoding)()
+    async with aclosing(chunks):
+        async for chunk in chunks:
+            yield encoder.encode(chunk)
+    data = encoder.encode("", final=True)
+    if data:
+        yield data
+
+
+def wsgi_response(
+    element: BaseElement,
+    start_response: Callable[[str, list[tuple[str, str]]], object],
+    *,
+    status: str = "200 OK",
+    headers: Iterable[tuple[str, str]] = (),
+    encoding: str = "utf-8",
+    chunk_size: int = 8192,
+    minify: bool = False,
+    content_encoding: str | None = None,
+) -> Iterator[bytes]:
+    """Stream an element as the body of a WSGI response
+
+    The head of the document is sent as soon as it is rendered, the rest of it in chunks
+    of at most `chunk_size` characters.
+
+    Args:
+        element: The element to render.
+        start_response: The `start_response` callable passed to the WSGI application.
+        status: The HTTP status of the response.
+        headers: Additional HTTP headers. A `Content-Type` header is added, unless
+            already present.
+        encoding: The encoding of the response body.
+        chunk_size: The maximum length of each chunk, before encoding.
+        minify: Whether to minify the response body, as in `BaseElement.render`.
+        content_encoding: `gzip` or `deflate` to compress the response body as it is
+            rendered (see `BaseElement.iter_compressed`), and add the matching
+            `Content-Encoding` header.
+
+    Returns:
+        The response body, to be returned by the WSGI application.
+    """
+    start_response(status, _headers(headers, encoding, content_encoding))
+    if content_encoding is not None:
+        return element.iter_compressed(
+            content_encoding,
+            chunk_size,
+            flush_after=_FLUSH_AFTER,
+            encoding=encoding,
+            minify=minify,
+        )
+    chunks = element.iter_render(chunk_size, flush_after=_FLUSH_AFTER, minify=minify)
+    return _encode(chunks, encoding)
+
+
+async def asgi_response(
+    element: BaseElement,
+    send: Callable[[dict[str, object]], Awaitable[None]],
+    *,
+    status: int = 200,
+    headers: Iterable[tuple[str, str]] = (),
+    encoding: str = "utf-8",
+    chunk_size: int = 8192,
+    minify: bool = False,
+    content_encoding: str | None = None,
+) -> None:
+    """Stream an element as the body of an ASGI HTTP response
+
+    The head of the document is sent as soon as it is rendered, the rest of it in chunks
+    of at most `chunk_size` characters. Every chunk is only rendered after `send` has
+    returned for the previous one, so rendering never gets ahead of the flow control of
+    the server. Awaitable children are resolved as in `BaseElement.aiter_render`.
+
+    Args:
+        element: The element to render.
+        send: The `send` callable passed to the ASGI application.
+        status: The HTTP status of the response.
+        headers: Additional HTTP headers. A `Content-Type` header is added, unless
+            already present.
+        encoding: The encoding of the response body.
+        chunk_size: The maximum length of each chunk, before encoding.
+        minify: Whether to minify the response body, as in `BaseElement.render`.
+        content_encoding: `gzip` or `deflate` to compress the response body as it is
+            rendered (see `BaseElement.iter_compressed`), and add the matching
+            `Content-Encoding` header.
+    """
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (key.lower().encode("latin-1"), val.encode("latin-1"))
+                for key, val in _headers(headers, encoding, content_encoding)
+            ],
+        }
+    )
+    if content_encoding is not None:
+        body = element.aiter_compressed(
+            content_encoding,
+            chunk_size,
+            flush_after=_FLUSH_AFTER,
+            encoding=encoding,
+            minify=minify,
+        )
+    else:
+        chunks = element.aiter_render(
+            chunk_size, flush_after=_FLUSH_AFTER, minify=minify
+        )
+        body = _aencode(chunks, encoding)
+    async with aclosing(body):
+        async for data in body:
+            await send({"type": "http.response.body", "body": data, "more_body": True})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
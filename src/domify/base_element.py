@@ -1,48 +1,332 @@
 from __future__ import annotations
 
+import asyncio
+import codecs
+import functools
+import re
 import warnings
-from collections.abc import Callable, Iterable, Iterator
+import weakref
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import aclosing
 from contextvars import ContextVar
 from html import escape
-from types import TracebackType
-from typing import ClassVar, Literal, TypeAlias, TypeVar, cast, overload
+from types import GeneratorType, TracebackType
+from typing import (
+    TYPE_CHECKING,
+    ClassVar,
+    Literal,
+    NamedTuple,
+    Protocol,
+    TypeAlias,
+    TypeVar,
+    cast,
+    overload,
+)
 
 from domify import exc
 from domify import validators as v
+from domify.compression import _Compressor, _concatenable, _SharedText
+from domify.validation import _STRICT, _level, _values_var
+
+if TYPE_CHECKING:
+    from domify.deferred import Deferred
 
 _T_BaseElement = TypeVar("_T_BaseElement", bound="BaseElement")
 _T_attribute = str | float | bool
-_T_child: TypeAlias = "BaseElement | str | float"
-_T_attributes_dict = dict[str, set[str] | Callable[[_T_attribute], bool]]
+_T_content: TypeAlias = "BaseElement | str | float"
+_T_child: TypeAlias = (
+    "_T_content | Awaitable[_T_content] | Sequence[_T_child] | Iterator[_T_child]"
+)
+_T_attributes_dict = dict[
+    str, frozenset[str] | set[str] | Callable[[_T_attribute], bool]
+]
+_T_render_child: TypeAlias = "BaseElement | str"
+
+# Text nodes longer than this are escaped one slice at a time while rendering
+_TEXT_SLICE_SIZE = 65536
+
+
+# Attributes which are not pickled as they are (see `_flatten`), and how many slots
+# elements have when they don't have any other state
+_UNPICKLED_ATTRIBUTES = frozenset(("_children", "_parents", "_render_cache"))
+_ELEMENT_SLOTS = 5
+
+# When minifying, runs of whitespace are collapsed into a single space, except inside
+# these elements
+_PREFORMATTED = frozenset(("pre", "textarea", "script", "style"))
+_WHITESPACE = re.compile(r"[\t\n\f\r ]+")
+# Escaped attribute values containing any of these characters have to be quoted
+_UNQUOTED_UNSAFE = re.compile(r"[\t\n\f\r =`]")
+
+# Rendered text is encoded in batches of at least this many characters
+_ENCODE_BATCH_SIZE = 8192
+
+
+class _EncodedText(_SharedText):
+    # A string which also keeps its encoded form, so that it can be used as it is when
+    # rendering with the same encoding
+    data: bytes
+    encoding: str
+
+    def __new__(cls, data: bytes, encoding: str) -> _EncodedText:
+        self = super().__new__(cls, data.decode(encoding))
+        self.data = data
+        self.encoding = codecs.lookup(encoding).name
+        return self
+
+    def __reduce__(self) -> tuple[type[_EncodedText], tuple[bytes, str]]:
+        return _EncodedText, (self.data, self.encoding)
+
+    def _encode(self, encoding: str) -> bytes:
+        if codecs.lookup(encoding).name == self.encoding:
+            return self.data
+        return self.encode(encoding)
+
+
+def _escape(text: str) -> str:
+    # Most text doesn't contain any special character, and looking for them is much
+    # faster than letting `html.escape` replace each of them
+    if "&" in text or "<" in text or ">" in text or '"' in text or "'" in text:
+        return escape(text)
+    return text
+
+
+# Attribute values, like classes, are often repeated across many elements
+_escape_attribute = functools.lru_cache(maxsize=4096)(_escape)
+
+
+def _clean_key(key: str) -> str:
+    return key.rstrip("_").replace("_", "-")
+
+
+# Converts keyword argument names into attribute names, the same few names are used
+# over and over by every class
+_clean_attribute_key = functools.lru_cache(maxsize=4096)(_clean_key)
+
+
+# Values of these types are validated once per class, attribute and value, any other
+# value (such as instances of their subclasses) every time
+_CACHED_VALUE_TYPES = frozenset((str, int, float, bool))
+_VALIDATION_CACHE_SIZE = 1024
+
+
+def _run_validator(
+    validators: dict[str, Callable[[_T_attribute], bool]], key: str, val: _T_attribute
+) -> bool:
+    validator = validators.get(key)
+    return validator is None or validator(val)
+
+
+def _new_validation_cache(
+    validators: dict[str, Callable[[_T_attribute], bool]],
+) -> functools._lru_cache_wrapper[bool]:
+    # `typed` keeps apart values which are equal but validated differently, such as
+    # `1` and `True`
+    return functools.lru_cache(maxsize=_VALIDATION_CACHE_SIZE, typed=True)(
+        functools.partial(_run_validator, validators)
+    )
+
+
+class ValidationCacheInfo(NamedTuple):
+    """Statistics about the attribute validation cache of an element class"""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class RenderCacheInfo(NamedTuple):
+    """Statistics about the render cache of an element"""
+
+    hits: int
+    misses: int
+
+
+class _RenderCache:
+    __slots__ = ("hits", "misses", "streamable", "text")
+
+    def __init__(self) -> None:
+        self.text: str | None = None
+        # Whether `text` is also the output when streaming, i.e. nothing in the element
+        # is rendered out of order
+        self.streamable = False
+        self.hits = 0
+        self.misses = 0
+
+
+class _MinifyFrame:
+    __slots__ = ("children", "element", "end_tag", "idx", "preformatted")
+
+    def __init__(
+        self,
+        children: list[_T_render_child],
+        element: BaseElement | None,
+        end_tag: str,
+        *,
+        preformatted: bool,
+    ) -> None:
+        self.children = children
+        self.idx = 0
+        # The element whose tags can be omitted, `None` for anything else rendering its
+        # children, which is emitted as it is
+        self.element = element
+        self.end_tag = end_tag
+        self.preformatted = preformatted
+
+
+class _SupportsWrite(Protocol):
+    def write(self, s: str, /) -> object: ...
+
+
+def _iter_chunks(
+    parts: Iterable[str], chunk_size: int, flush_parts: frozenset[str] = frozenset()
+) -> Iterator[str]:
+    buffer: list[str] = []
+    buffered = 0
+    for part in parts:
+        buffer.append(part)
+        buffered += len(part)
+        if buffered >= chunk_size:
+            data = "".join(buffer)
+            full = buffered - buffered % chunk_size
+            for i in range(0, full, chunk_size):
+                yield data[i : i + chunk_size]
+            buffer = [data[full:]]
+            buffered -= full
+        if flush_parts and buffered and part in flush_parts:
+            yield "".join(buffer)
+            buffer = []
+            buffered = 0
+    if buffered:
+        yield "".join(buffer)
+
+
+def _split_parts(parts: Iterable[str], flush_parts: frozenset[str]) -> Iterator[str]:
+    # Text rendered in advance (the render cache and frozen nodes) is split after the
+    # end tags in `flush_parts`, so that they still end a chunk when streaming
+    for part in parts:
+        if (
+            type(part) is str
+            or not isinstance(part, _SharedText)
+            or part in flush_parts
+        ):
+            yield part
+            continue
+        start = 0
+        while True:
+            found = [(idx, x) for x in flush_parts if (idx := part.find(x, start)) >= 0]
+            if not found:
+                break
+            idx, flush_part = min(found)
+            if idx > start:
+                yield part[start:idx]
+            yield flush_part
+            start = idx + len(flush_part)
+        if not start:
+            # Kept as it is, so that it can still be used as it is once compressed
+            yield part
+        elif start < len(part):
+            yield part[start:]
 
 
 class BaseElement:
     """Base class representing an element"""
 
+    __slots__ = (
+        "__weakref__",
+        "_attributes",
+        "_children",
+        "_parents",
+        "_prepend_doctype",
+        "_render_cache",
+    )
+
     is_empty = False
     global_attributes: ClassVar[_T_attributes_dict] = {}
     element_attributes: ClassVar[_T_attributes_dict] = {}
     any_attribute = False
 
     _default_prepend_doctype = False
+    _default_cache = False
+    # Whether the element is replaced by a placeholder while streaming, and rendered at
+    # the end of the document instead (see `domify.deferred.Deferred`)
+    _render_out_of_order = False
+    # Whether the element can't be modified (see `FrozenNode`). Frozen elements never
+    # invalidate a render cache, so they don't keep track of their parents
+    _frozen = False
+    # Which tags of the element can be omitted when minifying, as allowed by the HTML
+    # spec. The start tag can be omitted if the first child is in `_optional_start_tag`
+    # and not in `_optional_start_tag_except`, and the previous sibling is not in
+    # `_optional_start_tag_not_after`; the end tag can be omitted if the next sibling
+    # is in `_optional_end_tag`, and the parent is not in `_optional_end_tag_not_in`.
+    # Children and siblings are described by the name of an element, `*` (any
+    # element), `#text` (text not starting with whitespace), `#space` (text starting
+    # with whitespace), `#empty` (no children) or `#end` (no next sibling).
+    _optional_start_tag: ClassVar[set[str]] = set()
+    _optional_start_tag_except: ClassVar[set[str]] = set()
+    _optional_start_tag_not_after: ClassVar[set[str]] = set()
+    _optional_end_tag: ClassVar[set[str]] = set()
+    _optional_end_tag_not_in: ClassVar[set[str]] = set()
+
+    # Worked out once per class by `__init_subclass__`, from the class name and from
+    # `global_attributes` and `element_attributes`, which shouldn't be modified later.
+    # `_validators` holds a validator for each attribute, sets of values included.
+    _name: ClassVar[str] = "baseelement"
+    _all_attributes: ClassVar[_T_attributes_dict] = {}
+    _validators: ClassVar[dict[str, Callable[[_T_attribute], bool]]] = {}
+    _validation_cache: ClassVar[functools._lru_cache_wrapper[bool]] = (
+        _new_validation_cache(_validators)
+    )
 
-    _stack_var: ContextVar[list[list[BaseElement]] | None] = ContextVar(
-        "stack", default=None
+    # The elements created inside each `with` block currently open, innermost last.
+    # The stack itself is never modified, a new one is set when entering and exiting a
+    # block: contexts copied by threads and tasks started inside a block share the
+    # blocks open at that point, but never what is opened afterwards by each other.
+    # Each block keeps its elements as the keys of a dict, which preserves their order
+    # while allowing to remove any of them in constant time when it's added to another
+    # element.
+    _stack_var: ContextVar[tuple[dict[BaseElement, None], ...]] = ContextVar(
+        "stack", default=()
     )
 
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._name = cls.__name__.rstrip("_").lower()
+        cls._all_attributes = {**cls.global_attributes, **cls.element_attributes}
+        cls._validators = {
+            key: val if callable(val) else v.attribute_enumeration(val, key)
+            for key, val in cls._all_attributes.items()
+        }
+        cls._validation_cache = _new_validation_cache(cls._validators)
+
     def __init__(
         self,
         *args: _T_child,
         _prepend_doctype: bool | None = None,
+        _cache: bool | None = None,
         **kwargs: _T_attribute | None,
     ) -> None:
         """
         Args:
-            *args: The element's children. A `TextNode` is automatically created when
-                passing anything other than a subclass of `BaseElement`.
+            *args: The element's children. An `AwaitableNode` is automatically created
+                when passing an awaitable, a `LazyNode` when passing a list, a tuple
+                or a generator, and a `TextNode` when passing anything else other than
+                a subclass of `BaseElement`.
             _prepend_doctype: Whether a `DOCTYPE` declaration should be prepended.
                 Defaults to the value of the class attribute `_default_prepend_doctype`
                 (`True` for `html_elements.Html`, `False` for everything else).
+            _cache: Whether the rendered element should be kept and reused, until
+                the element or one of its descendants is modified. Defaults to the
+                value of the class attribute `_default_cache`.
             **kwargs: The element's attributes. Trailing underscores are automatically
                 stripped, to avoid clashing with reserved keywords when setting
                 attributes like `class` and `for`. Any other underscore is replaced by
@@ -59,39 +343,41 @@ class BaseElement:
         if _prepend_doctype is None:
             _prepend_doctype = self._default_prepend_doctype
         self._prepend_doctype = _prepend_doctype
+        if _cache is None:
+            _cache = self._default_cache
+        self._render_cache = _RenderCache() if _cache else None
         self._attributes: dict[str, str | Literal[True]] = {}
         self._children: list[BaseElement] = []
-
-        self._add_to_stack(self)
+        # Weak references to the elements containing this one whose render cache, or
+        # the cache of one of their ancestors, has to be invalidated whenever this
+        # element is modified. `None` until the element is added to such an element,
+        # so that trees without any render cache don't keep track of their parents.
+        self._parents: list[weakref.ref[BaseElement]] | None = None
 
         for child in args:
             self._add_child(child)
 
-        for key, val in kwargs.items():
-            if val is None:
-                continue
-            self._set_attribute(key, val)
+        if kwargs:
+            # Sampled once per element, rather than once per attribute
+            level = _level()
+            for key, val in kwargs.items():
+                if val is None:
+                    continue
+                self._set_attribute(key, val, level)
 
-    @property
-    def _stack(self) -> list[list[BaseElement]]:
-        stack = self._stack_var.get()
-        if stack is None:
-            stack = []
-            self._stack_var.set(stack)
-        return stack
+        # Only once everything else succeeded, so that an element whose attributes
+        # are rejected in `strict` mode is not added to the current `with` block
+        self._add_to_stack(self)
 
     def _add_to_stack(self, element: BaseElement) -> None:
-        if self._stack:
-            self._stack[-1].append(element)
+        stack = self._stack_var.get()
+        if stack:
+            stack[-1][element] = None
 
     def _remove_from_stack(self, element: BaseElement) -> None:
-        if self._stack and element in self._stack[-1]:
-            self._stack[-1].remove(element)
-        self._maybe_clear_stack()
-
-    def _maybe_clear_stack(self) -> None:
-        if not self._stack:
-            self._stack_var.set(None)
+        stack = self._stack_var.get()
+        if stack:
+            stack[-1].pop(element, None)
 
     @property
     def name(self) -> str:
@@ -99,7 +385,7 @@ class BaseElement:
         Returns:
             The lowercase name of the element, with trailing underscores removed.
         """
-        return type(self).__name__.rstrip("_").lower()
+        return self._name
 
     # Attributes
     def get_classes(self) -> list[str]:
@@ -119,6 +405,7 @@ class BaseElement:
         Args:
             args: The class (or classes) to add.
         """
+        self._invalidate_cache()
         classes = self.get_classes()
         for cls in args:
             if cls not in classes:
@@ -131,6 +418,7 @@ class BaseElement:
         Args:
             args: The class (or classes) to remove.
         """
+        self._invalidate_cache()
         classes = self.get_classes()
         for cls in args:
             classes.remove(cls)
@@ -142,20 +430,17 @@ class BaseElement:
         Returns:
             A dict containing both global and element-specific attributes
         """
-        return {**self.global_attributes, **self.element_attributes}
+        return dict(self._all_attributes)
 
-    def _set_attribute(self, key: str, val: _T_attribute) -> None:
-        key = self._clean_attribute_key(key)
-        if (
-            not self.any_attribute
-            and not key.startswith(("data-", "aria-"))
-            and key not in self.all_attributes
-        ):
-            warnings.warn(exc.InvalidAttributeWarning(self, key), stacklevel=3)
-        elif not self._validate_attribute(key, val):
-            warnings.warn(
-                exc.InvalidAttributeValueWarning(self, key, str(val)), stacklevel=3
-            )
+    def _set_attribute(
+        self, key: str, val: _T_attribute, level: int | None = None
+    ) -> None:
+        self._invalidate_cache()
+        key = _clean_attribute_key(key)
+        if level is None:
+            level = _level()
+        if level:
+            self._check_attribute(key, val, strict=level == _STRICT)
 
         if val is False:
             return
@@ -163,21 +448,44 @@ class BaseElement:
             val = str(val)
         self._attributes[key] = val
 
-    @staticmethod
-    def _clean_attribute_key(key: str) -> str:
-        return key.rstrip("_").replace("_", "-")
+    def _check_attribute(self, key: str, val: _T_attribute, *, strict: bool) -> None:
+        warning: UserWarning
+        if (
+            key not in self._all_attributes
+            and not self.any_attribute
+            and not key.startswith(("data-", "aria-"))
+        ):
+            warning = exc.InvalidAttributeWarning(self, key)
+        elif _values_var.get() and not self._validate_attribute(key, val):
+            warning = exc.InvalidAttributeValueWarning(self, key, str(val))
+        else:
+            return
+        if strict:
+            raise warning
+        warnings.warn(warning, stacklevel=4)
 
     def _validate_attribute(self, key: str, val: _T_attribute) -> bool:
-        expected_value = self.all_attributes.get(key)
-        if expected_value is None:
-            return True
-        if isinstance(expected_value, set):
-            if val in expected_value:
-                return True
-            if {"", key} < expected_value:
-                return v.attribute_bool(val)
-            return False
-        return expected_value(val)
+        if type(val) in _CACHED_VALUE_TYPES:
+            # Looked up on the class, since the cache would be bound to the instance
+            return type(self)._validation_cache(key, val)  # noqa: SLF001
+        return _run_validator(self._validators, key, val)
+
+    @classmethod
+    def validation_cache_info(cls) -> ValidationCacheInfo:
+        """Get statistics about the attribute validation cache of the current class
+
+        Every class keeps the result of the last validated attribute values, so that
+        elements created over and over with the same attributes are only validated
+        once. Values which are not `str`, `int`, `float` or `bool` are not cached.
+
+        Returns:
+            How many times a cached result was reused, how many times a value had to be
+            validated, and the maximum and current number of cached results.
+        """
+        info = cls._validation_cache.cache_info()
+        return ValidationCacheInfo(
+            info.hits, info.misses, info.maxsize or 0, info.currsize
+        )
 
     # Children
     @overload
@@ -190,8 +498,10 @@ class BaseElement:
         """Add a child to the current element
 
         Args:
-            child: The child. A `TextNode` is automatically created when passing
-                anything other than a subclass of `BaseElement`.
+            child: The child. An `AwaitableNode` is automatically created when passing
+                an awaitable, a `LazyNode` when passing a list, a tuple or a generator,
+                and a `TextNode` when passing anything else other than a subclass of
+                `BaseElement`.
 
         Returns:
             The child, already converted to a `TextNode` if required.
@@ -209,14 +519,47 @@ class BaseElement:
 
         Args:
             idx: The index.
-            child: The child. A `TextNode` is automatically created when passing
-                anything other than a subclass of `BaseElement`.
+            child: The child. An `AwaitableNode` is automatically created when passing
+                an awaitable, a `LazyNode` when passing a list, a tuple or a generator,
+                and a `TextNode` when passing anything else other than a subclass of
+                `BaseElement`.
 
         Returns:
             The child, already converted to a `TextNode` if required.
         """
         return self._add_child(child, idx=idx)
 
+    def extend(self, children: Iterable[_T_child]) -> None:
+        """Add many children to the current element
+
+        This is faster than calling `add` for each child. Generators are consumed
+        lazily, so the children are added as they are produced.
+
+        Args:
+            children: The children. An `AwaitableNode` is automatically created for
+                each awaitable, a `LazyNode` for each list, tuple or generator, and a
+                `TextNode` for anything else other than a subclass of `BaseElement`.
+
+        Raises:
+            EmptyElementChildrenError: If the element is an empty one and at least a
+                child is passed.
+        """
+        self._invalidate_cache()
+        stack = self._stack_var.get()
+        pending = stack[-1] if stack else None
+        is_empty = self.is_empty
+        append = self._children.append
+        for child in children:
+            if is_empty:
+                raise exc.EmptyElementChildrenError
+            element = (
+                child if isinstance(child, BaseElement) else self._to_element(child)
+            )
+            append(element)
+            self._adopt(element)
+            if pending:
+                pending.pop(element, None)
+
     def _add_child(
         self,
         child: _T_child,
@@ -225,40 +568,777 @@ class BaseElement:
         idx_replace: bool = False,
         exit_context_manager: bool = False,
     ) -> BaseElement:
-        if not isinstance(child, BaseElement):
-            child = TextNode(child)
+        self._invalidate_cache()
+        child = self._to_element(child)
         if idx is None:
             self._children.append(child)
         elif idx_replace:
+            self._orphan(self._children[idx])
             self._children[idx] = child
         else:
             self._children.insert(idx, child)
+        self._adopt(child)
         if not exit_context_manager:
             self._remove_from_stack(child)
         return child
 
-    # Render
-    def _render(self) -> list[str]:
-        if type(self) is BaseElement:
-            return [str(child) for child in self._children]
+    def _tracks_children(self) -> bool:
+        # Whether the children of the current element keep a reference to it, which is
+        # the case if it or one of its ancestors has a render cache
+        return self._render_cache is not None or self._parents is not None
 
-        data = []
-        if self._prepend_doctype:
-            data.append("<!DOCTYPE html>")
+    def _adopt(self, child: BaseElement) -> None:
+        if not self._tracks_children():
+            return
+        # A child which didn't keep track of its parents yet starts doing so, and so do
+        # its descendants
+        stack = [(self, child)]
+        while stack:
+            parent, element = stack.pop()
+            if element._frozen:  # noqa: SLF001
+                continue
+            ref = weakref.ref(parent)
+            parents = element._parents  # noqa: SLF001
+            if parents is not None:
+                parents.append(ref)
+                continue
+            element._parents = [ref]  # noqa: SLF001
+            if element._render_cache is None:  # noqa: SLF001
+                stack.extend((element, x) for x in element._children)  # noqa: SLF001
+
+    def _orphan(self, child: BaseElement) -> None:
+        if child._parents and self._tracks_children():
+            child._parents.remove(weakref.ref(self))
+
+    @staticmethod
+    def _to_element(child: _T_child) -> BaseElement:
+        if isinstance(child, BaseElement):
+            return child
+        if isinstance(child, (str, int, float)):
+            return TextNode(child)
+        if isinstance(child, Awaitable):
+            return AwaitableNode(child)
+        if isinstance(child, (list, tuple, GeneratorType)):
+            return LazyNode(child)
+        # Anything else is rendered as text
+        value: object = child
+        return TextNode(str(value))
+
+    # Render cache
+    def cache_info(self) -> RenderCacheInfo:
+        """Get statistics about the render cache of the current element
+
+        Returns:
+            How many times the cached output was reused, and how many times the element
+            had to be rendered again. Both are zero if caching is disabled, and they
+            are approximate when the element is rendered by several threads at once.
+        """
+        if self._render_cache is None:
+            return RenderCacheInfo(0, 0)
+        return RenderCacheInfo(self._render_cache.hits, self._render_cache.misses)
+
+    def _invalidate_cache(self) -> None:
+        # Clears the cached output of the current element and of all its ancestors.
+        # Called before every change to the element.
+        if self._render_cache is None and not self._parents:
+            return
+        seen = {self}
+        stack = [self]
+        while stack:
+            element: BaseElement = stack.pop()
+            if element._render_cache is not None:
+                element._render_cache.text = None
+                element._render_cache.streamable = False
+            parents = element._parents
+            if not parents:
+                continue
+            dead = False
+            for ref in parents:
+                parent = ref()
+                if parent is None:
+                    dead = True
+                elif parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+            if dead:
+                # References to parents which no longer exist are dropped
+                parents[:] = [ref for ref in parents if ref() is not None]
+
+    def _render_cached(self) -> str:
+        cache = cast("_RenderCache", self._render_cache)
+        if cache.text is not None:
+            cache.hits += 1
+            return cache.text
+        cache.misses += 1
+        start_tag, children, end_tag = self._render_parts()
+        text = _SharedText("".join((start_tag, *self._walk(children), end_tag)))
+        cache.text = text
+        return text
+
+    def _iter_cached(self, deferred: list[Deferred]) -> Iterator[str]:
+        # When streaming, the cached output can only be used once the element has been
+        # streamed without rendering anything out of order
+        cache = cast("_RenderCache", self._render_cache)
+        if cache.text is not None and cache.streamable:
+            cache.hits += 1
+            yield cache.text
+            return
+        start_tag, children, end_tag = self._render_parts()
+        deferred_count = len(deferred)
+        parts = [start_tag, *self._walk(children, deferred), end_tag]
+        if len(deferred) == deferred_count:
+            cache.misses += 1
+            cache.text = _SharedText("".join(parts))
+            cache.streamable = True
+        yield from parts
+
+    async def _resolve_awaitables(
+        self, later: dict[BaseElement, asyncio.Task[None]] | None = None
+    ) -> None:
+        # Awaits every awaitable in the tree concurrently. If `later` is passed, the
+        # elements rendered out of order are only scheduled, and their tasks added to it
+        while True:
+            pending = []
+            # Elements appearing more than once in the tree are only visited once, so
+            # that shared awaitables are only awaited once
+            seen: set[BaseElement] = set()
+            stack = [self]
+            while stack:
+                element: BaseElement = stack.pop()
+                if element in seen:
+                    continue
+                seen.add(element)
+                if isinstance(element, AwaitableNode) and not element.resolved:
+                    pending.append(element.resolve())
+                elif (
+                    later is not None
+                    and element._render_out_of_order
+                    and element is not self
+                ):
+                    if element not in later:
+                        later[element] = asyncio.ensure_future(
+                            element._resolve_awaitables()
+                        )
+                    continue
+                stack.extend(element._children)
+            if not pending:
+                return
+            await asyncio.gather(*pending)
+
+    # Render
+    def _render_attributes(self, *, minify: bool = False) -> str:
+        if not self._attributes:
+            return ""
         attrs = []
         for key, val in self._attributes.items():
             if val is True:
                 attrs.append(f" {key}")
+                continue
+            escaped = _escape_attribute(val)
+            if minify and escaped and not _UNQUOTED_UNSAFE.search(escaped):
+                attrs.append(f" {key}={escaped}")
             else:
-                attrs.append(f' {key}="{escape(val, True)}"')
+                attrs.append(f' {key}="{escaped}"')
+        return "".join(attrs)
 
-        data.append(f"<{self.name}{''.join(attrs)}>")
-        if not self.is_empty:
-            data.extend(str(child) for child in self._children)
-            data.append(f"</{self.name}>")
+    def _render_parts(self) -> tuple[str, Iterable[_T_render_child], str]:
+        # Returns the text before the children, the children themselves and the text
+        # after the children. Strings in place of children are emitted as they are.
+        if type(self) is BaseElement:
+            return "", self._children, ""
+
+        name = self.name
+        start_tag = f"<{name}{self._render_attributes()}>"
+        if self._prepend_doctype:
+            start_tag = f"<!DOCTYPE html>{start_tag}"
+        if self.is_empty:
+            return start_tag, (), ""
+        return start_tag, self._children, f"</{name}>"
+
+    def _iter_parts(
+        self,
+        deferred: list[Deferred] | None = None,
+        *,
+        minify: bool = False,
+        keep_end_tags: frozenset[str] = frozenset(),
+    ) -> Iterator[str]:
+        if minify:
+            parts = self._walk_minified(self, deferred, keep_end_tags)
+        else:
+            parts = self._walk((self,), deferred)
+        if keep_end_tags:
+            return _split_parts(parts, frozenset(f"</{x}>" for x in keep_end_tags))
+        return parts
+
+    @staticmethod
+    def _walk(
+        elements: Iterable[_T_render_child], deferred: list[Deferred] | None = None
+    ) -> Iterator[str]:
+        # The tree is walked with an explicit stack, yielding every part exactly once:
+        # this avoids joining the same text once per nesting level, and deeply nested
+        # trees don't hit the recursion limit.
+        # When streaming, `deferred` collects the elements rendered out of order, and
+        # the render cache is not used since the output is different.
+        stack: list[tuple[Iterator[_T_render_child], str]] = [(iter(elements), "")]
+        while stack:
+            children, end_tag = stack[-1]
+            for child in children:
+                if isinstance(child, str):
+                    yield child
+                    continue
+                if deferred is None:
+                    if child._render_cache is not None:  # noqa: SLF001
+                        yield child._render_cached()  # noqa: SLF001
+                        continue
+                    parts = child._render_parts()  # noqa: SLF001
+                elif child._render_out_of_order:  # noqa: SLF001
+                    deferred.append(cast("Deferred", child))
+                    placeholder: BaseElement = deferred[-1].placeholder(
+                        len(deferred) - 1
+                    )
+                    parts = placeholder._render_parts()
+                elif child._render_cache is not None:  # noqa: SLF001
+                    yield from child._iter_cached(deferred)  # noqa: SLF001
+                    continue
+                else:
+                    parts = child._render_parts()  # noqa: SLF001
+                start_tag, grandchildren, child_end_tag = parts
+                if start_tag:
+                    yield start_tag
+                if grandchildren:
+                    stack.append((iter(grandchildren), child_end_tag))
+                    break
+                if child_end_tag:
+                    yield child_end_tag
+            else:
+                stack.pop()
+                if end_tag:
+                    yield end_tag
+
+    @staticmethod
+    def _minify_kind(child: _T_render_child | None) -> str | None:
+        # What `child` is, as described by the `_optional_*` attributes, or `None` if
+        # it's unknown (for example an element rendering its children without tags)
+        if child is None or isinstance(child, str):
+            return None
+        if isinstance(child, TextNode):
+            if isinstance(child, RawTextNode):
+                return None
+            whitespace = child.text[:1] in (" ", "\t", "\n", "\f", "\r")
+            return "#space" if whitespace else "#text"
+        if BaseElement._renders_tags(child):
+            return child.name
+        return None
+
+    @staticmethod
+    def _renders_tags(element: BaseElement) -> bool:
+        cls = type(element)
+        return cls is not BaseElement and cls._render_parts is BaseElement._render_parts
+
+    @staticmethod
+    def _matches(kind: str | None, kinds: set[str]) -> bool:
+        if kind is None:
+            return False
+        return kind in kinds or ("*" in kinds and not kind.startswith("#"))
+
+    @staticmethod
+    def _walk_minified(
+        element: BaseElement,
+        deferred: list[Deferred] | None,
+        keep_end_tags: frozenset[str],
+    ) -> Iterator[str]:
+        # Like `_walk`, but whether a tag can be omitted depends on the siblings of the
+        # element, so every frame keeps the list of children and the index of the next
+        # one. Anything whose tags and siblings are unknown (raw text, elements without
+        # tags, custom rendering) is never next to an omitted tag. The render cache is
+        # not used since the output is different.
+        root = _MinifyFrame([element], None, "", preformatted=False)
+        stack = [root]
+        while stack:
+            frame = stack[-1]
+            children = frame.children
+            while frame.idx < len(children):
+                child = children[frame.idx]
+                frame.idx += 1
+                if isinstance(child, str):
+                    yield child
+                    continue
+                if deferred is not None and child._render_out_of_order:  # noqa: SLF001
+                    deferred.append(cast("Deferred", child))
+                    child = deferred[-1].placeholder(len(deferred) - 1)
+                if (
+                    isinstance(child, TextNode)
+                    and not isinstance(child, RawTextNode)
+                    and not frame.preformatted
+                ):
+                    yield _escape(_WHITESPACE.sub(" ", child.text))
+                    continue
+
+                start_tag, grandchildren, end_tag = child._render_parts()  # noqa: SLF001
+                # Empty text nodes render nothing, and are not siblings of anything
+                grandchildren = [
+                    x for x in grandchildren if type(x) is not TextNode or x.text
+                ]
+                if not BaseElement._renders_tags(child):
+                    if start_tag:
+                        yield start_tag
+                    stack.append(
+                        _MinifyFrame(
+                            grandchildren,
+                            None,
+                            end_tag,
+                            preformatted=frame.preformatted,
+                        )
+                    )
+                    break
+
+                cls = type(child)
+                name = child.name
+                attributes = child._render_attributes(minify=True)  # noqa: SLF001
+                if child._prepend_doctype:  # noqa: SLF001
+                    yield "<!DOCTYPE html>"
+                first = grandchildren[0] if grandchildren else None
+                previous = children[frame.idx - 2] if frame.idx > 1 else None
+                if attributes or not BaseElement._can_omit_start_tag(
+                    child, first, previous
+                ):
+                    yield f"<{name}{attributes}>"
+                if cls.is_empty:
+                    continue
+                stack.append(
+                    _MinifyFrame(
+                        grandchildren,
+                        child,
+                        end_tag,
+                        preformatted=frame.preformatted or name in _PREFORMATTED,
+                    )
+                )
+                break
+            else:
+                stack.pop()
+                if frame.element is not None and BaseElement._can_omit_end_tag(
+                    frame.element, stack[-1], keep_end_tags, root=stack[-1] is root
+                ):
+                    continue
+                if frame.end_tag:
+                    yield frame.end_tag
+
+    @staticmethod
+    def _can_omit_start_tag(
+        element: BaseElement,
+        first: _T_render_child | None,
+        previous: _T_render_child | None,
+    ) -> bool:
+        cls = type(element)
+        first_kind = "#empty" if first is None else BaseElement._minify_kind(first)
+        previous_kind = BaseElement._minify_kind(previous)
+        return (
+            BaseElement._matches(first_kind, cls._optional_start_tag)
+            and not BaseElement._matches(first_kind, cls._optional_start_tag_except)
+            and not BaseElement._matches(
+                previous_kind, cls._optional_start_tag_not_after
+            )
+        )
+
+    @staticmethod
+    def _can_omit_end_tag(
+        element: BaseElement,
+        parent: _MinifyFrame,
+        keep_end_tags: frozenset[str],
+        *,
+        root: bool,
+    ) -> bool:
+        cls = type(element)
+        name = element.name
+        if name in keep_end_tags:
+            return False
+        if parent.idx < len(parent.children):
+            following = BaseElement._minify_kind(parent.children[parent.idx])
+            return BaseElement._matches(following, cls._optional_end_tag)
+        if "#end" not in cls._optional_end_tag:
+            return False
+        # The parent has to be known, and the root element of a document is `html`
+        if root:
+            return name == "html"
+        if parent.element is None:
+            return False
+        parent_name = parent.element.name
+        return (
+            parent_name not in cls._optional_end_tag_not_in and "-" not in parent_name
+        )
+
+    def _render(self) -> list[str]:
+        return list(self._iter_parts())
+
+    def render(self, *, minify: bool = False) -> str:
+        """Render the current element
+
+        Args:
+            minify: Whether to omit the start and end tags which the HTML spec allows
+                to omit, leave attribute values unquoted when possible and collapse
+                whitespace outside of `pre`, `textarea`, `script` and `style` elements.
+
+        Returns:
+            The rendered element.
+        """
+        if not minify:
+            return str(self)
+        return "".join(self._iter_parts(minify=True))
+
+    async def arender(self) -> str:
+        """Resolve every awaitable child concurrently, then render the current element
+
+        Returns:
+            The rendered element.
+        """
+        await self._resolve_awaitables()
+        return str(self)
+
+    def render_parallel(
+        self, executor: Executor, *, min_subtree_size: int = 1000
+    ) -> str:
+        """Render the current element, spreading large subtrees over an executor
+
+        The tree is split between siblings into batches of at least `min_subtree_size`
+        elements, which are rendered by the executor, while the tags of the elements
+        containing them, smaller leftover batches, `Deferred` elements, awaitable
+        children and elements using the render cache are rendered by the calling
+        thread. The pieces are then joined in order.
+
+        With a process pool, every batch is pickled, so this only pays off for trees
+        that are expensive to render compared to their size, or when the rendering
+        would otherwise keep a single core busy for a long time. A thread pool renders
+        the elements without copying them, but only runs them in parallel on
+        free-threaded builds.
+
+        Args:
+            executor: The executor rendering the batches.
+            min_subtree_size: The number of elements, text nodes included, below which
+                a subtree is not worth sending to the executor.
 
+        Returns:
+            The rendered element.
+        """
+        return _ParallelRenderer(executor, min_subtree_size).render(self)
+
+    def iter_render(
+        self,
+        chunk_size: int = 8192,
+        flush_after: Iterable[str] = (),
+        *,
+        minify: bool = False,
+    ) -> Iterator[str]:
+        """Render the current element incrementally
+
+        `Deferred` elements are replaced by a placeholder, and their content is rendered
+        at the end of the document.
+
+        Args:
+            chunk_size: The maximum length of each chunk.
+            flush_after: Names of elements whose end tag ends the current chunk, even if
+                it is shorter than `chunk_size` (for example `head`, to let browsers
+                start fetching stylesheets and scripts as early as possible). Their end
+                tag is never omitted.
+            minify: Whether to minify the output, as in `render`.
+
+        Yields:
+            The rendered element, split in chunks of at most `chunk_size` characters.
+        """
+        keep_end_tags = frozenset(flush_after)
+        flush_parts = frozenset(f"</{name}>" for name in keep_end_tags)
+        for parts in self._iter_stream(keep_end_tags, minify=minify):
+            yield from _iter_chunks(parts, chunk_size, flush_parts)
+
+    def _iter_stream(
+        self, keep_end_tags: frozenset[str], *, minify: bool
+    ) -> Iterator[Iterator[str]]:
+        # The parts of the document, followed by the parts of each deferred element,
+        # each of them to be consumed before moving to the next one
+        deferred: list[Deferred] = []
+        yield self._iter_parts(deferred, minify=minify, keep_end_tags=keep_end_tags)
+        # Elements rendered out of order can add more deferred elements to the list
+        for idx, element in enumerate(deferred):
+            fragment: BaseElement = element.fragment(idx)
+            yield fragment._iter_parts(
+                deferred, minify=minify, keep_end_tags=keep_end_tags
+            )
+
+    async def aiter_render(
+        self,
+        chunk_size: int = 8192,
+        flush_after: Iterable[str] = (),
+        *,
+        minify: bool = False,
+    ) -> AsyncGenerator[str, None]:
+        """Render the current element incrementally, resolving awaitable children
+
+        Awaitables are resolved concurrently before rendering starts, except the ones
+        inside `Deferred` elements: those keep running while the rest of the document
+        is rendered, and each of them is rendered at the end as soon as it completes.
+
+        Args:
+            chunk_size: The maximum length of each chunk.
+            flush_after: Names of elements whose end tag ends the current chunk, even if
+                it is shorter than `chunk_size`. Their end tag is never omitted.
+            minify: Whether to minify the output, as in `render`.
+
+        Yields:
+            The rendered element, split in chunks of at most `chunk_size` characters.
+        """
+        keep_end_tags = frozenset(flush_after)
+        flush_parts = frozenset(f"</{name}>" for name in keep_end_tags)
+        stream = self._aiter_stream(keep_end_tags, minify=minify)
+        async with aclosing(stream):
+            async for parts in stream:
+                for chunk in _iter_chunks(parts, chunk_size, flush_parts):
+                    yield chunk
+
+    async def _aiter_stream(
+        self, keep_end_tags: frozenset[str], *, minify: bool
+    ) -> AsyncGenerator[Iterator[str], None]:
+        # Like `_iter_stream`, deferred elements come in the order they are resolved
+        tasks: dict[BaseElement, asyncio.Task[None]] = {}
+        try:
+            await self._resolve_awaitables(tasks)
+            deferred: list[Deferred] = []
+            yield self._iter_parts(deferred, minify=minify, keep_end_tags=keep_end_tags)
+
+            rendered: set[int] = set()
+            while len(rendered) < len(deferred):
+                waiting: dict[asyncio.Task[None], int] = {}
+                for idx, element in enumerate(deferred):
+                    if idx in rendered:
+                        continue
+                    if element not in tasks:
+                        tasks[element] = asyncio.ensure_future(
+                            element._resolve_awaitables()  # noqa: SLF001
+                        )
+                    waiting[tasks[element]] = idx
+                done, _ = await asyncio.wait(
+                    waiting, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=waiting.__getitem__):
+                    task.result()
+                    idx = waiting[task]
+                    rendered.add(idx)
+                    fragment: BaseElement = deferred[idx].fragment(idx)
+                    yield fragment._iter_parts(
+                        deferred, minify=minify, keep_end_tags=keep_end_tags
+                    )
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    def iter_compressed(
+        self,
+        content_encoding: str = "gzip",
+        chunk_size: int = 8192,
+        flush_after: Iterable[str] = (),
+        *,
+        encoding: str = "utf-8",
+        level: int = 6,
+        minify: bool = False,
+    ) -> Iterator[bytes]:
+        """Render the current element incrementally into a compressed stream
+
+        The output is compressed as it is rendered, without ever holding the whole
+        document. Large `FrozenNode` elements and elements with a render cache are
+        compressed only once, and the compressed data is reused by every following
+        stream with the same encodings and compression level. `Deferred` elements are
+        handled as in `iter_render`.
+
+        Args:
+            content_encoding: The format of the stream, `gzip` or `deflate` (zlib), as
+                in the `Content-Encoding` HTTP header.
+            chunk_size: The length of the rendered text after which the compressed data
+                is flushed and returned.
+            flush_after: Names of elements whose end tag flushes the compressed data,
+                even if less than `chunk_size` characters were rendered. Their end tag
+                is never omitted.
+            encoding: The encoding of the text before compression.
+            level: The compression level, from 0 to 9.
+            minify: Whether to minify the output, as in `render`.
+
+        Yields:
+            The compressed stream, flushed after at least `chunk_size` characters, and
+            after the end tag of the elements in `flush_after`.
+        """
+        compressor = _Compressor(content_encoding, encoding, level)
+        keep_end_tags = frozenset(flush_after)
+        flush_parts = frozenset(f"</{name}>" for name in keep_end_tags)
+        for parts in self._iter_stream(keep_end_tags, minify=minify):
+            yield from compressor.iter_compressed(parts, chunk_size, flush_parts)
+        yield compressor.finish()
+
+    async def aiter_compressed(
+        self,
+        content_encoding: str = "gzip",
+        chunk_size: int = 8192,
+        flush_after: Iterable[str] = (),
+        *,
+        encoding: str = "utf-8",
+        level: int = 6,
+        minify: bool = False,
+    ) -> AsyncGenerator[bytes, None]:
+        """Render the current element incrementally into a compressed stream, resolving
+        awaitable children
+
+        Awaitables are resolved as in `aiter_render`, and the output is compressed as in
+        `iter_compressed`.
+
+        Args:
+            content_encoding: The format of the stream, `gzip` or `deflate` (zlib).
+            chunk_size: The length of the rendered text after which the compressed data
+                is flushed and returned.
+            flush_after: Names of elements whose end tag flushes the compressed data.
+            encoding: The encoding of the text before compression.
+            level: The compression level, from 0 to 9.
+            minify: Whether to minify the output, as in `render`.
+
+        Yields:
+            The compressed stream.
+        """
+        compressor = _Compressor(content_encoding, encoding, level)
+        keep_end_tags = frozenset(flush_after)
+        flush_parts = frozenset(f"</{name}>" for name in keep_end_tags)
+        stream = self._aiter_stream(keep_end_tags, minify=minify)
+        async with aclosing(stream):
+            async for parts in stream:
+                for data in compressor.iter_compressed(parts, chunk_size, flush_parts):
+                    yield data
+        yield compressor.finish()
+
+    def _iter_encoded(self, encoding: str) -> Iterator[bytes]:
+        encoding = codecs.lookup(encoding).name
+        # The state of the encoding is kept between batches, so that for example a byte
+        # order mark is only written at the start
+        encode = codecs.getincrementalencoder(encoding)().encode
+        copy_encoded = _concatenable(encoding)
+        batch: list[str] = []
+        batch_size = 0
+        for part in self._iter_parts():
+            if (
+                copy_encoded
+                and type(part) is _EncodedText
+                and part.encoding == encoding
+            ):
+                # The encoding is brought back to its initial state first
+                data = encode("".join(batch), final=True)
+                if data:
+                    yield data
+                batch.clear()
+                batch_size = 0
+                yield part.data
+                continue
+            batch.append(part)
+            batch_size += len(part)
+            if batch_size >= _ENCODE_BATCH_SIZE:
+                yield encode("".join(batch))
+                batch.clear()
+                batch_size = 0
+        data = encode("".join(batch), final=True)
+        if data:
+            yield data
+
+    def render_bytes(self, encoding: str = "utf-8") -> bytearray:
+        """Render the current element directly into an encoded buffer
+
+        Unlike `str(element).encode(encoding)`, the whole document is never held as a
+        string, and `RawTextNode` elements created from bytes with the same encoding
+        are copied as they are.
+
+        Args:
+            encoding: The encoding of the output.
+
+        Returns:
+            The rendered element, encoded.
+        """
+        data = bytearray()
+        for segment in self._iter_encoded(encoding):
+            data += segment
         return data
 
+    def render_segments(self, encoding: str = "utf-8") -> list[bytes]:
+        """Render the current element into a list of encoded segments
+
+        `RawTextNode` elements created from bytes with the same encoding are returned
+        as they are, without being copied, so that static content can be encoded once
+        and shared between renders. Everything else is encoded in a few larger
+        segments. The result can be passed directly to `socket.sendmsg` or `os.writev`.
+
+        Args:
+            encoding: The encoding of the output.
+
+        Returns:
+            The rendered element, as a list of encoded segments.
+        """
+        return list(self._iter_encoded(encoding))
+
+    def rendered_length(self, encoding: str = "utf-8") -> int:
+        """Compute the length of the rendered element once encoded
+
+        The element is never rendered as a whole, which makes this suitable for setting
+        the `Content-Length` header, or answering `HEAD` requests.
+
+        Args:
+            encoding: The encoding of the output.
+
+        Returns:
+            The length in bytes of the rendered element.
+        """
+        encoding = codecs.lookup(encoding).name
+        utf8 = encoding == "utf-8"
+        encode = codecs.getincrementalencoder(encoding)().encode
+        copy_encoded = _concatenable(encoding)
+        length = 0
+        for part in self._iter_parts():
+            if utf8 and part.isascii():
+                length += len(part)
+            elif (
+                copy_encoded
+                and type(part) is _EncodedText
+                and part.encoding == encoding
+            ):
+                length += len(encode("", final=True)) + len(part.data)
+            else:
+                length += len(encode(part))
+        return length + len(encode("", final=True))
+
+    def freeze(self, encoding: str = "utf-8") -> FrozenNode:
+        """Render the current element once into an immutable node
+
+        The returned node renders as the current element did when it was frozen, without
+        walking its subtree again. It can be added to any number of elements, even from
+        different threads at the same time. Its content is already encoded, so that
+        `render_bytes` and `render_segments` can use it as it is when rendering with the
+        same encoding.
+
+        Args:
+            encoding: The encoding of the stored content.
+
+        Returns:
+            The frozen node.
+        """
+        frozen = FrozenNode(str(self).encode(encoding), encoding)
+        # Neither of them is added to the current `with` block, if any: the frozen node
+        # replaces the original element
+        self._remove_from_stack(frozen)
+        self._remove_from_stack(self)
+        return frozen
+
+    def write_to(
+        self, fp: _SupportsWrite, chunk_size: int = 8192, *, minify: bool = False
+    ) -> None:
+        """Render the current element directly into a file-like object
+
+        Args:
+            fp: The file-like object, only its `write` method is used.
+            chunk_size: The maximum length of each chunk passed to `fp.write`.
+            minify: Whether to minify the output, as in `render`.
+        """
+        for chunk in self.iter_render(chunk_size, minify=minify):
+            fp.write(chunk)
+
     # Dunder methods
     @overload
     def __getitem__(self, key: str) -> str | bool: ...
@@ -302,21 +1382,30 @@ class BaseElement:
             self._add_child(val, idx=key, idx_replace=True)
         else:
             val = cast("Iterable[_T_child]", val)
-            children = [
-                TextNode(child) if not isinstance(child, BaseElement) else child
-                for child in val
-            ]
+            self._invalidate_cache()
+            children = [self._to_element(child) for child in val]
+            removed = self._children[key]
             self._children[key] = children
+            for child in removed:
+                self._orphan(child)
+            stack = self._stack_var.get()
+            pending = stack[-1] if stack else None
             for child in children:
-                self._remove_from_stack(child)
+                self._adopt(child)
+                if pending:
+                    pending.pop(child, None)
 
     def __delitem__(
         self, key: str | int | slice[int | None, int | None, int | None]
     ) -> None:
+        self._invalidate_cache()
         if isinstance(key, str):
             del self._attributes[key]
         else:
+            removed = self._children[key]
             del self._children[key]
+            for child in removed if isinstance(removed, list) else (removed,):
+                self._orphan(child)
 
     def __add__(self, other: _T_child) -> BaseElement:
         return BaseElement(self, other)
@@ -325,7 +1414,7 @@ class BaseElement:
         return BaseElement(other, self)
 
     def __enter__(self: _T_BaseElement) -> _T_BaseElement:
-        self._stack.append([])
+        self._stack_var.set((*self._stack_var.get(), {}))
         return self
 
     def __exit__(
@@ -334,9 +1423,10 @@ class BaseElement:
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
-        for child in self._stack.pop():
+        stack = self._stack_var.get()
+        self._stack_var.set(stack[:-1])
+        for child in stack[-1]:
             self._add_child(child, exit_context_manager=True)
-        self._maybe_clear_stack()
 
     def __len__(self) -> int:
         return len(self._children)  # pragma: no cover
@@ -350,10 +1440,254 @@ class BaseElement:
     def __str__(self) -> str:
         return "".join(self._render())
 
+    def __reduce__(self) -> tuple[Callable[[list[object]], BaseElement], tuple[object]]:
+        flat: list[object] = []
+        _flatten((self,), flat)
+        return _unpickle, (flat,)
+
+
+# The slots of every element class pickled so far, and whether its instances also have
+# a `__dict__`, which is the case for subclasses not defining `__slots__`
+_layouts: dict[type[BaseElement], tuple[tuple[str, ...], bool]] = {}
+
+
+def _layout(cls: type[BaseElement]) -> tuple[tuple[str, ...], bool]:
+    layout = _layouts.get(cls)
+    if layout is None:
+        slots: list[str] = []
+        for base in reversed(cls.__mro__):
+            names = cast("dict[str, object]", vars(base)).get("__slots__", ())
+            if isinstance(names, str):
+                names = (names,)
+            names = cast("Iterable[str]", names)
+            slots.extend(x for x in names if x not in ("__dict__", "__weakref__"))
+        layout = _layouts[cls] = (tuple(slots), cls.__dictoffset__ != 0)
+    return layout
+
+
+def _flatten(
+    elements: Iterable[BaseElement], flat: list[object], max_size: int | None = None
+) -> int | None:
+    # Elements are pickled as a flat list of their subtrees in depth-first order, so
+    # that deep trees don't hit the recursion limit, and references to parents and the
+    # content of the render cache are left out. Each element is followed by its number
+    # of children, and is stored as:
+    # - its text, for text nodes without attributes
+    # - its class and its attributes, for elements without any other state
+    # - `None`, its class and its instance attributes, for everything else
+    # The subtrees are appended to `flat`, and their number of elements is returned.
+    # If `max_size` is given, `None` is returned instead as soon as there are more
+    # elements than that or an element which can only be rendered by the current
+    # thread (see `BaseElement.render_parallel`), and `flat` is left as it was.
+    start = len(flat)
+    append = flat.append
+    size = 0
+    stack = list(elements)
+    stack.reverse()
+    while stack:
+        element = stack.pop()
+        size += 1
+        if max_size is not None and size > max_size:
+            del flat[start:]
+            return None
+        cls = type(element)
+        slots, has_dict = _layout(cls)
+        plain = (
+            element._render_cache is None  # noqa: SLF001
+            and not element._prepend_doctype  # noqa: SLF001
+            and not (has_dict and cast("dict[str, object]", vars(element)))
+        )
+        if plain and cls is TextNode:
+            if not element._attributes:  # noqa: SLF001
+                append(cast("TextNode", element)._text)  # noqa: SLF001
+                continue
+        elif plain and len(slots) == _ELEMENT_SLOTS:
+            children = element._children  # noqa: SLF001
+            append(cls)
+            append(element._attributes)  # noqa: SLF001
+            append(len(children))
+            stack.extend(reversed(children))
+            continue
+        if max_size is not None and (
+            element._render_out_of_order  # noqa: SLF001
+            or element._render_cache is not None  # noqa: SLF001
+            or isinstance(element, (AwaitableNode, LazyNode))
+        ):
+            del flat[start:]
+            return None
+        children = element._children  # noqa: SLF001
+        append(None)
+        append(cls)
+        state = {
+            key: cast("object", getattr(element, key))
+            for key in slots
+            if key not in _UNPICKLED_ATTRIBUTES and hasattr(element, key)
+        }
+        if has_dict:
+            state.update(cast("dict[str, object]", vars(element)))
+        state["_render_cache"] = element._render_cache is not None  # noqa: SLF001
+        if issubclass(cls, TextNode):
+            state["_escaped"] = None
+        append(state)
+        append(len(children))
+        stack.extend(reversed(children))
+    return size
+
+
+def _unflatten(flat: list[object]) -> list[BaseElement]:
+    roots: list[BaseElement] = []
+    # Elements whose children are still being added, and how many are missing
+    stack: list[tuple[BaseElement, int]] = []
+    idx = 0
+    while idx < len(flat):
+        entry = flat[idx]
+        element: BaseElement
+        if entry is None:
+            cls = cast("type[BaseElement]", flat[idx + 1])
+            state = cast("dict[str, object]", flat[idx + 2])
+            state["_render_cache"] = _RenderCache() if state["_render_cache"] else None
+            state["_children"] = []
+            state["_parents"] = None
+            element = cls.__new__(cls)
+            for key, val in state.items():
+                # Bypasses `__setattr__`, which frozen elements don't allow
+                object.__setattr__(element, key, val)
+            children = cast("int", flat[idx + 3])
+            idx += 4
+        else:
+            if isinstance(entry, str):
+                text = TextNode.__new__(TextNode)
+                text._text = entry  # noqa: SLF001
+                text._escaped = None  # noqa: SLF001
+                element = text
+                element._attributes = {}  # noqa: SLF001
+                children = 0
+                idx += 1
+            else:
+                cls = cast("type[BaseElement]", entry)
+                element = cls.__new__(cls)
+                element._attributes = cast(  # noqa: SLF001
+                    "dict[str, str | Literal[True]]", flat[idx + 1]
+                )
+                children = cast("int", flat[idx + 2])
+                idx += 3
+            element._prepend_doctype = False  # noqa: SLF001
+            element._render_cache = None  # noqa: SLF001
+            element._children = []  # noqa: SLF001
+            element._parents = None  # noqa: SLF001
+
+        if not stack:
+            roots.append(element)
+        else:
+            parent, missing = stack[-1]
+            parent._children.append(element)  # noqa: SLF001
+            parent._adopt(element)  # noqa: SLF001
+            if missing == 1:
+                stack.pop()
+            else:
+                stack[-1] = (parent, missing - 1)
+        if children:
+            stack.append((element, children))
+    return roots
+
+
+def _unpickle(flat: list[object]) -> BaseElement:
+    return _unflatten(flat)[0]
+
+
+def _render_flat(flat: list[object]) -> str:  # pragma: no cover
+    # Runs in the worker processes
+    return "".join(BaseElement._walk(_unflatten(flat)))  # noqa: SLF001
+
+
+def _render_elements(elements: list[BaseElement]) -> str:
+    return "".join(BaseElement._walk(elements))  # noqa: SLF001
+
+
+class _ParallelRenderer:
+    # Walks the tree like `BaseElement._walk`, but collects consecutive siblings small
+    # enough to be rendered elsewhere into batches, submitted to the executor as soon
+    # as they are large enough
+
+    def __init__(self, executor: Executor, min_subtree_size: int) -> None:
+        self._executor = executor
+        self._min_subtree_size = min_subtree_size
+        # Threads share the elements, there's no need to copy them
+        self._shared = isinstance(executor, ThreadPoolExecutor)
+        self._pieces: list[str | Future[str]] = []
+        self._batch: list[BaseElement] = []
+        # The batch flattened, which is also how the size of the subtrees is measured
+        self._flat: list[object] = []
+        self._batch_size = 0
+
+    def _submit(self) -> None:
+        if self._shared:
+            batch = self._batch.copy()
+            self._pieces.append(self._executor.submit(_render_elements, batch))
+        else:
+            flat = self._flat.copy()
+            self._pieces.append(self._executor.submit(_render_flat, flat))
+        self._batch.clear()
+        self._flat.clear()
+        self._batch_size = 0
+
+    def _add(self, text: str) -> None:
+        if self._batch:
+            # Too small to be worth submitting
+            self._pieces.append(_render_elements(self._batch))
+            self._batch.clear()
+            self._flat.clear()
+            self._batch_size = 0
+        if text:
+            self._pieces.append(text)
+
+    def _walk(self, element: BaseElement) -> None:
+        stack: list[tuple[Iterator[_T_render_child], str]] = [(iter((element,)), "")]
+        while stack:
+            children, end_tag = stack[-1]
+            for child in children:
+                if isinstance(child, str):
+                    self._add(child)
+                    continue
+                if child._render_cache is not None:  # noqa: SLF001
+                    self._add(child._render_cached())  # noqa: SLF001
+                    continue
+                size = _flatten((child,), self._flat, self._min_subtree_size)
+                if size is not None:
+                    self._batch.append(child)
+                    self._batch_size += size
+                    if self._batch_size >= self._min_subtree_size:
+                        self._submit()
+                    continue
+                start_tag, grandchildren, child_end_tag = child._render_parts()  # noqa: SLF001
+                self._add(start_tag)
+                if grandchildren:
+                    stack.append((iter(grandchildren), child_end_tag))
+                    break
+                self._add(child_end_tag)
+            else:
+                stack.pop()
+                self._add(end_tag)
+        self._add("")
+
+    def render(self, element: BaseElement) -> str:
+        try:
+            self._walk(element)
+            return "".join(
+                piece if isinstance(piece, str) else piece.result()
+                for piece in self._pieces
+            )
+        finally:
+            for piece in self._pieces:
+                if not isinstance(piece, str):
+                    piece.cancel()
+
 
 class TextNode(BaseElement):
     """Class representing a text node"""
 
+    __slots__ = ("_escaped", "_text")
+
     def __init__(self, text: str | float) -> None:
         """
         Args:
@@ -361,16 +1695,186 @@ class TextNode(BaseElement):
         """
         if not isinstance(text, str):
             text = str(text)
-        self.text = text
+        self._text = text
+        # The escaped text, stored the first time the node is rendered
+        self._escaped: str | None = None
 
         super().__init__()
 
-    def _render(self) -> list[str]:
-        return [escape(self.text)]
+    @property
+    def text(self) -> str:
+        """
+        Returns:
+            The content of the text node.
+        """
+        return self._text
+
+    @text.setter
+    def text(self, text: str) -> None:
+        self._invalidate_cache()
+        self._text = text
+        self._escaped = None
+
+    def _render_parts(self) -> tuple[str, Iterable[_T_render_child], str]:
+        if self._escaped is not None:
+            return self._escaped, (), ""
+        text = self._text
+        if len(text) <= _TEXT_SLICE_SIZE:
+            self._escaped = _escape(text)
+            return self._escaped, (), ""
+        # Long text is never stored escaped, to avoid keeping two copies of it
+        slices = range(0, len(text), _TEXT_SLICE_SIZE)
+        return "", (_escape(text[i : i + _TEXT_SLICE_SIZE]) for i in slices), ""
 
 
 class RawTextNode(TextNode):
     """Class representing a text node, without escaping the content"""
 
-    def _render(self) -> list[str]:
-        return [self.text]
+    __slots__ = ()
+
+    def __init__(self, text: str | bytes | float, encoding: str = "utf-8") -> None:
+        """
+        Args:
+            text: The content of the text node. Bytes are decoded using `encoding`, and
+                `BaseElement.render_bytes` uses them as they are when rendering with the
+                same encoding.
+            encoding: The encoding of `text`, only used if it is a bytes object.
+        """
+        if isinstance(text, bytes):
+            text = _EncodedText(text, encoding)
+        super().__init__(text)
+
+    def _render_parts(self) -> tuple[str, Iterable[_T_render_child], str]:
+        return self._text, (), ""
+
+
+class FrozenNode(RawTextNode):
+    """Class representing an immutable, pre-rendered element
+
+    Frozen nodes are usually created with `BaseElement.freeze`. Trying to modify them
+    raises `FrozenElementError`.
+    """
+
+    __slots__ = ("_sealed",)
+
+    _frozen = True
+
+    def __init__(self, text: str | bytes, encoding: str = "utf-8") -> None:
+        """
+        Args:
+            text: The rendered content of the node.
+            encoding: The encoding of `text`, only used if it is a bytes object.
+        """
+        super().__init__(text, encoding)
+        self._sealed = True
+
+    def _invalidate_cache(self) -> None:
+        raise exc.FrozenElementError
+
+    def __enter__(self: _T_BaseElement) -> _T_BaseElement:
+        raise exc.FrozenElementError
+
+    def __setattr__(self, name: str, value: object) -> None:
+        # `_sealed` is only set at the end of `__init__`
+        if cast("bool", getattr(self, "_sealed", False)):
+            raise exc.FrozenElementError
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise exc.FrozenElementError
+
+
+class AwaitableNode(BaseElement):
+    """Class representing a child which is still waiting for its content"""
+
+    __slots__ = ("_awaitable",)
+
+    def __init__(self, awaitable: Awaitable[_T_content]) -> None:
+        """
+        Args:
+            awaitable: An awaitable returning the content of the node, converted into a
+                `TextNode` if required. It is awaited by `BaseElement.arender`.
+        """
+        self._awaitable: Awaitable[_T_content] | None = awaitable
+
+        super().__init__()
+
+    @property
+    def resolved(self) -> bool:
+        """
+        Returns:
+            Whether the awaitable has already been awaited.
+        """
+        return self._awaitable is None
+
+    async def resolve(self) -> None:
+        """Await the awaitable and add its result as the only child of the node"""
+        if self._awaitable is None:
+            return
+        child = await self._awaitable
+        self._awaitable = None
+        self._add_child(child)
+
+    def _render_parts(self) -> tuple[str, Iterable[_T_render_child], str]:
+        if self._awaitable is not None:
+            raise exc.UnresolvedAwaitableError
+        return "", self._children, ""
+
+
+class LazyNode(BaseElement):
+    """Class representing children which are only created while rendering
+
+    The children of an iterator are produced when the node is rendered, and consumed
+    one at a time: when streaming, a generator (for example one building a row for
+    every record of a database cursor) is only advanced as the output is sent, so all
+    its children never exist at the same time. Iterators can only be rendered once. A
+    function is only called when the node is rendered, every time, so sections which
+    are never rendered are never built. The children of other iterables, like lists,
+    are converted right away, and behave like any other child. Awaitables among the
+    children are not awaited, and with `minify` the children of the node are collected
+    before being rendered, since omitting tags depends on the siblings of each element.
+
+    An iterator created inside a `with` block while elements created earlier in the
+    block are still waiting to be added is consumed right away, since those elements
+    belong to the node if it produces them.
+    """
+
+    __slots__ = ("_content",)
+
+    def __init__(self, content: Iterable[_T_child] | Callable[[], _T_child]) -> None:
+        """
+        Args:
+            content: An iterable over the children, or a function returning them. The
+                children are converted as in `BaseElement.add`, so a function can also
+                return a list or a generator.
+        """
+        stack = self._stack_var.get()
+        pending = bool(stack and stack[-1])
+
+        super().__init__()
+
+        self._content: Iterator[_T_child] | Callable[[], _T_child] | None = None
+        if not isinstance(content, Iterable) or (
+            isinstance(content, Iterator) and not pending
+        ):
+            self._content = content
+        else:
+            # As in `extend`, elements created beforehand in the current `with` block
+            # belong to the node instead
+            self.extend(content)
+
+    def _iter_children(
+        self, content: Iterator[_T_child] | Callable[[], _T_child]
+    ) -> Iterator[BaseElement]:
+        children = content if isinstance(content, Iterator) else (content(),)
+        for child in children:
+            element = self._to_element(child)
+            # Elements created while rendering are not added to the element currently
+            # used as a context manager, if any
+            self._remove_from_stack(element)
+            yield element
+
+    def _render_parts(self) -> tuple[str, Iterable[_T_render_child], str]:
+        if self._content is None:
+            return "", self._children, ""
+        return "", self._iter_children(self._content), ""
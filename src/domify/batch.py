@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import functools
+import os
+import pickle
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import Literal, TypeVar, cast, overload
+
+from domify.base_element import BaseElement
+
+if sys.version_info >= (3, 14):
+    from concurrent.futures import InterpreterPoolExecutor as _InterpreterPoolExecutor
+else:
+    # Subinterpreters are not available, threads are used instead
+    _InterpreterPoolExecutor = ThreadPoolExecutor
+
+_T = TypeVar("_T")
+_T_output = str | bytes
+_T_chunk = list[tuple[int, _T_output]]
+
+# How many chunks are submitted to every worker before waiting for the results, so
+# that workers don't have to wait for the next chunk, while keeping only a few of them
+# in memory
+_CHUNKS_PER_WORKER = 2
+
+
+def _render_chunk(
+    builder: Callable[[_T], BaseElement],
+    encoding: str | None,
+    minify: bool,
+    chunk: list[tuple[int, _T]],
+) -> _T_chunk:
+    results: _T_chunk = []
+    for idx, record in chunk:
+        element = builder(record)
+        output: _T_output
+        if encoding is None:
+            output = element.render(minify=minify)
+        elif minify:
+            output = element.render(minify=True).encode(encoding)
+        else:
+            output = bytes(element.render_bytes(encoding))
+        results.append((idx, output))
+    return results
+
+
+def _init_interpreter(path: list[str], initializer: bytes) -> None:
+    # Subinterpreters start with the default `sys.path` rather than the current one,
+    # which is needed to import the initializer and the builder
+    sys.path[:] = path
+    func = cast("Callable[[], object] | None", pickle.loads(initializer))
+    if func is not None:
+        func()
+
+
+def _pop_result(pending: list[Future[_T_chunk]], *, ordered: bool) -> _T_chunk:
+    if ordered:
+        future = pending.pop(0)
+    else:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        future = done.pop()
+        pending.remove(future)
+    return future.result()
+
+
+def _iter_chunks(
+    builder: Callable[[_T], BaseElement],
+    records: Iterable[_T],
+    *,
+    workers: int | None,
+    chunksize: int,
+    pool: Literal["processes", "interpreters"],
+    ordered: bool,
+    encoding: str | None,
+    minify: bool,
+    initializer: Callable[[], object] | None,
+) -> Iterator[_T_chunk]:
+    render = functools.partial(_render_chunk, builder, encoding, minify)
+    numbered = enumerate(records)
+    chunks = iter(lambda: list(islice(numbered, chunksize)), [])
+    if workers == 0:
+        if initializer is not None:
+            initializer()
+        yield from map(render, chunks)
+        return
+
+    max_pending = (workers or os.cpu_count() or 1) * _CHUNKS_PER_WORKER
+    executor: Executor
+    if pool == "processes":
+        executor = ProcessPoolExecutor(workers, initializer=initializer)
+    else:
+        executor = _InterpreterPoolExecutor(
+            workers,
+            initializer=_init_interpreter,
+            initargs=(sys.path, pickle.dumps(initializer)),
+        )
+    pending: list[Future[_T_chunk]] = []
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(render, chunk))
+            if len(pending) >= max_pending:
+                yield _pop_result(pending, ordered=ordered)
+        while pending:
+            yield _pop_result(pending, ordered=ordered)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+@overload
+def render_many(
+    builder: Callable[[_T], BaseElement],
+    records: Iterable[_T],
+    *,
+    workers: int | None = ...,
+    chunksize: int = ...,
+    pool: Literal["processes", "interpreters"] = ...,
+    ordered: Literal[True] = ...,
+    encoding: None = ...,
+    minify: bool = ...,
+    initializer: Callable[[], object] | None = ...,
+) -> Iterator[str]: ...
+
+
+@overload
+def render_many(
+    builder: Callable[[_T], BaseElement],
+    records: Iterable[_T],
+    *,
+    workers: int | None = ...,
+    chunksize: int = ...,
+    pool: Literal["processes", "interpreters"] = ...,
+    ordered: Literal[True] = ...,
+    encoding: str,
+    minify: bool = ...,
+    initializer: Callable[[], object] | None = ...,
+) -> Iterator[bytes]: ...
+
+
+@overload
+def render_many(
+    builder: Callable[[_T], BaseElement],
+    records: Iterable[_T],
+    *,
+    workers: int | None = ...,
+    chunksize: int = ...,
+    pool: Literal["processes", "interpreters"] = ...,
+    ordered: Literal[False],
+    encoding: None = ...,
+    minify: bool = ...,
+    initializer: Callable[[], object] | None = ...,
+) -> Iterator[tuple[int, str]]: ...
+
+
+@overload
+def render_many(
+    builder: Callable[[_T], BaseElement],
+    records: Iterable[_T],
+    *,
+    workers: int | None = ...,
+    chunksize: int = ...,
+    pool: Literal["processes", "interpreters"] = ...,
+    ordered: Literal[False],
+    encoding: str,
+    minify: bool = ...,
+    initializer: Callable[[], object] | None = ...,
+) -> Iterator[tuple[int, bytes]]: ...
+
+
+def render_many(
+    builder: Callable[[_T], BaseElement],
+    records: Iterable[_T],
+    *,
+    workers: int | None = None,
+    chunksize: int = 100,
+    pool: Literal["processes", "interpreters"] = "processes",
+    ordered: bool = True,
+    encoding: str | None = None,
+    minify: bool = False,
+    initializer: Callable[[], object] | None = None,
+) -> Iterator[_T_output] | Iterator[tuple[int, _T_output]]:
+    """Build and render a document for every record on a pool of workers
+
+    The records are sent to the workers in chunks of `chunksize`, and only the rendered
+    output is sent back, never the elements. Records are read lazily, and only a few
+    chunks per worker are waiting to be rendered at any time, so `records` can be a
+    generator over millions of rows.
+
+    The workers are kept for the whole run, so anything built once per process, such as
+    frozen elements and compiled templates created at import time or by `initializer`,
+    is built once per worker and shared by every document it renders. `builder`, the
+    records and the output must be picklable: `builder` has to be defined at module
+    level.
+
+    Subinterpreters (PEP 734) run in parallel like processes, but live in the current
+    process, so they start faster and use less memory. They don't share any object:
+    each of them imports its own copy of `domify` and of the module defining `builder`.
+    They are only available from Python 3.14, threads are used instead on older
+    versions.
+
+    Args:
+        builder: The function building the document for a record.
+        records: The records.
+        workers: The number of worker processes, defaulting to the number of CPUs, or
+            0 to build and render every document in the current process.
+        chunksize: The number of records sent to a worker at once.
+        pool: Whether the workers are `processes` or `interpreters`.
+        ordered: Whether to return the documents in the order of the records.
+            Otherwise, they are returned as soon as their chunk is rendered, together
+            with the index of their record.
+        encoding: The encoding of the returned documents, which are returned as `str`
+            if not given.
+        minify: Whether to minify the documents, as in `BaseElement.render`.
+        initializer: A function called once by every worker when it starts.
+
+    Returns:
+        An iterator over the rendered documents, or over `(index, document)` pairs if
+        `ordered` is false.
+    """
+    chunks = _iter_chunks(
+        builder,
+        records,
+        workers=workers,
+        chunksize=chunksize,
+        pool=pool,
+        ordered=ordered,
+        encoding=encoding,
+        minify=minify,
+        initializer=initializer,
+    )
+    if ordered:
+        return (output for chunk in chunks for _, output in chunk)
+    return (result for chunk in chunks for result in chunk)
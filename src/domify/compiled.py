@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import functools
+import re
+from collections.abc import Callable, Sequence
+from contextvars import copy_context
+from typing import ParamSpec, Protocol, cast
+
+from domify import exc
+from domify.base_element import BaseElement, FrozenNode, RawTextNode, _escape, _T_child
+from domify.validation import _values_var
+
+_P = ParamSpec("_P")
+
+# Placeholders passed to the builder function in place of its arguments. They only
+# contain characters which are never escaped, so they can be found in the output.
+_HOLE = "\x00{}\x00"
+_HOLE_PATTERN = re.compile("\x00([0-9]+)\x00")
+# The placeholders in attribute values are marked with an `a` once the builder function
+# has returned, to tell them apart from the ones in the content
+_ATTRIBUTE_HOLE = "\x00\\1a\x00"
+# What is found between the null characters of the output
+_HOLE_PART = re.compile("([0-9]+)(a)?")
+
+
+class _Builder(Protocol):
+    def __call__(self, *args: str, **kwargs: str) -> BaseElement: ...
+
+
+class _Template:
+    def __init__(self, output: str, names: Sequence[str]) -> None:
+        # `output` alternates static content and argument indexes
+        parts = output.split("\x00")
+        statics = parts[::2]
+        holes = [_HOLE_PART.fullmatch(x) for x in parts[1::2]]
+        if len(parts) % 2 == 0 or not all(holes):
+            msg = "An argument was modified before being used as content"
+            raise exc.CompiledTemplateError(msg)
+        self._statics = [FrozenNode(x.encode()) if x else None for x in statics]
+
+        # The argument of each hole, and whether it's in an attribute value
+        self._holes: list[tuple[int, bool]] = [
+            (int(match[1]), match[2] is not None)
+            for match in cast("list[re.Match[str]]", holes)
+        ]
+
+        used = {idx for idx, _ in self._holes}
+        for idx, name in enumerate(names):
+            if idx not in used:
+                msg = f"Argument `{name}` is not used as content or as attribute value"
+                raise exc.CompiledTemplateError(msg)
+
+    def fill(self, values: Sequence[object]) -> BaseElement:
+        children: list[_T_child] = []
+        static = self._statics[0]
+        if static is not None:
+            children.append(static)
+        for (idx, attribute), static in zip(
+            self._holes, self._statics[1:], strict=True
+        ):
+            value = values[idx]
+            if not attribute:
+                children.append(cast("_T_child", value))
+            elif isinstance(value, bool) or value is None:
+                # They would add or remove the attribute, rather than set its value
+                msg = (
+                    f"Can't use {value} as attribute value, boolean attributes can't "
+                    "depend on arguments"
+                )
+                raise exc.CompiledTemplateError(msg)
+            elif isinstance(value, (str, int, float)):
+                # Escaped in advance, so that its whitespace is kept when minifying
+                children.append(RawTextNode(_escape(str(value))))
+            else:
+                msg = f"Can't use {type(value).__name__} as attribute value"
+                raise TypeError(msg)
+            if static is not None:
+                children.append(static)
+        return BaseElement(*children)
+
+
+def _mark_attribute_holes(element: BaseElement) -> None:
+    stack = [element]
+    while stack:
+        current = stack.pop()
+        attributes = current._attributes  # noqa: SLF001
+        for key, val in attributes.items():
+            if val is not True and "\x00" in val:
+                attributes[key] = _HOLE_PATTERN.sub(_ATTRIBUTE_HOLE, val)
+        stack.extend(current._children)  # noqa: SLF001
+
+
+def _compile(func: _Builder, args: int, kwargs: Sequence[str]) -> _Template:
+    # Runs in a copy of the current context, so that the elements created here are not
+    # added to the element currently used as a context manager, if any
+    BaseElement._stack_var.set(())  # noqa: SLF001
+    # Placeholders are rarely valid attribute values
+    _values_var.set(False)
+    holes = [_HOLE.format(idx) for idx in range(args + len(kwargs))]
+    element = func(*holes[:args], **dict(zip(kwargs, holes[args:], strict=True)))
+    _mark_attribute_holes(element)
+    names = [f"#{idx}" for idx in range(args)] + list(kwargs)
+    return _Template(str(element), names)
+
+
+def compiled(func: Callable[_P, BaseElement]) -> Callable[_P, BaseElement]:
+    """Compile a function building an element into a template
+
+    The first time the function is called with a given combination of positional and
+    keyword arguments, it is called with placeholders in place of the arguments, and its
+    output is split into static content, which is rendered once and shared between every
+    call, and holes, filled with the arguments of each call. The returned element is a
+    plain `BaseElement` containing the static content and the arguments.
+
+    Arguments can only be used as children (elements, awaitables, text or numbers, which
+    are escaped), or as attribute values (text or numbers), optionally as part of a
+    larger string. Boolean attributes, including attributes left out with `None`,
+    can't depend on them. The function must not otherwise depend on the value of its
+    arguments, since it is only called once.
+
+    Args:
+        func: The function to compile.
+
+    Returns:
+        A function with the same signature, filling the compiled template.
+    """
+    templates: dict[tuple[int, tuple[str, ...]], _Template] = {}
+
+    @functools.wraps(func)
+    def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> BaseElement:
+        names = tuple(sorted(kwargs))
+        key = (len(args), names)
+        template = templates.get(key)
+        if template is None:
+            builder = cast("_Builder", func)
+            template = copy_context().run(_compile, builder, len(args), names)
+            templates[key] = template
+        return template.fill([*args, *(kwargs[name] for name in names)])
+
+    return wrapper
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import codecs
+import functools
+import struct
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from typing import NamedTuple, TypeVar
+
+_T_SharedText = TypeVar("_T_SharedText", bound="_SharedText")
+
+# Shared text shorter than this is compressed along with the rest of the output, since
+# compressing it on its own costs more in compression ratio than it saves in time
+_SPLICE_MIN_SIZE = 4096
+# The size of the deflate window, which is also the largest useful preset dictionary
+_WINDOW_SIZE = 32768
+_ZEROS = bytes(65536)
+
+_ADLER_BASE = 65521
+
+
+def _is_concatenable(encoding: str) -> bool:
+    # Whether text encoded on its own can be copied as it is into a longer encoded
+    # output, which is not the case for encodings starting with a byte order mark, like
+    # `utf-16`
+    return "aa".encode(encoding) == "a".encode(encoding) * 2
+
+
+_concatenable = functools.lru_cache(maxsize=64)(_is_concatenable)
+
+
+class _Deflated(NamedTuple):
+    # Raw deflate blocks, ending with a sync flush so that more blocks can follow
+    data: bytes
+    # The checksum and length of the uncompressed text
+    checksum: int
+    size: int
+    # The end of the uncompressed text, used as preset dictionary for what follows it
+    tail: bytes
+
+
+class _SharedText(str):
+    # A string rendered once and shared between renders, which keeps its compressed
+    # form so that it's only compressed once
+    compressed: dict[tuple[str, str, int], _Deflated]
+
+    def __new__(cls: type[_T_SharedText], text: str) -> _T_SharedText:
+        self = super().__new__(cls, text)
+        self.compressed = {}
+        return self
+
+    def _encode(self, encoding: str) -> bytes:
+        return self.encode(encoding)
+
+
+def _crc32_zeros(length: int, crc: int) -> int:
+    for _ in range(length // len(_ZEROS)):
+        crc = zlib.crc32(_ZEROS, crc)
+    return zlib.crc32(_ZEROS[: length % len(_ZEROS)], crc)
+
+
+def _crc32_combine(crc1: int, crc2: int, length2: int) -> int:
+    # The CRC of the concatenation of two strings, given the CRC of each of them and
+    # the length of the second one. The CRC is affine, so the contribution of `crc1`
+    # is the same as if the second string only contained zeros.
+    return _crc32_zeros(length2, crc1) ^ _crc32_zeros(length2, 0) ^ crc2
+
+
+def _adler32_combine(adler1: int, adler2: int, length2: int) -> int:
+    low1, high1 = adler1 & 0xFFFF, adler1 >> 16
+    low2, high2 = adler2 & 0xFFFF, adler2 >> 16
+    low = (low1 + low2 - 1) % _ADLER_BASE
+    high = (high1 + high2 + length2 * (low1 - 1)) % _ADLER_BASE
+    return low | high << 16
+
+
+class _Compressor:
+    # Compresses the rendered output into a single gzip or zlib stream. Large shared
+    # text is compressed on its own the first time, and its raw deflate blocks are
+    # copied as they are in every following stream: the blocks don't refer to anything
+    # before them, and the compressor is restarted after them, with the end of the
+    # output as preset dictionary.
+
+    def __init__(self, content_encoding: str, encoding: str, level: int) -> None:
+        self._checksum_func: Callable[[bytes, int], int]
+        self._combine: Callable[[int, int, int], int]
+        self._gzip = content_encoding == "gzip"
+        if self._gzip:
+            self._header = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+            self._checksum_func, self._combine = zlib.crc32, _crc32_combine
+            self._initial_checksum = 0
+        elif content_encoding == "deflate":
+            # Only informative, the compression level used
+            effort = (
+                2 if level in (-1, 6) else 0 if level < 2 else 1 if level < 6 else 3
+            )
+            flags = effort << 6
+            flags += 31 - (0x78 << 8 | flags) % 31
+            self._header = bytes((0x78, flags))
+            self._checksum_func, self._combine = zlib.adler32, _adler32_combine
+            self._initial_checksum = 1
+        else:
+            msg = f"Unsupported content encoding {content_encoding!r}"
+            raise ValueError(msg)
+        self._checksum = self._initial_checksum
+        self._key = (content_encoding, codecs.lookup(encoding).name, level)
+        self._encoding = encoding
+        # The state of the encoding is kept between batches
+        self._encode = codecs.getincrementalencoder(encoding)().encode
+        self._splice_shared = _concatenable(encoding)
+        self._level = level
+        self._compressobj = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self._pending = False
+        self._size = 0
+        # The end of the uncompressed output, at least `_WINDOW_SIZE` bytes of it
+        self._tail: list[bytes] = []
+        self._tail_size = 0
+
+    def _append(self, data: bytes, size: int) -> None:
+        self._size += size
+        self._tail.append(data)
+        self._tail_size += len(data)
+        while self._tail_size - len(self._tail[0]) >= _WINDOW_SIZE:
+            self._tail_size -= len(self._tail.pop(0))
+
+    def _compress(self, data: bytes) -> bytes:
+        self._checksum = self._checksum_func(data, self._checksum)
+        self._append(data, len(data))
+        self._pending = True
+        return self._compressobj.compress(data)
+
+    def _flush(self) -> bytes:
+        if not self._pending:
+            return b""
+        self._pending = False
+        return self._compressobj.flush(zlib.Z_SYNC_FLUSH)
+
+    def _splice(self, text: _SharedText) -> bytes:
+        deflated = text.compressed.get(self._key)
+        if deflated is None:
+            data = text._encode(self._encoding)  # noqa: SLF001
+            compressobj = zlib.compressobj(self._level, zlib.DEFLATED, -zlib.MAX_WBITS)
+            deflated = _Deflated(
+                compressobj.compress(data) + compressobj.flush(zlib.Z_SYNC_FLUSH),
+                self._checksum_func(data, self._initial_checksum),
+                len(data),
+                data[-_WINDOW_SIZE:],
+            )
+            text.compressed[self._key] = deflated
+
+        output = self._flush() + deflated.data
+        self._checksum = self._combine(self._checksum, deflated.checksum, deflated.size)
+        self._append(deflated.tail, deflated.size)
+        window = b"".join(self._tail)[-_WINDOW_SIZE:]
+        self._compressobj = zlib.compressobj(
+            self._level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=window
+        )
+        return output
+
+    def _compress_batch(self, batch: list[str], *, final: bool = False) -> bytes:
+        # `final` brings the encoding back to its initial state, before copying text
+        # encoded on its own
+        data = self._encode("".join(batch), final=final)
+        return self._compress(data) if data else b""
+
+    def iter_compressed(
+        self, parts: Iterable[str], chunk_size: int, flush_parts: frozenset[str]
+    ) -> Iterator[bytes]:
+        """Compress the given parts, flushing the output regularly
+
+        Args:
+            parts: The rendered parts.
+            chunk_size: The length of the parts after which the output is flushed.
+            flush_parts: Parts after which the output is flushed.
+
+        Yields:
+            The compressed data, which can be decompressed along with everything
+            returned before it.
+        """
+        output = [self._header]
+        self._header = b""
+        batch: list[str] = []
+        batched = 0
+        for part in parts:
+            if (
+                self._splice_shared
+                and type(part) is not str
+                and isinstance(part, _SharedText)
+                and len(part) >= _SPLICE_MIN_SIZE
+            ):
+                output.append(self._compress_batch(batch, final=True))
+                batch.clear()
+                output.append(self._splice(part))
+            else:
+                batch.append(part)
+            batched += len(part)
+            if batched >= chunk_size or part in flush_parts:
+                if batch:
+                    output.append(self._compress_batch(batch))
+                    batch.clear()
+                output.append(self._flush())
+                yield b"".join(output)
+                output.clear()
+                batched = 0
+        if batch:
+            output.append(self._compress_batch(batch))
+        output.append(self._flush())
+        if any(output):
+            yield b"".join(output)
+
+    def finish(self) -> bytes:
+        """End the stream
+
+        Returns:
+            The remaining compressed data, followed by the trailer of the stream.
+        """
+        output = [
+            self._header,
+            self._compress_batch([], final=True),
+            self._compressobj.flush(zlib.Z_FINISH),
+        ]
+        if self._gzip:
+            output.append(struct.pack("<II", self._checksum, self._size & 0xFFFFFFFF))
+        else:
+            output.append(struct.pack(">I", self._checksum))
+        return b"".join(output)
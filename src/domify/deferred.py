@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+
+from domify import html_elements as e
+from domify.base_element import BaseElement, _T_child, _T_content, _T_render_child
+
+# Replaces everything between the placeholder markers with the deferred content
+_SWAP_SCRIPT = (
+    "(function(i){"
+    "var s=document.getElementById(i),"
+    'e=document.getElementById(i+"-end"),'
+    'c=document.getElementById(i+"-content");'
+    "while(s.nextSibling!==e)s.nextSibling.remove();"
+    "e.replaceWith(...c.content.childNodes);"
+    "s.remove();c.remove();document.currentScript.remove()"
+    "})"
+)
+
+
+class Deferred(BaseElement):
+    """Class representing content rendered out of order when streaming
+
+    When using `BaseElement.iter_render` or `BaseElement.aiter_render`, a placeholder
+    (followed by the fallback content, if any) is rendered instead of the content, and
+    the rest of the document is streamed without waiting for it. The content is then
+    appended at the end of the document inside a `template` element, together with a
+    small script moving it in place of the placeholder. It is rendered normally in every
+    other case.
+    """
+
+    __slots__ = ("_fallback", "_loader")
+
+    _render_out_of_order = True
+
+    def __init__(
+        self,
+        content: _T_child | Callable[[], _T_child],
+        fallback: _T_content | None = None,
+    ) -> None:
+        """
+        Args:
+            content: The deferred content. It can be an awaitable, resolved
+                concurrently with the rest of the document by
+                `BaseElement.aiter_render`, or a callable, only called when the
+                content is rendered.
+            fallback: Content shown in place of the deferred content until the latter
+                is streamed.
+        """
+        super().__init__()
+
+        self._loader: Callable[[], _T_child] | None = None
+        if callable(content):
+            self._loader = content
+        else:
+            self._add_child(content)
+
+        self._fallback: BaseElement | None = None
+        if fallback is not None:
+            self._fallback = self._to_element(fallback)
+            self._remove_from_stack(self._fallback)
+
+    def _load(self) -> None:
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            self._add_child(loader())
+
+    def _render_parts(self) -> tuple[str, Iterable[_T_render_child], str]:
+        self._load()
+        return "", self._children, ""
+
+    def placeholder(self, idx: int) -> BaseElement:
+        """Build the placeholder rendered in place of the content when streaming
+
+        Args:
+            idx: The index of the element among the ones deferred in the document.
+
+        Returns:
+            The placeholder.
+        """
+        marker = f"domify-deferred-{idx}"
+        # `Template` is an empty element, so its end tag is added explicitly
+        placeholder = BaseElement(e.Template(id=marker), e.RawTextNode("</template>"))
+        if self._fallback is not None:
+            placeholder.add(self._fallback)
+        placeholder.add(e.Template(id=f"{marker}-end"))
+        placeholder.add(e.RawTextNode("</template>"))
+        self._remove_from_stack(placeholder)
+        return placeholder
+
+    def fragment(self, idx: int) -> BaseElement:
+        """Build the fragment appended at the end of the document when streaming
+
+        Args:
+            idx: The index of the element among the ones deferred in the document.
+
+        Returns:
+            The content inside a `template` element, followed by the script which moves
+            it in place of the placeholder.
+        """
+        self._load()
+        marker = f"domify-deferred-{idx}"
+        # The content of a `template` element is parsed on its own, so that it's kept
+        # even if it's only allowed in a specific context, like table rows
+        fragment = BaseElement(
+            e.Template(id=f"{marker}-content"),
+            *self._children,
+            e.RawTextNode("</template>"),
+            e.Script(e.RawTextNode(f'{_SWAP_SCRIPT}("{marker}")')),
+        )
+        self._remove_from_stack(fragment)
+        return fragment
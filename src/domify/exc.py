@@ -10,6 +10,18 @@ class EmptyElementChildrenError(Exception):
     """Trying to add a children to a empty element"""
 
 
+class UnresolvedAwaitableError(Exception):
+    """Trying to render an awaitable child before awaiting it"""
+
+
+class FrozenElementError(Exception):
+    """Trying to modify a frozen element"""
+
+
+class CompiledTemplateError(Exception):
+    """Function which can't be compiled into a template"""
+
+
 class InvalidAttributeWarning(UserWarning):
     """Invalid element attribute"""
 
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-from functools import partial
-
 from domify import validators as v
+from domify.base_element import AwaitableNode as AwaitableNode
 from domify.base_element import BaseElement
+from domify.base_element import FrozenNode as FrozenNode
+from domify.base_element import LazyNode as LazyNode
 from domify.base_element import RawTextNode as RawTextNode
 from domify.base_element import TextNode as TextNode
 
@@ -17,49 +18,55 @@ class HtmlElement(BaseElement):
     Base class for html elements, contains global attributes.
     """
 
+    __slots__ = ()
+
     global_attributes = {
-        "accesskey": v.attribute_all(
-            v.attribute_unique_set, lambda x: max(len(t) for t in str(x).split()) <= 1
+        "accesskey": v.attribute_tokens("[^ ]"),
+        "autocapitalize": frozenset(
+            {"on", "off", "none", "sentences", "words", "characters"}
         ),
-        "autocapitalize": {"on", "off", "none", "sentences", "words", "characters"},
-        "autocorrect": {"on", "off", ""},
+        "autocorrect": frozenset({"on", "off", ""}),
         "autofocus": v.attribute_bool,
         "class": v.attribute_str,
-        "contenteditable": {"true", "false", "plaintext-only", ""},
-        "dir": {"ltr", "rtl", "auto"},
-        "draggable": {"true", "false"},
-        "enterkeyhint": {"enter", "done", "go", "next", "previous", "search", "send"},
-        "headingoffset": partial(v.attribute_int, ge=0, le=8),
+        "contenteditable": frozenset({"true", "false", "plaintext-only", ""}),
+        "dir": frozenset({"ltr", "rtl", "auto"}),
+        "draggable": frozenset({"true", "false"}),
+        "enterkeyhint": frozenset(
+            {"enter", "done", "go", "next", "previous", "search", "send"}
+        ),
+        "headingoffset": v.attribute_number(ge=0, le=8),
         "headingreset": v.attribute_bool,
-        "hidden": {"until-found", "hidden", ""},
+        "hidden": frozenset({"until-found", "hidden", ""}),
         "id": v.attribute_str,
         "inert": v.attribute_bool,
-        "inputmode": {
-            "none",
-            "text",
-            "tel",
-            "email",
-            "url",
-            "numeric",
-            "decimal",
-            "search",
-        },
+        "inputmode": frozenset(
+            {
+                "none",
+                "text",
+                "tel",
+                "email",
+                "url",
+                "numeric",
+                "decimal",
+                "search",
+            }
+        ),
         "is": v.attribute_str,
         "itemid": v.attribute_str,
-        "itemprop": v.attribute_unique_set,
-        "itemref": v.attribute_unique_set,
+        "itemprop": v.attribute_tokens(),
+        "itemref": v.attribute_tokens(),
         "itemscope": v.attribute_bool,
-        "itemtype": v.attribute_unique_set,
+        "itemtype": v.attribute_tokens(),
         "lang": v.attribute_str,
         "nonce": v.attribute_str,
-        "popover": {"auto", "manual", "hint", ""},
+        "popover": frozenset({"auto", "manual", "hint", ""}),
         "slot": v.attribute_str,
-        "spellcheck": {"true", "false", ""},
+        "spellcheck": frozenset({"true", "false", ""}),
         "style": v.attribute_str,
-        "tabindex": v.attribute_int,
+        "tabindex": v.attribute_number(),
         "title": v.attribute_str,
-        "translate": {"yes", "no", ""},
-        "writingsuggestions": {"true", "false", ""},
+        "translate": frozenset({"yes", "no", ""}),
+        "writingsuggestions": frozenset({"true", "false", ""}),
         "onauxclick": v.attribute_str,
         "onbeforeinput": v.attribute_str,
         "onbeforematch": v.attribute_str,
@@ -139,13 +146,15 @@ class A(HtmlElement):
     Hyperlink
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "download": v.attribute_str,
         "href": v.attribute_str,
         "hreflang": v.attribute_str,
         "ping": v.attribute_str,
         "referrerpolicy": v.attribute_str,
-        "rel": v.attribute_unique_set,
+        "rel": v.attribute_tokens(),
         "target": v.attribute_str,
         "type": v.attribute_str,
     }
@@ -156,18 +165,24 @@ class Abbr(HtmlElement):
     Abbreviation
     """
 
+    __slots__ = ()
+
 
 class Address(HtmlElement):
     """
     Contact information for a page or article element
     """
 
+    __slots__ = ()
+
 
 class Area(HtmlElement):
     """
     Hyperlink or dead area on an image map
     """
 
+    __slots__ = ()
+
     is_empty = True
     element_attributes = {
         "alt": v.attribute_str,
@@ -176,8 +191,8 @@ class Area(HtmlElement):
         "href": v.attribute_str,
         "ping": v.attribute_str,
         "referrerpolicy": v.attribute_str,
-        "rel": v.attribute_unique_set,
-        "shape": {"circle", "default", "poly", "rect"},
+        "rel": v.attribute_tokens(),
+        "shape": frozenset({"circle", "default", "poly", "rect"}),
         "target": v.attribute_str,
     }
 
@@ -187,26 +202,32 @@ class Article(HtmlElement):
     Self-contained syndicatable or reusable composition
     """
 
+    __slots__ = ()
+
 
 class Aside(HtmlElement):
     """
     Sidebar for tangentially related content
     """
 
+    __slots__ = ()
+
 
 class Audio(HtmlElement):
     """
     Audio player
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "autoplay": v.attribute_bool,
         "controls": v.attribute_bool,
-        "crossorigin": {"anonymous", "use-credentials", ""},
-        "loading": {"lazy", "eager"},
+        "crossorigin": frozenset({"anonymous", "use-credentials", ""}),
+        "loading": frozenset({"lazy", "eager"}),
         "loop": v.attribute_bool,
         "muted": v.attribute_bool,
-        "preload": {"none", "metadata", "auto", ""},
+        "preload": frozenset({"none", "metadata", "auto", ""}),
         "src": v.attribute_str,
     }
 
@@ -216,12 +237,16 @@ class B(HtmlElement):
     Keywords
     """
 
+    __slots__ = ()
+
 
 class Base(HtmlElement):
     """
     Base URL and default target navigable for hyperlinks and forms
     """
 
+    __slots__ = ()
+
     is_empty = True
     element_attributes = {"href": v.attribute_str, "target": v.attribute_str}
 
@@ -231,13 +256,17 @@ class Bdi(HtmlElement):
     Text directionality isolation
     """
 
+    __slots__ = ()
+
 
 class Bdo(HtmlElement):
     """
     Text directionality formatting
     """
 
-    element_attributes = {"dir": {"ltr", "rtl"}}
+    __slots__ = ()
+
+    element_attributes = {"dir": frozenset({"ltr", "rtl"})}
 
 
 class Blockquote(HtmlElement):
@@ -245,6 +274,8 @@ class Blockquote(HtmlElement):
     A section quoted from another source
     """
 
+    __slots__ = ()
+
     element_attributes = {"cite": v.attribute_str}
 
 
@@ -253,6 +284,8 @@ class Body(HtmlElement):
     Document body
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "onafterprint": v.attribute_str,
         "onbeforeprint": v.attribute_str,
@@ -273,6 +306,16 @@ class Body(HtmlElement):
         "onunhandledrejection": v.attribute_str,
         "onunload": v.attribute_str,
     }
+    _optional_start_tag = {"#empty", "#text", "*"}
+    _optional_start_tag_except = {
+        "link",
+        "meta",
+        "noscript",
+        "script",
+        "style",
+        "template",
+    }
+    _optional_end_tag = {"#end", "#space", "#text", "*"}
 
 
 class Br(HtmlElement):
@@ -280,6 +323,8 @@ class Br(HtmlElement):
     Line break, e.g. in poem or postal address
     """
 
+    __slots__ = ()
+
     is_empty = True
 
 
@@ -288,24 +333,28 @@ class Button(HtmlElement):
     Button control
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "command": v.attribute_str,
         "commandfor": v.attribute_str,
         "disabled": v.attribute_bool,
         "form": v.attribute_str,
         "formaction": v.attribute_str,
-        "formenctype": {
-            "application/x-www-form-urlencoded",
-            "multipart/form-data",
-            "text/plain",
-        },
-        "formmethod": {"GET", "POST", "dialog"},
+        "formenctype": frozenset(
+            {
+                "application/x-www-form-urlencoded",
+                "multipart/form-data",
+                "text/plain",
+            }
+        ),
+        "formmethod": frozenset({"GET", "POST", "dialog"}),
         "formnovalidate": v.attribute_bool,
         "formtarget": v.attribute_str,
         "name": v.attribute_str,
         "popovertarget": v.attribute_str,
-        "popovertargetaction": {"toggle", "show", "hide"},
-        "type": {"submit", "reset", "button"},
+        "popovertargetaction": frozenset({"toggle", "show", "hide"}),
+        "type": frozenset({"submit", "reset", "button"}),
         "value": v.attribute_str,
     }
 
@@ -315,9 +364,11 @@ class Canvas(HtmlElement):
     Scriptable bitmap canvas
     """
 
+    __slots__ = ()
+
     element_attributes = {
-        "height": v.attribute_int_ge_zero,
-        "width": v.attribute_int_ge_zero,
+        "height": v.attribute_number(ge=0),
+        "width": v.attribute_number(ge=0),
     }
 
 
@@ -326,26 +377,36 @@ class Caption(HtmlElement):
     Table caption
     """
 
+    __slots__ = ()
+
+    _optional_end_tag = {"#end", "#text", "*"}
+
 
 class Cite(HtmlElement):
     """
     Title of a work
     """
 
+    __slots__ = ()
+
 
 class Code(HtmlElement):
     """
     Computer code
     """
 
+    __slots__ = ()
+
 
 class Col(HtmlElement):
     """
     Table column
     """
 
+    __slots__ = ()
+
     is_empty = True
-    element_attributes = {"span": v.attribute_int_gt_zero}
+    element_attributes = {"span": v.attribute_number(gt=0)}
 
 
 class Colgroup(HtmlElement):
@@ -353,7 +414,12 @@ class Colgroup(HtmlElement):
     Group of columns in a table
     """
 
-    element_attributes = {"span": v.attribute_int_gt_zero}
+    __slots__ = ()
+
+    element_attributes = {"span": v.attribute_number(gt=0)}
+    _optional_start_tag = {"col"}
+    _optional_start_tag_not_after = {"colgroup"}
+    _optional_end_tag = {"#end", "#text", "*"}
 
 
 class Data(HtmlElement):
@@ -361,6 +427,8 @@ class Data(HtmlElement):
     Machine-readable equivalent
     """
 
+    __slots__ = ()
+
     element_attributes = {"value": v.attribute_str}
 
 
@@ -369,18 +437,26 @@ class Datalist(HtmlElement):
     Container for options for combo box control
     """
 
+    __slots__ = ()
+
 
 class Dd(HtmlElement):
     """
     Content for corresponding dt element(s)
     """
 
+    __slots__ = ()
+
+    _optional_end_tag = {"#end", "dd", "dt"}
+
 
 class Del(HtmlElement):
     """
     A removal from the document
     """
 
+    __slots__ = ()
+
     element_attributes = {"cite": v.attribute_str, "datetime": v.attribute_str}
 
 
@@ -389,6 +465,8 @@ class Details(HtmlElement):
     Disclosure control for hiding details
     """
 
+    __slots__ = ()
+
     element_attributes = {"name": v.attribute_str, "open": v.attribute_bool}
 
 
@@ -397,15 +475,19 @@ class Dfn(HtmlElement):
     Defining instance
     """
 
+    __slots__ = ()
+
 
 class Dialog(HtmlElement):
     """
     Dialog box or window
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "open": v.attribute_bool,
-        "closedby": {"any", "closerequest", "none"},
+        "closedby": frozenset({"any", "closerequest", "none"}),
     }
 
 
@@ -414,36 +496,48 @@ class Div(HtmlElement):
     Generic flow container, or container for name-value groups in dl elements
     """
 
+    __slots__ = ()
+
 
 class Dl(HtmlElement):
     """
     Association list consisting of zero or more name-value groups
     """
 
+    __slots__ = ()
+
 
 class Dt(HtmlElement):
     """
     Legend for corresponding dd element(s)
     """
 
+    __slots__ = ()
+
+    _optional_end_tag = {"dd", "dt"}
+
 
 class Em(HtmlElement):
     """
     Stress emphasis
     """
 
+    __slots__ = ()
+
 
 class Embed(HtmlElement):
     """
     Plugin
     """
 
+    __slots__ = ()
+
     is_empty = True
     element_attributes = {
-        "height": v.attribute_int_ge_zero,
+        "height": v.attribute_number(ge=0),
         "src": v.attribute_str,
         "type": v.attribute_str,
-        "width": v.attribute_int_ge_zero,
+        "width": v.attribute_number(ge=0),
     }
     any_attribute = True
 
@@ -453,6 +547,8 @@ class Fieldset(HtmlElement):
     Group of form controls
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "disabled": v.attribute_bool,
         "form": v.attribute_str,
@@ -465,34 +561,44 @@ class Figcaption(HtmlElement):
     Caption for figure
     """
 
+    __slots__ = ()
+
 
 class Figure(HtmlElement):
     """
     Figure with optional caption
     """
 
+    __slots__ = ()
+
 
 class Footer(HtmlElement):
     """
     Footer for a page or section
     """
 
+    __slots__ = ()
+
 
 class Form(HtmlElement):
     """
     User-submittable form
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "accept-charset": v.attribute_str_literal_ci("utf-8"),
         "action": v.attribute_str,
-        "autocomplete": {"on", "off"},
-        "enctype": {
-            "application/x-www-form-urlencoded",
-            "multipart/form-data",
-            "text/plain",
-        },
-        "method": {"GET", "POST", "dialog"},
+        "autocomplete": frozenset({"on", "off"}),
+        "enctype": frozenset(
+            {
+                "application/x-www-form-urlencoded",
+                "multipart/form-data",
+                "text/plain",
+            }
+        ),
+        "method": frozenset({"GET", "POST", "dialog"}),
         "name": v.attribute_str,
         "novalidate": v.attribute_bool,
         "target": v.attribute_str,
@@ -504,60 +610,83 @@ class H1(HtmlElement):
     Heading
     """
 
+    __slots__ = ()
+
 
 class H2(HtmlElement):
     """
     Heading
     """
 
+    __slots__ = ()
+
 
 class H3(HtmlElement):
     """
     Heading
     """
 
+    __slots__ = ()
+
 
 class H4(HtmlElement):
     """
     Heading
     """
 
+    __slots__ = ()
+
 
 class H5(HtmlElement):
     """
     Heading
     """
 
+    __slots__ = ()
+
 
 class H6(HtmlElement):
     """
     Heading
     """
 
+    __slots__ = ()
+
 
 class Head(HtmlElement):
     """
     Container for document metadata
     """
 
+    __slots__ = ()
+
+    _optional_start_tag = {"#empty", "*"}
+    _optional_end_tag = {"#end", "#text", "*"}
+
 
 class Header(HtmlElement):
     """
     Introductory or navigational aids for a page or section
     """
 
+    __slots__ = ()
+
 
 class Hgroup(HtmlElement):
     """
     Heading container
     """
 
+    __slots__ = ()
+
 
 class Hr(HtmlElement):
     """
     Thematic break
     """
 
+    __slots__ = ()
+
     is_empty = True
 
 
@@ -566,7 +695,11 @@ class Html(HtmlElement):
     Root element
     """
 
+    __slots__ = ()
+
     _default_prepend_doctype = True
+    _optional_start_tag = {"#empty", "#space", "#text", "*"}
+    _optional_end_tag = {"#end", "#space", "#text", "*"}
 
 
 class I(HtmlElement):
@@ -574,18 +707,22 @@ class I(HtmlElement):
     Alternate voice
     """
 
+    __slots__ = ()
+
 
 class Iframe(HtmlElement):
     """
     Child navigable
     """
 
+    __slots__ = ()
+
     is_empty = True
     element_attributes = {
         "allow": v.attribute_str,
         "allowfullscreen": v.attribute_bool,
-        "height": v.attribute_int_ge_zero,
-        "loading": {"lazy", "eager"},
+        "height": v.attribute_number(ge=0),
+        "loading": frozenset({"lazy", "eager"}),
         "name": v.attribute_str,
         "referrerpolicy": v.attribute_str,
         "sandbox": v.attribute_unique_set_literal_ci(
@@ -605,7 +742,7 @@ class Iframe(HtmlElement):
         ),
         "src": v.attribute_str,
         "srcdoc": v.attribute_str,
-        "width": v.attribute_int_ge_zero,
+        "width": v.attribute_number(ge=0),
     }
 
 
@@ -614,22 +751,24 @@ class Img(HtmlElement):
     Image
     """
 
+    __slots__ = ()
+
     is_empty = True
     element_attributes = {
         "alt": v.attribute_str,
         "controls": v.attribute_bool,
-        "crossorigin": {"anonymous", "use-credentials", ""},
-        "decoding": {"sync", "async", "auto"},
-        "fetchpriority": {"auto", "high", "low"},
-        "height": v.attribute_int_ge_zero,
+        "crossorigin": frozenset({"anonymous", "use-credentials", ""}),
+        "decoding": frozenset({"sync", "async", "auto"}),
+        "fetchpriority": frozenset({"auto", "high", "low"}),
+        "height": v.attribute_number(ge=0),
         "ismap": v.attribute_bool,
-        "loading": {"lazy", "eager"},
+        "loading": frozenset({"lazy", "eager"}),
         "referrerpolicy": v.attribute_str,
         "sizes": v.attribute_str,
         "src": v.attribute_str,
         "srcset": v.attribute_str,
         "usemap": v.attribute_str,
-        "width": v.attribute_int_ge_zero,
+        "width": v.attribute_number(ge=0),
     }
 
 
@@ -638,6 +777,8 @@ class Input(HtmlElement):
     Form control
     """
 
+    __slots__ = ()
+
     is_empty = True
     element_attributes = {
         "accept": v.attribute_str,
@@ -645,64 +786,66 @@ class Input(HtmlElement):
         "alt": v.attribute_str,
         "autocomplete": v.attribute_str,
         "checked": v.attribute_bool,
-        "colorspace": {"limited-srgb", "display-p3"},
+        "colorspace": frozenset({"limited-srgb", "display-p3"}),
         "dirname": v.attribute_str,
         "disabled": v.attribute_bool,
         "form": v.attribute_str,
         "formaction": v.attribute_str,
-        "formenctype": {
-            "application/x-www-form-urlencoded",
-            "multipart/form-data",
-            "text/plain",
-        },
-        "formmethod": {"GET", "POST", "dialog"},
+        "formenctype": frozenset(
+            {
+                "application/x-www-form-urlencoded",
+                "multipart/form-data",
+                "text/plain",
+            }
+        ),
+        "formmethod": frozenset({"GET", "POST", "dialog"}),
         "formnovalidate": v.attribute_bool,
         "formtarget": v.attribute_str,
-        "height": v.attribute_int_ge_zero,
+        "height": v.attribute_number(ge=0),
         "list": v.attribute_str,
         "max": v.attribute_str,
-        "maxlength": v.attribute_int_ge_zero,
+        "maxlength": v.attribute_number(ge=0),
         "min": v.attribute_str,
-        "minlength": v.attribute_int_ge_zero,
+        "minlength": v.attribute_number(ge=0),
         "multiple": v.attribute_bool,
         "name": v.attribute_str,
         "pattern": v.attribute_str,
         "placeholder": v.attribute_str,
         "popovertarget": v.attribute_str,
-        "popovertargetaction": {"toggle", "show", "hide"},
+        "popovertargetaction": frozenset({"toggle", "show", "hide"}),
         "readonly": v.attribute_bool,
         "required": v.attribute_bool,
-        "size": v.attribute_int_gt_zero,
+        "size": v.attribute_number(gt=0),
         "src": v.attribute_str,
-        "step": v.attribute_any(
-            v.attribute_float_gt_zero, v.attribute_str_literal("any")
+        "step": v.attribute_number(is_float=True, gt=0, keywords=("any",)),
+        "type": frozenset(
+            {
+                "hidden",
+                "text",
+                "search",
+                "tel",
+                "url",
+                "email",
+                "password",
+                "date",
+                "month",
+                "week",
+                "time",
+                "datetime-local",
+                "number",
+                "range",
+                "color",
+                "checkbox",
+                "radio",
+                "file",
+                "submit",
+                "image",
+                "reset",
+                "button",
+            }
         ),
-        "type": {
-            "hidden",
-            "text",
-            "search",
-            "tel",
-            "url",
-            "email",
-            "password",
-            "date",
-            "month",
-            "week",
-            "time",
-            "datetime-local",
-            "number",
-            "range",
-            "color",
-            "checkbox",
-            "radio",
-            "file",
-            "submit",
-            "image",
-            "reset",
-            "button",
-        },
         "value": v.attribute_str,
-        "width": v.attribute_int_ge_zero,
+        "width": v.attribute_number(ge=0),
     }
 
 
@@ -711,6 +854,8 @@ class Ins(HtmlElement):
     An addition to the document
     """
 
+    __slots__ = ()
+
     element_attributes = {"cite": v.attribute_str, "datetime": v.attribute_str}
 
 
@@ -719,12 +864,16 @@ class Kbd(HtmlElement):
     User input
     """
 
+    __slots__ = ()
+
 
 class Label(HtmlElement):
     """
     Caption for a form control
     """
 
+    __slots__ = ()
+
     element_attributes = {"for": v.attribute_str}
 
 
@@ -733,13 +882,18 @@ class Legend(HtmlElement):
     Caption for fieldset
     """
 
+    __slots__ = ()
+
 
 class Li(HtmlElement):
     """
     List item
     """
 
-    element_attributes = {"value": v.attribute_int}
+    __slots__ = ()
+
+    element_attributes = {"value": v.attribute_number()}
+    _optional_end_tag = {"#end", "li"}
 
 
 class Link(HtmlElement):
@@ -747,14 +901,16 @@ class Link(HtmlElement):
     Link metadata
     """
 
+    __slots__ = ()
+
     is_empty = True
     element_attributes = {
         "as": v.attribute_str,
-        "blocking": v.attribute_unique_set,
+        "blocking": v.attribute_tokens(),
         "color": v.attribute_str,
-        "crossorigin": {"anonymous", "use-credentials", ""},
+        "crossorigin": frozenset({"anonymous", "use-credentials", ""}),
         "disabled": v.attribute_bool,
-        "fetchpriority": {"auto", "high", "low"},
+        "fetchpriority": frozenset({"auto", "high", "low"}),
         "href": v.attribute_str,
         "hreflang": v.attribute_str,
         "imagesizes": v.attribute_str,
@@ -762,7 +918,7 @@ class Link(HtmlElement):
         "integrity": v.attribute_str,
         "media": v.attribute_str,
         "referrerpolicy": v.attribute_str,
-        "rel": v.attribute_unique_set,
+        "rel": v.attribute_tokens(),
         "sizes": v.attribute_str,
         "type": v.attribute_str,
     }
@@ -773,12 +929,16 @@ class Main(HtmlElement):
     Container for the dominant contents of the document
     """
 
+    __slots__ = ()
+
 
 class Map(HtmlElement):
     """
     Image map
     """
 
+    __slots__ = ()
+
     element_attributes = {"name": v.attribute_str}
 
 
@@ -787,29 +947,37 @@ class Mark(HtmlElement):
     Highlight
     """
 
+    __slots__ = ()
+
 
 class Menu(HtmlElement):
     """
     Menu of commands
     """
 
+    __slots__ = ()
+
 
 class Meta(HtmlElement):
     """
     Text metadata
     """
 
+    __slots__ = ()
+
     is_empty = True
     element_attributes = {
-        "charset": {"utf-8"},
+        "charset": frozenset({"utf-8"}),
         "content": v.attribute_str,
-        "http-equiv": {
-            "content-type",
-            "default-style",
-            "refresh",
-            "x-ua-compatible",
-            "content-security-policy",
-        },
+        "http-equiv": frozenset(
+            {
+                "content-type",
+                "default-style",
+                "refresh",
+                "x-ua-compatible",
+                "content-security-policy",
+            }
+        ),
         "media": v.attribute_str,
         "name": v.attribute_str,
     }
@@ -820,13 +988,15 @@ class Meter(HtmlElement):
     Gauge
     """
 
+    __slots__ = ()
+
     element_attributes = {
-        "high": v.attribute_float,
-        "low": v.attribute_float,
-        "max": v.attribute_float,
-        "min": v.attribute_float,
-        "optimum": v.attribute_float,
-        "value": v.attribute_float,
+        "high": v.attribute_number(is_float=True),
+        "low": v.attribute_number(is_float=True),
+        "max": v.attribute_number(is_float=True),
+        "min": v.attribute_number(is_float=True),
+        "optimum": v.attribute_number(is_float=True),
+        "value": v.attribute_number(is_float=True),
     }
 
 
@@ -835,25 +1005,31 @@ class Nav(HtmlElement):
     Section with navigational links
     """
 
+    __slots__ = ()
+
 
 class Noscript(HtmlElement):
     """
     Fallback content for script
     """
 
+    __slots__ = ()
+
 
 class Object(HtmlElement):
     """
     Image, child navigable, or plugin
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "data": v.attribute_str,
         "form": v.attribute_str,
-        "height": v.attribute_int_ge_zero,
+        "height": v.attribute_number(ge=0),
         "name": v.attribute_str,
         "type": v.attribute_str,
-        "width": v.attribute_int_ge_zero,
+        "width": v.attribute_number(ge=0),
     }
 
 
@@ -862,10 +1038,12 @@ class Ol(HtmlElement):
     Ordered list
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "reversed": v.attribute_bool,
-        "start": v.attribute_int,
-        "type": {"1", "a", "A", "i", "I"},
+        "start": v.attribute_number(),
+        "type": frozenset({"1", "a", "A", "i", "I"}),
     }
 
 
@@ -874,7 +1052,10 @@ class Optgroup(HtmlElement):
     Group of options in a list box
     """
 
+    __slots__ = ()
+
     element_attributes = {"disabled": v.attribute_bool, "label": v.attribute_str}
+    _optional_end_tag = {"#end", "hr", "optgroup"}
 
 
 class Option(HtmlElement):
@@ -882,12 +1063,15 @@ class Option(HtmlElement):
     Option in a list box or combo box control
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "disabled": v.attribute_bool,
         "label": v.attribute_str,
         "selected": v.attribute_bool,
         "value": v.attribute_str,
     }
+    _optional_end_tag = {"#end", "hr", "optgroup", "option"}
 
 
 class Output(HtmlElement):
@@ -895,8 +1079,10 @@ class Output(HtmlElement):
     Calculated output value
     """
 
+    __slots__ = ()
+
     element_attributes = {
-        "for": v.attribute_unique_set,
+        "for": v.attribute_tokens(),
         "form": v.attribute_str,
         "name": v.attribute_str,
     }
@@ -907,25 +1093,73 @@ class P(HtmlElement):
     Paragraph
     """
 
+    __slots__ = ()
+
+    _optional_end_tag = {
+        "#end",
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "details",
+        "dialog",
+        "div",
+        "dl",
+        "fieldset",
+        "figcaption",
+        "figure",
+        "footer",
+        "form",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hgroup",
+        "hr",
+        "main",
+        "menu",
+        "nav",
+        "ol",
+        "p",
+        "pre",
+        "search",
+        "section",
+        "table",
+        "ul",
+    }
+    _optional_end_tag_not_in = {"a", "audio", "del", "ins", "map", "noscript", "video"}
+
 
 class Picture(HtmlElement):
     """
     Image
     """
 
+    __slots__ = ()
+
 
 class Pre(HtmlElement):
     """
     Block of preformatted text
     """
 
+    __slots__ = ()
+
 
 class Progress(HtmlElement):
     """
     Progress bar
     """
 
-    element_attributes = {"max": v.attribute_float, "value": v.attribute_float}
+    __slots__ = ()
+
+    element_attributes = {
+        "max": v.attribute_number(is_float=True),
+        "value": v.attribute_number(is_float=True),
+    }
 
 
 class Q(HtmlElement):
@@ -933,6 +1167,8 @@ class Q(HtmlElement):
     Quotation
     """
 
+    __slots__ = ()
+
     element_attributes = {"cite": v.attribute_str}
 
 
@@ -941,42 +1177,58 @@ class Rp(HtmlElement):
     Parenthesis for ruby annotation text
     """
 
+    __slots__ = ()
+
+    _optional_end_tag = {"#end", "rp", "rt"}
+
 
 class Rt(HtmlElement):
     """
     Ruby annotation text
     """
 
+    __slots__ = ()
+
+    _optional_end_tag = {"#end", "rp", "rt"}
+
 
 class Ruby(HtmlElement):
     """
     Ruby annotation(s)
     """
 
+    __slots__ = ()
+
 
 class S(HtmlElement):
     """
     Inaccurate text
     """
 
+    __slots__ = ()
+
 
 class Samp(HtmlElement):
     """
     Computer output
     """
 
+    __slots__ = ()
+
 
 class Script(HtmlElement):
     """
     Embedded script
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "async": v.attribute_bool,
-        "blocking": v.attribute_unique_set,
-        "crossorigin": {"anonymous", "use-credentials", ""},
+        "blocking": v.attribute_tokens(),
+        "crossorigin": frozenset({"anonymous", "use-credentials", ""}),
         "defer": v.attribute_bool,
-        "fetchpriority": {"auto", "high", "low"},
+        "fetchpriority": frozenset({"auto", "high", "low"}),
         "integrity": v.attribute_str,
         "nomodule": v.attribute_bool,
         "referrerpolicy": v.attribute_str,
@@ -990,18 +1242,24 @@ class Search(HtmlElement):
     Container for search controls
     """
 
+    __slots__ = ()
+
 
 class Section(HtmlElement):
     """
     Generic document or application section
     """
 
+    __slots__ = ()
+
 
 class Select(HtmlElement):
     """
     List box control
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "autocomplete": v.attribute_str,
         "disabled": v.attribute_bool,
@@ -1009,7 +1267,7 @@ class Select(HtmlElement):
         "multiple": v.attribute_bool,
         "name": v.attribute_str,
         "required": v.attribute_bool,
-        "size": v.attribute_int_gt_zero,
+        "size": v.attribute_number(gt=0),
     }
 
 
@@ -1018,6 +1276,8 @@ class Selectedcontent(HtmlElement):
     Mirrors content from an option
     """
 
+    __slots__ = ()
+
     is_empty = True
 
 
@@ -1026,6 +1286,8 @@ class Slot(HtmlElement):
     Shadow tree slot
     """
 
+    __slots__ = ()
+
     element_attributes = {"name": v.attribute_str}
 
 
@@ -1034,21 +1296,25 @@ class Small(HtmlElement):
     Side comment
     """
 
+    __slots__ = ()
+
 
 class Source(HtmlElement):
     """
     Image source for img or media source for video or audio
     """
 
+    __slots__ = ()
+
     is_empty = True
     element_attributes = {
-        "height": v.attribute_int_ge_zero,
+        "height": v.attribute_number(ge=0),
         "media": v.attribute_str,
         "sizes": v.attribute_str,
         "src": v.attribute_str,
         "srcset": v.attribute_str,
         "type": v.attribute_str,
-        "width": v.attribute_int_ge_zero,
+        "width": v.attribute_number(ge=0),
     }
 
 
@@ -1057,19 +1323,25 @@ class Span(HtmlElement):
     Generic phrasing container
     """
 
+    __slots__ = ()
+
 
 class Strong(HtmlElement):
     """
     Importance
     """
 
+    __slots__ = ()
+
 
 class Style(HtmlElement):
     """
     Embedded styling information
     """
 
-    element_attributes = {"blocking": v.attribute_unique_set, "media": v.attribute_str}
+    __slots__ = ()
+
+    element_attributes = {"blocking": v.attribute_tokens(), "media": v.attribute_str}
 
 
 class Sub(HtmlElement):
@@ -1077,41 +1349,58 @@ class Sub(HtmlElement):
     Subscript
     """
 
+    __slots__ = ()
+
 
 class Summary(HtmlElement):
     """
     Caption for details
     """
 
+    __slots__ = ()
+
 
 class Sup(HtmlElement):
     """
     Superscript
     """
 
+    __slots__ = ()
+
 
 class Table(HtmlElement):
     """
     Table
     """
 
+    __slots__ = ()
+
 
 class Tbody(HtmlElement):
     """
     Group of rows in a table
     """
 
+    __slots__ = ()
+
+    _optional_start_tag = {"tr"}
+    _optional_start_tag_not_after = {"tbody", "tfoot", "thead"}
+    _optional_end_tag = {"#end", "tbody", "tfoot"}
+
 
 class Td(HtmlElement):
     """
     Table cell
     """
 
+    __slots__ = ()
+
     element_attributes = {
-        "colspan": v.attribute_int_gt_zero,
-        "headers": v.attribute_unique_set,
-        "rowspan": v.attribute_int_ge_zero,
+        "colspan": v.attribute_number(gt=0),
+        "headers": v.attribute_tokens(),
+        "rowspan": v.attribute_number(ge=0),
     }
+    _optional_end_tag = {"#end", "td", "th"}
 
 
 class Template(HtmlElement):
@@ -1119,14 +1408,16 @@ class Template(HtmlElement):
     Template
     """
 
+    __slots__ = ()
+
     is_empty = True
     element_attributes = {
         "shadowrootclonable": v.attribute_bool,
         "shadowrootcustomelementregistry": v.attribute_bool,
         "shadowrootdelegatesfocus": v.attribute_bool,
-        "shadowrootmode": {"open", "closed"},
+        "shadowrootmode": frozenset({"open", "closed"}),
         "shadowrootserializable": v.attribute_bool,
-        "shadowrootslotassignment": {"named", "manual"},
+        "shadowrootslotassignment": frozenset({"named", "manual"}),
     }
 
 
@@ -1135,20 +1426,22 @@ class Textarea(HtmlElement):
     Multiline text controls
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "autocomplete": v.attribute_str,
-        "cols": v.attribute_int_gt_zero,
+        "cols": v.attribute_number(gt=0),
         "dirname": v.attribute_str,
         "disabled": v.attribute_bool,
         "form": v.attribute_str,
-        "maxlength": v.attribute_int_ge_zero,
-        "minlength": v.attribute_int_ge_zero,
+        "maxlength": v.attribute_number(ge=0),
+        "minlength": v.attribute_number(ge=0),
         "name": v.attribute_str,
         "placeholder": v.attribute_str,
         "readonly": v.attribute_bool,
         "required": v.attribute_bool,
-        "rows": v.attribute_int_gt_zero,
-        "wrap": {"soft", "hard"},
+        "rows": v.attribute_number(gt=0),
+        "wrap": frozenset({"soft", "hard"}),
     }
 
 
@@ -1157,19 +1450,26 @@ class Tfoot(HtmlElement):
     Group of footer rows in a table
     """
 
+    __slots__ = ()
+
+    _optional_end_tag = {"#end"}
+
 
 class Th(HtmlElement):
     """
     Table header cell
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "abbr": v.attribute_str,
-        "colspan": v.attribute_int_gt_zero,
-        "headers": v.attribute_unique_set,
-        "rowspan": v.attribute_int_ge_zero,
-        "scope": {"row", "col", "rowgroup", "colgroup"},
+        "colspan": v.attribute_number(gt=0),
+        "headers": v.attribute_tokens(),
+        "rowspan": v.attribute_number(ge=0),
+        "scope": frozenset({"row", "col", "rowgroup", "colgroup"}),
     }
+    _optional_end_tag = {"#end", "td", "th"}
 
 
 class Thead(HtmlElement):
@@ -1177,12 +1477,18 @@ class Thead(HtmlElement):
     Group of heading rows in a table
     """
 
+    __slots__ = ()
+
+    _optional_end_tag = {"tbody", "tfoot"}
+
 
 class Time(HtmlElement):
     """
     Machine-readable equivalent of date- or time-related data
     """
 
+    __slots__ = ()
+
     element_attributes = {"datetime": v.attribute_str}
 
 
@@ -1191,22 +1497,32 @@ class Title(HtmlElement):
     Document title
     """
 
+    __slots__ = ()
+
 
 class Tr(HtmlElement):
     """
     Table row
     """
 
+    __slots__ = ()
+
+    _optional_end_tag = {"#end", "tr"}
+
 
 class Track(HtmlElement):
     """
     Timed text track
     """
 
+    __slots__ = ()
+
     is_empty = True
     element_attributes = {
         "default": v.attribute_bool,
-        "kind": {"subtitles", "captions", "descriptions", "chapters", "metadata"},
+        "kind": frozenset(
+            {"subtitles", "captions", "descriptions", "chapters", "metadata"}
+        ),
         "label": v.attribute_str,
         "src": v.attribute_str,
         "srclang": v.attribute_str,
@@ -1218,37 +1534,45 @@ class U(HtmlElement):
     Unarticulated annotation
     """
 
+    __slots__ = ()
+
 
 class Ul(HtmlElement):
     """
     List
     """
 
+    __slots__ = ()
+
 
 class Var(HtmlElement):
     """
     Variable
     """
 
+    __slots__ = ()
+
 
 class Video(HtmlElement):
     """
     Video player
     """
 
+    __slots__ = ()
+
     element_attributes = {
         "autoplay": v.attribute_bool,
         "controls": v.attribute_bool,
-        "crossorigin": {"anonymous", "use-credentials", ""},
-        "height": v.attribute_int_ge_zero,
-        "loading": {"lazy", "eager"},
+        "crossorigin": frozenset({"anonymous", "use-credentials", ""}),
+        "height": v.attribute_number(ge=0),
+        "loading": frozenset({"lazy", "eager"}),
         "loop": v.attribute_bool,
         "muted": v.attribute_bool,
         "playsinline": v.attribute_bool,
         "poster": v.attribute_str,
-        "preload": {"none", "metadata", "auto", ""},
+        "preload": frozenset({"none", "metadata", "auto", ""}),
         "src": v.attribute_str,
-        "width": v.attribute_int_ge_zero,
+        "width": v.attribute_number(ge=0),
     }
 
 
@@ -1257,4 +1581,6 @@ class Wbr(HtmlElement):
     Line breaking opportunity
     """
 
+    __slots__ = ()
+
     is_empty = True
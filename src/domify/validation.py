@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Literal, NamedTuple
+
+_T_mode = Literal["off", "warn", "strict"]
+
+# What `_level` returns for each mode
+_OFF = 0
+_WARN = 1
+_STRICT = 2
+_LEVELS = {"off": _OFF, "warn": _WARN, "strict": _STRICT}
+
+
+class Sampled(NamedTuple):
+    """Validate only a fraction of the elements, warning about invalid attributes"""
+
+    rate: float
+
+
+class _Setting(NamedTuple):
+    mode: _T_mode | Sampled
+    level: int
+    rate: float
+
+
+def _setting(mode: _T_mode | Sampled) -> _Setting:
+    if isinstance(mode, Sampled):
+        if not 0 <= mode.rate <= 1:
+            msg = f"Sampling rate must be between 0 and 1, not {mode.rate}"
+            raise ValueError(msg)
+        return _Setting(mode, _WARN, mode.rate)
+    if mode not in _LEVELS:
+        msg = f"Unknown validation mode {mode!r}"
+        raise ValueError(msg)
+    return _Setting(mode, _LEVELS[mode], 1.0)
+
+
+_default = _setting("warn")
+_setting_var: ContextVar[_Setting | None] = ContextVar("setting", default=None)
+# Disabled while compiling templates, whose placeholders are rarely valid values
+_values_var: ContextVar[bool] = ContextVar("values", default=True)
+
+
+def _level() -> int:
+    # How the attributes of the element being created are validated
+    setting = _setting_var.get() or _default
+    if setting.rate < 1 and random.random() >= setting.rate:
+        return _OFF
+    return setting.level
+
+
+def sampled(rate: float) -> Sampled:
+    """Validation mode checking only a fraction of the elements
+
+    Args:
+        rate: The fraction of the elements whose attributes are validated, between 0
+            and 1.
+
+    Returns:
+        The validation mode, to be passed to `set_mode` or `using`.
+    """
+    return Sampled(rate)
+
+
+def get_mode() -> _T_mode | Sampled:
+    """Get the validation mode currently in use
+
+    Returns:
+        The validation mode of the current context if set with `using`, otherwise the
+        process-wide one.
+    """
+    return (_setting_var.get() or _default).mode
+
+
+def set_mode(mode: _T_mode | Sampled) -> None:
+    """Set the process-wide validation mode
+
+    When creating an element or setting one of its attributes, the attributes are
+    validated according to the mode:
+    - `off`: attributes are not validated at all
+    - `warn`: `exc.InvalidAttributeWarning` and `exc.InvalidAttributeValueWarning` are
+      emitted for invalid attributes (the default)
+    - `strict`: the same warnings are raised as exceptions instead
+    - `sampled(rate)`: only the given fraction of the elements is validated, as in
+      `warn` mode
+
+    Args:
+        mode: The validation mode.
+    """
+    global _default
+    _default = _setting(mode)
+
+
+@contextmanager
+def using(mode: _T_mode | Sampled) -> Iterator[None]:
+    """Use another validation mode in the current context, as in `set_mode`
+
+    Like the `with` blocks of the elements, this only affects the current thread or
+    asyncio task, and the tasks started inside the block.
+
+    Args:
+        mode: The validation mode.
+
+    Yields:
+        Nothing, the mode is restored when the block ends.
+    """
+    token = _setting_var.set(_setting(mode))
+    try:
+        yield
+    finally:
+        _setting_var.reset(token)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from collections.abc import Callable, Iterable
 from functools import partial
 from typing import TYPE_CHECKING, TypeVar
@@ -9,6 +10,8 @@ if TYPE_CHECKING:
 
 _T = TypeVar("_T")
 
+_INF = float("inf")
+
 
 def _attribute_to_string(x: _T_attribute, case_insensitive: bool) -> str:
     x = str(x)
@@ -33,6 +36,95 @@ def attribute_bool(x: _T_attribute) -> bool:
     return isinstance(x, bool)
 
 
+def attribute_number(
+    *,
+    is_float: bool = False,
+    le: float | None = None,
+    ge: float | None = None,
+    lt: float | None = None,
+    gt: float | None = None,
+    keywords: Iterable[str] = (),
+) -> Callable[[_T_attribute], bool]:
+    # Missing bounds are replaced by infinities, so that every bound can be checked
+    # with a single chained comparison
+    low, high = -_INF if ge is None else ge, _INF if le is None else le
+    low_exclusive, high_exclusive = (
+        -_INF if gt is None else gt,
+        _INF if lt is None else lt,
+    )
+    keyword_set = frozenset(keywords)
+
+    def validator(x: _T_attribute) -> bool:
+        if isinstance(x, int) or (is_float and isinstance(x, float)):
+            return low <= x <= high and low_exclusive < x < high_exclusive
+        return x in keyword_set
+
+    return validator
+
+
+def attribute_enumeration(
+    values: Iterable[str], name: str
+) -> Callable[[_T_attribute], bool]:
+    value_set = frozenset(values)
+    # Booleans are allowed if both the empty string and the name of the attribute are
+    allow_bool = {"", name} < value_set
+
+    def validator(x: _T_attribute) -> bool:
+        return x in value_set or (allow_bool and isinstance(x, bool))
+
+    return validator
+
+
+def attribute_literal(
+    values: Iterable[str], *, case_insensitive: bool = False
+) -> Callable[[_T_attribute], bool]:
+    # Case-insensitive values are lowered once here, rather than on every call
+    value_set = frozenset(x.lower() if case_insensitive else x for x in values)
+
+    def validator(x: _T_attribute) -> bool:
+        if isinstance(x, bool):
+            return False
+        x = str(x)
+        if case_insensitive:
+            x = x.lower()
+        return x in value_set
+
+    return validator
+
+
+def attribute_tokens(
+    token: str | None = None,
+    *,
+    values: Iterable[str] | None = None,
+    sep: str = " ",
+    case_insensitive: bool = False,
+) -> Callable[[_T_attribute], bool]:
+    # Unique tokens separated by `sep`, each of them matching the regular expression
+    # `token`, or among `values`
+    if values is not None:
+        token = "|".join(
+            re.escape(x.lower() if case_insensitive else x) for x in values
+        )
+    fullmatch = (
+        None
+        if token is None
+        else re.compile(f"(?:{token})(?:{re.escape(sep)}(?:{token}))*").fullmatch
+    )
+
+    def validator(x: _T_attribute) -> bool:
+        if isinstance(x, bool):
+            return False
+        x = str(x)
+        if case_insensitive:
+            x = x.lower()
+        if fullmatch is not None and fullmatch(x) is None:
+            return False
+        parts = x.split(sep)
+        return len(parts) == len(set(parts))
+
+    return validator
+
+
 def _attribute_number(
     x: _T_attribute,
     *,
@@ -52,6 +144,8 @@ def _attribute_number(
     )
 
 
+# Checking their keyword arguments on every call, unlike the validators built by
+# `attribute_number`
 attribute_int = partial(_attribute_number, is_float=False)
 attribute_int_ge_zero = partial(attribute_int, ge=0)
 attribute_int_gt_zero = partial(attribute_int, gt=0)
@@ -81,7 +175,7 @@ attribute_str_ci = partial(attribute_str, case_insensitive=True)
 def attribute_str_literal(
     *values: str, case_insensitive: bool = False
 ) -> Callable[[_T_attribute], bool]:
-    return partial(attribute_str, values=values, case_insensitive=case_insensitive)
+    return attribute_literal(values, case_insensitive=case_insensitive)
 
 
 attribute_str_literal_ci = partial(attribute_str_literal, case_insensitive=True)
@@ -111,9 +205,7 @@ attribute_unique_set_ci = partial(attribute_unique_set, case_insensitive=True)
 def attribute_unique_set_literal(
     *values: str, sep: str = " ", case_insensitive: bool = False
 ) -> Callable[[_T_attribute], bool]:
-    return partial(
-        attribute_unique_set, values=values, sep=sep, case_insensitive=case_insensitive
-    )
+    return attribute_tokens(values=values, sep=sep, case_insensitive=case_insensitive)
 
 
 attribute_unique_set_literal_ci = partial(
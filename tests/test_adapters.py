@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import zlib
+from typing import cast
+
+from domify import html_elements as e
+from domify.adapters import asgi_response, wsgi_response
+from domify.base_element import BaseElement
+from domify.deferred import Deferred
+
+
+def page(body: BaseElement) -> BaseElement:
+    return e.Html(
+        e.Head(e.Title("Title"), e.Link(rel="stylesheet", href="style.css")),
+        body,
+    )
+
+
+HEAD = (
+    '<!DOCTYPE html><html><head><title>Title</title><link rel="stylesheet" '
+    'href="style.css"></head>'
+)
+
+
+def test_wsgi_response():
+    body = e.Body(*(e.P("x" * 100) for _ in range(100)))
+    responses = []
+
+    def start_response(status: str, headers: list[tuple[str, str]]) -> None:
+        responses.append((status, headers))
+
+    chunks = wsgi_response(page(body), start_response, chunk_size=4096)
+    assert responses == [("200 OK", [("Content-Type", "text/html; charset=utf-8")])]
+    chunks_list = list(chunks)
+    assert chunks_list[0] == HEAD.encode()
+    assert all(len(chunk) == 4096 for chunk in chunks_list[1:-1])
+    assert b"".join(chunks_list) == str(page(body)).encode()
+
+
+def test_wsgi_response_headers():
+    responses = []
+
+    def start_response(status: str, headers: list[tuple[str, str]]) -> None:
+        responses.append((status, headers))
+
+    chunks = wsgi_response(
+        e.P("è"),
+        start_response,
+        status="404 Not Found",
+        headers=[("content-type", "text/html; charset=latin-1"), ("X-Foo", "bar")],
+        encoding="latin-1",
+    )
+    assert list(chunks) == [b"<p>\xe8</p>"]
+    assert responses == [
+        (
+            "404 Not Found",
+            [("content-type", "text/html; charset=latin-1"), ("X-Foo", "bar")],
+        )
+    ]
+
+
+def test_response_encodings():
+    def start_response(status: str, headers: list[tuple[str, str]]) -> None:
+        pass
+
+    messages: list[dict[str, object]] = []
+
+    async def send(message: dict[str, object]) -> None:
+        messages.append(message)
+
+    # The encoding keeps its state between chunks: the byte order mark of `utf-16` is
+    # only written once, and `iso2022_jp` switches back to ASCII at the end
+    d = BaseElement(e.P("x" * 100), "あ" * 100)
+    for encoding in ("utf-16", "iso2022_jp"):
+        chunks = wsgi_response(d, start_response, encoding=encoding, chunk_size=32)
+        assert b"".join(chunks) == str(d).encode(encoding)
+
+        messages.clear()
+        asyncio.run(asgi_response(d, send, encoding=encoding, chunk_size=32))
+        data = b"".join(cast("bytes", message["body"]) for message in messages[1:])
+        assert data == str(d).encode(encoding)
+
+
+def test_wsgi_response_compressed():
+    body = e.Body(*(e.P("x" * 100) for _ in range(100)))
+    responses = []
+
+    def start_response(status: str, headers: list[tuple[str, str]]) -> None:
+        responses.append((status, headers))
+
+    chunks = list(wsgi_response(page(body), start_response, content_encoding="gzip"))
+    assert responses[0][1][-1] == ("Content-Encoding", "gzip")
+    assert zlib.decompressobj(31).decompress(chunks[0]) == HEAD.encode()
+    assert gzip.decompress(b"".join(chunks)) == str(page(body)).encode()
+
+
+def test_asgi_response():
+    calls = []
+    messages: list[dict[str, object]] = []
+    resume = asyncio.Event()
+
+    def widget() -> str:
+        calls.append("widget")
+        return "widget"
+
+    async def send(message: dict[str, object]) -> None:
+        messages.append(message)
+        calls.append("send")
+        if len(messages) == 2:
+            # Simulate a slow client: nothing else is rendered until this returns
+            await resume.wait()
+
+    async def main() -> None:
+        body = e.Body(Deferred(widget), e.P("x" * 100))
+        response = asyncio.ensure_future(
+            asgi_response(page(body), send, headers=[("X-Foo", "bar")], chunk_size=256)
+        )
+        await asyncio.sleep(0.1)
+        assert calls == ["send", "send"]
+        resume.set()
+        await response
+
+    asyncio.run(main())
+
+    assert messages[0] == {
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/html; charset=utf-8"),
+            (b"x-foo", b"bar"),
+        ],
+    }
+    assert messages[1] == {
+        "type": "http.response.body",
+        "body": HEAD.encode(),
+        "more_body": True,
+    }
+    assert messages[-1] == {
+        "type": "http.response.body",
+        "body": b"",
+        "more_body": False,
+    }
+    assert calls.count("widget") == 1
+    body = b"".join(cast("bytes", message["body"]) for message in messages[1:])
+    expected = page(e.Body(Deferred("widget"), e.P("x" * 100)))
+    assert body == "".join(expected.iter_render()).encode()
+
+
+def test_asgi_response_compressed():
+    messages: list[dict[str, object]] = []
+
+    async def send(message: dict[str, object]) -> None:
+        messages.append(message)
+
+    body = e.Body(e.P("x" * 100))
+    asyncio.run(
+        asgi_response(page(body), send, content_encoding="deflate", minify=True)
+    )
+    assert messages[0]["headers"] == [
+        (b"content-type", b"text/html; charset=utf-8"),
+        (b"content-encoding", b"deflate"),
+    ]
+    data = b"".join(cast("bytes", message["body"]) for message in messages[1:])
+    expected = page(body).iter_render(flush_after=["head"], minify=True)
+    assert zlib.decompress(data) == "".join(expected).encode()
@@ -1,16 +1,44 @@
 from __future__ import annotations
 
 import asyncio
+import io
+import multiprocessing
+import pickle
+import threading
+import time
+import weakref
+import zlib
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import cast
 
 import pytest
 
 from domify import exc
 from domify import html_elements as e
-from domify.base_element import BaseElement
+from domify.base_element import BaseElement, LazyNode
+from domify.deferred import Deferred
+
+
+class Card(e.Div):
+    # Without `__slots__`, instances have a `__dict__`
+    def __init__(self, title: str) -> None:
+        super().__init__(e.H2(title), class_="card")
+        self.title = title
+
+
+class Badge(e.Span):
+    __slots__ = "count"
+
+    def __init__(self, count: int) -> None:
+        super().__init__(count, class_="badge")
+        self.count = count
 
 
 def test_base():
     assert str(e.Div()) == "<div></div>"
+    assert e.Div().name == "div"
+    assert Card("foo").name == "card"
     assert str(e.Br()) == "<br>"
 
     assert str(BaseElement()) == ""
@@ -21,6 +49,13 @@ def test_base():
 
 def test_attributes():
     assert str(e.Div(id="main")) == '<div id="main"></div>'
+
+    attributes = e.A().all_attributes
+    assert "href" in attributes
+    assert "class" in attributes
+    attributes.clear()
+    assert "href" in e.A().all_attributes
+    assert "href" not in e.Div().all_attributes
     assert (
         str(e.Div(class_="class1", data_foo="bar"))
         == '<div class="class1" data-foo="bar"></div>'
@@ -81,6 +116,39 @@ def test_attributes():
         e.Iframe(sandbox="allow-forms allow-foobar")
 
 
+def test_validation_cache():
+    class Cell(e.Td):
+        __slots__ = ()
+
+    class Markup(str):
+        __slots__ = ()
+
+    assert Cell.validation_cache_info() == (0, 0, 1024, 0)
+    for i in range(100):
+        Cell(i, class_="num", data_col="price", colspan=2)
+    assert Cell.validation_cache_info() == (297, 3, 1024, 3)
+    assert e.Td.validation_cache_info().hits < 297
+
+    # Equal values of different types are validated separately
+    Cell(class_=1)
+    with pytest.warns(exc.InvalidAttributeValueWarning):
+        Cell(class_=True)
+    with pytest.warns(exc.InvalidAttributeValueWarning):
+        Cell(colspan=0.0)
+    Cell(colspan=1)
+    assert Cell.validation_cache_info().currsize == 7
+
+    # Unusual values are always validated
+    Cell(class_=Markup("num"), headers=Markup("a b"))
+    assert Cell.validation_cache_info().currsize == 7
+    with pytest.warns(exc.InvalidAttributeValueWarning):
+        Cell(headers=Markup("a a"))
+
+    for i in range(2000):
+        Cell(id=f"cell-{i}")
+    assert Cell.validation_cache_info().currsize == 1024
+
+
 def test_add_remove_class():
     d = e.Div()
     d.add_class("foo")
@@ -129,6 +197,36 @@ def test_add_children():
     assert str(d) == "<div>foobar</div>"
 
 
+def test_extend_children():
+    d = e.Ul(e.Li("first"))
+    d.extend(e.Li(i) for i in range(3))
+    d.extend(["foo", 4, e.Br()])
+    assert str(d) == "<ul><li>first</li><li>0</li><li>1</li><li>2</li>foo4<br></ul>"
+
+    # Children created while consuming the generator are not added twice
+    with e.Div() as div:
+        e.Ul().extend(e.Li(i) for i in range(2))
+        e.P()
+    assert str(div) == "<div><ul><li>0</li><li>1</li></ul><p></p></div>"
+
+    # Generators are consumed lazily
+    def rows() -> Iterator[BaseElement]:
+        yield e.Tr()
+        assert len(table) == 1
+        yield e.Tr()
+
+    table = e.Table(_cache=True)
+    assert str(table) == "<table></table>"
+    table.extend(rows())
+    assert str(table) == "<table><tr></tr><tr></tr></table>"
+
+    e.Br().extend([])
+    with pytest.raises(exc.EmptyElementChildrenError):
+        e.Br().extend(iter(["foo"]))
+    with pytest.raises(exc.FrozenElementError):
+        e.Div().freeze().extend([])
+
+
 def test_insert_children():
     d = e.Div("foo", e.Br(), "bar")
     d.insert(2, "baz" + e.Br())
@@ -249,6 +347,51 @@ def test_context_manager():
     )
 
 
+def test_context_manager_concurrent():
+    # Tasks copy the context of the code starting them, including the blocks open
+    # at that point, as do threads on free-threaded builds
+    async def section(i: int) -> BaseElement:
+        with e.Section() as s:
+            e.H2(i)
+            await asyncio.sleep(0)
+            e.P(i)
+        return s
+
+    async def main() -> tuple[BaseElement, list[BaseElement]]:
+        with e.Div() as d:
+            sections = await asyncio.gather(*(section(i) for i in range(10)))
+        return d, sections
+
+    d, sections = asyncio.run(main())
+    for i, s in enumerate(sections):
+        assert str(s) == f"<section><h2>{i}</h2><p>{i}</p></section>"
+    assert str(d) == f"<div>{''.join(map(str, sections))}</div>"
+
+    threads = 8
+    barrier = threading.Barrier(threads)
+
+    def build(i: int) -> list[str]:
+        barrier.wait()
+        pages = []
+        for j in range(200):
+            with e.Body() as body, e.Ul(class_=f"list-{i}"):
+                for k in range(3):
+                    with e.Li():
+                        e.A(j, href=f"/{k}")
+            pages.append(str(body))
+        return pages
+
+    with ThreadPoolExecutor(threads) as executor:
+        results = list(executor.map(build, range(threads)))
+    for i, pages in enumerate(results):
+        assert pages == [
+            f'<body><ul class="list-{i}">'
+            + "".join(f'<li><a href="/{k}">{j}</a></li>' for k in range(3))
+            + "</ul></body>"
+            for j in range(200)
+        ]
+
+
 def test_prepend_doctype():
     assert str(e.Html()) == "<!DOCTYPE html><html></html>"
     assert str(e.Html(_prepend_doctype=True)) == "<!DOCTYPE html><html></html>"
@@ -259,6 +402,547 @@ def test_prepend_doctype():
     assert str(e.P(_prepend_doctype=False)) == "<p></p>"
 
 
+def test_deep_nesting():
+    depth = 5000
+    d: BaseElement = e.Span("foo")
+    for _ in range(depth):
+        d = e.Div(d, e.Br())
+    assert str(d) == "<div>" * depth + "<span>foo</span>" + "<br></div>" * depth
+
+    d = e.Br()
+    d.add("ignored")
+    assert str(BaseElement(e.P(), d, BaseElement(e.I()))) == "<p></p><br><i></i>"
+
+
+def test_iter_render():
+    d = e.Div(e.P("foo", e.Br(), "bar"), e.Span(class_="baz"))
+    expected = '<div><p>foo<br>bar</p><span class="baz"></span></div>'
+    for chunk_size in (1, 2, 5, 16, 1000):
+        chunks = list(d.iter_render(chunk_size))
+        assert "".join(chunks) == expected
+        assert all(len(chunk) <= chunk_size for chunk in chunks)
+        assert all(len(chunk) == chunk_size for chunk in chunks[:-1])
+    assert list(e.Div(e.Span()).iter_render(24)) == ["<div><span></span></div>"]
+    assert list(BaseElement().iter_render()) == []
+
+
+def test_write_to():
+    d = e.Div(e.P("foo", e.Br(), "bar"), e.Span(class_="baz"))
+    f = io.StringIO()
+    d.write_to(f, 3)
+    assert f.getvalue() == '<div><p>foo<br>bar</p><span class="baz"></span></div>'
+
+
+def test_render_bytes():
+    d = e.Div(e.P("è<", class_="à"), e.RawTextNode("<b>ò</b>"), 5)
+    assert d.render_bytes() == str(d).encode()
+    assert d.render_bytes("latin-1") == str(d).encode("latin-1")
+    assert BaseElement().render_bytes() == b""
+
+    p = e.P("x" * 10_000, e.RawTextNode("<b>è</b>".encode()), "y" * 10_000)
+    assert str(p) == f"<p>{'x' * 10_000}<b>è</b>{'y' * 10_000}</p>"
+    assert p.render_bytes() == str(p).encode()
+    assert p.render_bytes("UTF8") == str(p).encode()
+    assert p.render_bytes("latin-1") == str(p).encode("latin-1")
+
+    raw = e.RawTextNode("<b>è</b>".encode("latin-1"), encoding="latin-1")
+    assert str(raw) == "<b>è</b>"
+    assert raw.render_bytes("latin-1") == "<b>è</b>".encode("latin-1")
+    assert raw.render_bytes() == "<b>è</b>".encode()
+
+
+def test_render_bytes_stateful():
+    # The byte order mark of `utf-16` is only written once, and `iso2022_jp` switches
+    # between character sets with escape sequences
+    for encoding in ("utf-16", "iso2022_jp"):
+        raw = e.RawTextNode("<b>あ</b>".encode(encoding), encoding=encoding)
+        d = BaseElement(e.P("x" * 10_000), "あ", raw, "あ" * 10_000)
+        data = d.render_bytes(encoding)
+        assert data == str(d).encode(encoding)
+        assert data.decode(encoding) == str(d)
+        assert b"".join(d.render_segments(encoding)) == data
+        assert d.rendered_length(encoding) == len(data)
+
+
+def test_render_segments():
+    header_data = "<header>è</header>".encode()
+    footer_data = "<footer>è</footer>".encode()
+    header = e.RawTextNode(header_data)
+    footer = e.RawTextNode(footer_data)
+    pages = [e.Body(header, e.P(f"page {i}"), "x" * 10_000, footer) for i in range(2)]
+    for i, page in enumerate(pages):
+        segments = page.render_segments()
+        assert b"".join(segments) == str(page).encode()
+        assert segments[0] == b"<body>"
+        assert segments[1] is header_data
+        assert segments[2].startswith(f"<p>page {i}</p>".encode())
+        assert segments[-2] is footer_data
+        assert segments[-1] == b"</body>"
+
+    segments = pages[0].render_segments("latin-1")
+    assert b"".join(segments) == str(pages[0]).encode("latin-1")
+    assert len(segments) == 2
+    assert BaseElement().render_segments() == []
+
+
+def test_rendered_length():
+    for d in (
+        BaseElement(),
+        e.Div(e.P("è<", class_="à"), e.RawTextNode("<b>ò</b>"), 5),
+        e.P("x", e.RawTextNode("<b>è</b>".encode()), "ò"),
+        e.RawTextNode("è".encode("latin-1"), encoding="latin-1"),
+    ):
+        for encoding in ("utf-8", "latin-1", "utf-16", "utf-16-le"):
+            assert d.rendered_length(encoding) == len(d.render_bytes(encoding))
+    assert e.P("€").rendered_length() == 10
+
+
+def test_render_minify():
+    d = e.Html(
+        e.Head(e.Title("Title"), e.Meta(charset="utf-8")),
+        e.Body(
+            e.Table(
+                e.Colgroup(e.Col()),
+                e.Colgroup(e.Col()),
+                e.Tbody(e.Tr(e.Th("a"), e.Td("b"))),
+                e.Tbody(e.Tr(e.Td("c", colspan=2))),
+            ),
+            e.Ul(e.Li("foo"), e.Li("bar", class_="a b")),
+            e.P("foo"),
+            e.A(e.P("bar"), href="/", title=""),
+            e.P(""),
+            e.Div(e.P("baz"), BaseElement(e.P("qux"))),
+            e.Select(e.Option("a", value=1), e.Option("b", value="x=y")),
+            e.Input(value="`"),
+        ),
+    )
+    assert d.render(minify=True) == (
+        "<!DOCTYPE html><title>Title</title><meta charset=utf-8>"
+        "<table><col><colgroup><col><tr><th>a<td>b<tbody><tr><td colspan=2>c</table>"
+        '<ul><li>foo<li class="a b">bar</ul><p>foo</p>'
+        '<a href=/ title=""><p>bar</p></a><p>'
+        "<div><p>baz</p><p>qux</p></div>"
+        '<select><option value=1>a<option value="x=y">b</select><input value="`">'
+    )
+    assert d.render() == str(d)
+
+    # Tags are kept when the next sibling or the content is unknown
+    d = e.Html(e.Body(e.P("foo"), e.RawTextNode(" ")), lang="en")
+    assert d.render(minify=True) == "<!DOCTYPE html><html lang=en><p>foo</p> "
+    body = e.Body(e.Script(), e.Div(e.P("foo")), e.Ol(e.Li("foo")))
+    assert body.render(minify=True) == (
+        "<body><script></script><div><p>foo</div><ol><li>foo</ol></body>"
+    )
+    assert e.Li(e.Br()).render(minify=True) == "<li><br></li>"
+
+
+def test_render_minify_whitespace():
+    d = e.Div(
+        "foo \n\t bar ",
+        e.Pre(" foo\n\n", e.B("  bar  ")),
+        e.Textarea("a  b"),
+        e.Script("if (a  <  b) {}"),
+        e.Pre("x" * 100000),
+        " <baz> ",
+    )
+    assert d.render(minify=True) == (
+        "<div>foo bar <pre> foo\n\n<b>  bar  </b></pre><textarea>a  b</textarea>"
+        "<script>if (a  &lt;  b) {}</script>"
+        f"<pre>{'x' * 100000}</pre> &lt;baz&gt; </div>"
+    )
+    assert e.Html(e.Body(" foo")).render(minify=True) == "<!DOCTYPE html><body> foo"
+
+
+def test_render_minify_streaming():
+    d = e.Html(e.Head(e.Title("Title")), e.Body(e.P("foo"), e.P("bar")))
+    assert list(d.iter_render(8192, flush_after=["head"], minify=True)) == [
+        "<!DOCTYPE html><title>Title</title></head>",
+        "<p>foo<p>bar",
+    ]
+    fp = io.StringIO()
+    d.write_to(fp, minify=True)
+    assert fp.getvalue() == d.render(minify=True)
+
+
+def test_render_cache():
+    item = e.Li("foo")
+    nav = e.Nav(e.Ul(item, e.Li("bar")), _cache=True)
+    page = e.Body(nav, e.Main("baz"), _cache=True)
+    expected = (
+        "<body><nav><ul><li>foo</li><li>bar</li></ul></nav><main>baz</main></body>"
+    )
+    assert str(page) == expected
+    assert str(page) == expected
+    assert page.cache_info() == (1, 1)
+    assert nav.cache_info() == (0, 1)
+    assert item.cache_info() == (0, 0)
+
+    page[1] = e.Main("qux")
+    assert str(page) == expected.replace("baz", "qux")
+    assert page.cache_info() == (1, 2)
+    assert nav.cache_info() == (1, 1)
+
+    def check() -> None:
+        expected = str(e.Body(e.Nav(e.Ul(item, e.Li("bar"))), e.Main("qux")))
+        assert str(page) == expected
+        assert str(page) == expected
+
+    item.add_class("active")
+    check()
+    item.remove_class("active")
+    check()
+    item.insert(0, e.B("foo"))
+    check()
+    item.add("bar")
+    check()
+    item["title"] = "foo"
+    check()
+    del item["title"]
+    check()
+    del item[0]
+    check()
+    item[:] = [e.I("foo")]
+    check()
+    cast("e.TextNode", item[0][0]).text = "bar"
+    check()
+    assert page.cache_info() == (10, 11)
+
+
+def test_render_cache_shared():
+    shared = e.P("foo")
+    first = e.Div(shared, _cache=True)
+    second = e.Div(shared, _cache=True)
+    assert str(first) == str(second) == "<div><p>foo</p></div>"
+    shared.add("bar")
+    assert str(first) == str(second) == "<div><p>foobar</p></div>"
+
+    # Removed children no longer invalidate their former parents
+    del first[0]
+    shared.add("baz")
+    assert str(first) == "<div></div>"
+    assert str(first) == "<div></div>"
+    assert first.cache_info() == (1, 3)
+    assert str(second) == "<div><p>foobarbaz</p></div>"
+
+    second[0] = e.P("qux")
+    assert str(second) == "<div><p>qux</p></div>"
+    shared.add("foo")
+    assert str(second) == "<div><p>qux</p></div>"
+    assert second.cache_info() == (1, 4)
+
+    # Elements without a render cache are not tracked, and references to parents
+    # which no longer exist are dropped when the element is modified
+    e.Div(shared)
+    assert shared._parents == []  # noqa: SLF001
+    for _ in range(3):
+        e.Div(shared, _cache=True)
+    assert len(shared._parents) == 3  # noqa: SLF001
+    shared.add("bar")
+    assert shared._parents == []  # noqa: SLF001
+
+
+def test_render_cache_tracking():
+    # Elements only keep track of their parents once they are inside an element with a
+    # render cache, which is also the case for elements shared by several parents
+    icon = e.I()
+    row = e.Tr(e.Td(icon), e.Td(icon))
+    assert icon._parents is None  # noqa: SLF001
+    caption = e.Caption("foo").freeze()
+    table = e.Table(caption, e.Tbody(row, row), _cache=True)
+    parents = cast("list[weakref.ref[BaseElement]]", icon._parents)  # noqa: SLF001
+    assert set(parents) == {weakref.ref(row[0]), weakref.ref(row[1])}
+    rows = "<tr><td><i></i></td><td><i></i></td></tr>" * 2
+    assert str(table) == f"<table>{caption}<tbody>{rows}</tbody></table>"
+    icon.add("x")
+    rows = rows.replace("<i>", "<i>x")
+    assert str(table) == f"<table>{caption}<tbody>{rows}</tbody></table>"
+    assert table.cache_info() == (0, 2)
+
+    del table[1]
+    icon.add("y")
+    assert str(table) == f"<table>{caption}</table>"
+
+
+def test_render_cache_default():
+    class Nav(e.Nav):
+        _default_cache = True
+
+    nav = Nav(e.P("foo"))
+    assert str(nav) == str(nav) == "<nav><p>foo</p></nav>"
+    assert nav.cache_info() == (1, 1)
+    assert Nav(_cache=False).cache_info() == (0, 0)
+
+
+def test_render_cache_streaming():
+    d = e.Div(e.P("foo"), _cache=True)
+    assert "".join(d.iter_render()) == "<div><p>foo</p></div>"
+    assert d.cache_info() == (0, 1)
+    assert d.render_bytes() == b"<div><p>foo</p></div>"
+    assert "".join(d.iter_render()) == "<div><p>foo</p></div>"
+    assert d.cache_info() == (2, 1)
+
+
+def test_render_cache_flush():
+    # The end tags in `flush_after` still end a chunk once the output is cached
+    head = "<!DOCTYPE html><html><head><title>x</title></head>"
+    html = e.Html(e.Head(e.Title("x")), e.Body("y" * 50), _cache=True)
+    for _ in range(2):
+        chunks = list(html.iter_render(flush_after=["head"]))
+        assert chunks == [head, f"<body>{'y' * 50}</body></html>"]
+        compressed = list(html.iter_compressed(flush_after=["head"]))
+        assert zlib.decompressobj(31).decompress(compressed[0]) == head.encode()
+    assert html.cache_info() == (3, 1)
+
+    # Including when they are at the start or at the end of the cached output
+    d = BaseElement(e.RawTextNode("</head>"), e.Head(_cache=True), "x")
+    for _ in range(2):
+        assert list(d.iter_render(flush_after=["head"])) == [
+            "</head>",
+            "<head></head>",
+            "x",
+        ]
+
+
+def test_freeze():
+    nav = e.Nav(e.A("è", href="/"), e.A("<foo>", href="/foo"))
+    expected = '<nav><a href="/">è</a><a href="/foo">&lt;foo&gt;</a></nav>'
+    with e.Div() as d:
+        frozen = nav.freeze()
+        e.P("foo").freeze()
+    assert str(d) == "<div></div>"
+    assert str(frozen) == expected
+    assert frozen.render_bytes() == expected.encode()
+
+    # The original element can still be modified, without affecting the frozen node
+    nav.add(e.A("bar"))
+    assert str(frozen) == expected
+
+    pages = [e.Body(frozen, e.Main(i)) for i in range(3)]
+    assert str(pages[2]) == f"<body>{expected}<main>2</main></body>"
+    segments = [page.render_segments() for page in pages]
+    assert all(x[1] is segments[0][1] for x in segments)
+    del pages[0][0]
+    assert str(pages[0]) == "<body><main>0</main></body>"
+    assert not frozen._parents  # noqa: SLF001
+
+    assert frozen.freeze("latin-1").render_bytes("latin-1") == expected.encode(
+        "latin-1"
+    )
+
+
+def test_slots():
+    for element in (e.Div(), e.TextNode("foo"), e.RawTextNode("foo"), e.P().freeze()):
+        assert not hasattr(element, "__dict__")
+    assert cast("dict[str, object]", vars(Card("foo"))) == {"title": "foo"}
+
+
+def test_freeze_immutable():
+    frozen = e.P("foo", class_="bar").freeze()
+    with pytest.raises(exc.FrozenElementError):
+        frozen.add("bar")
+    with pytest.raises(exc.FrozenElementError):
+        frozen.insert(0, "bar")
+    with pytest.raises(exc.FrozenElementError):
+        frozen["class"] = "baz"
+    with pytest.raises(exc.FrozenElementError):
+        frozen[0] = "bar"
+    with pytest.raises(exc.FrozenElementError):
+        frozen[:] = ["bar"]
+    with pytest.raises(exc.FrozenElementError):
+        del frozen["class"]
+    with pytest.raises(exc.FrozenElementError):
+        frozen.add_class("baz")
+    with pytest.raises(exc.FrozenElementError):
+        frozen.remove_class("bar")
+    with pytest.raises(exc.FrozenElementError), frozen:
+        pass
+    with pytest.raises(exc.FrozenElementError):
+        frozen.text = "bar"
+    with pytest.raises(exc.FrozenElementError):
+        del frozen.text
+    assert str(frozen) == '<p class="bar">foo</p>'
+
+
+def test_freeze_threads():
+    frozen = e.Header(*(e.A(i, href=f"/{i}") for i in range(100))).freeze()
+
+    def render(i: int) -> str:
+        return str(e.Body(frozen, e.Main(i), frozen))
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(render, range(1000)))
+    assert results == [
+        f"<body>{frozen}<main>{i}</main>{frozen}</body>" for i in range(1000)
+    ]
+
+
+def test_pickle():
+    nav = e.Nav(e.A("è", href="/"), _cache=True)
+    frozen = e.Footer(e.P("foo", class_="bar")).freeze("latin-1")
+    d = e.Html(
+        e.Body(nav, e.Main(e.TextNode("<i>"), e.RawTextNode("<br>"), 5)),
+        frozen,
+    )
+    str(d)
+    copy = cast("BaseElement", pickle.loads(pickle.dumps(d)))
+    # The cached output is not pickled
+    assert copy[0][0].cache_info() == (0, 0)
+    assert str(copy) == str(d)
+    assert copy[1].render_bytes("latin-1") == frozen.render_bytes("latin-1")
+
+    copy[0][0].add(e.A("foo"))
+    assert str(copy[0][0]) == '<nav><a href="/">è</a><a>foo</a></nav>'
+    assert str(nav) == '<nav><a href="/">è</a></nav>'
+
+    depth = 5000
+    deep: BaseElement = e.Span("foo")
+    for _ in range(depth):
+        deep = e.Div(deep, e.Br())
+    assert str(cast("BaseElement", pickle.loads(pickle.dumps(deep)))) == str(deep)
+
+    cards = [Card("foo"), Card("bar")]
+    cards = cast("list[Card]", pickle.loads(pickle.dumps(cards)))
+    assert [x.title for x in cards] == ["foo", "bar"]
+    assert str(cards[1]) == '<card class="card"><h2>bar</h2></card>'
+    badge = cast("Badge", pickle.loads(pickle.dumps(Badge(3))))
+    assert badge.count == 3
+    assert str(badge) == '<badge class="badge">3</badge>'
+
+
+def test_render_parallel():
+    async def fetch() -> str:
+        await asyncio.sleep(0)
+        return "fetched"
+
+    async def resolve(element: BaseElement) -> None:
+        await element._resolve_awaitables()  # noqa: SLF001
+
+    nav = e.Nav(*(e.A(i, href=f"/{i}") for i in range(100)), _cache=True)
+    d = e.Html(
+        e.Body(
+            nav,
+            e.Table(*(e.Tr(e.Td(i), e.Td(e.B(i), class_="x")) for i in range(1000))),
+            e.Footer(e.Span(fetch()), Deferred(lambda: e.P("deferred"))),
+            e.P(*(e.Span(i) for i in range(10))).freeze(),
+            e.Pre("<" * 100000),
+            e.Ul([e.Li(i) for i in range(50)]),
+        )
+    )
+    asyncio.run(resolve(d))
+    expected = str(d)
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(2, spawn) as processes, ThreadPoolExecutor(2) as threads:
+        for executor in (processes, threads):
+            for min_subtree_size in (0, 1, 10, 100, 10000):
+                result = d.render_parallel(executor, min_subtree_size=min_subtree_size)
+                assert result == expected
+    assert nav.cache_info() == (10, 1)
+
+    coro = fetch()
+    with pytest.raises(exc.UnresolvedAwaitableError):
+        e.Div(e.P(coro)).render_parallel(threads)
+    coro.close()
+
+
+def test_escape():
+    node = e.TextNode("foo")
+    d = e.Div(node, e.TextNode("<'&'>"), class_="a&b", title='"foo"')
+    expected = (
+        '<div class="a&amp;b" title="&quot;foo&quot;">'
+        "foo&lt;&#x27;&amp;&#x27;&gt;</div>"
+    )
+    assert str(d) == expected
+    assert str(d) == expected
+    node.text = "<bar>"
+    assert node.text == "<bar>"
+    assert str(d) == expected.replace("foo&lt;", "&lt;bar&gt;&lt;")
+
+
+def test_large_text_node():
+    text = "<a&b>" * 100_000
+    escaped = "&lt;a&amp;b&gt;" * 100_000
+    assert str(e.P(text)) == f"<p>{escaped}</p>"
+    assert str(e.P(e.RawTextNode(text))) == f"<p>{text}</p>"
+    assert "".join(e.P(text).iter_render(1000)) == f"<p>{escaped}</p>"
+
+
+def test_lazy_node():
+    consumed: list[int] = []
+
+    def rows(count: int) -> Iterator[BaseElement]:
+        for i in range(count):
+            consumed.append(i)
+            yield e.Tr(e.Td(i))
+
+    # Generators are consumed while streaming, and only once
+    d: BaseElement = e.Table(e.Tbody(rows(1000)))
+    chunks = d.iter_render(100)
+    assert next(chunks).startswith("<table><tbody><tr><td>0</td></tr>")
+    assert len(consumed) < 10
+    rest = "".join(chunks)
+    assert len(consumed) == 1000
+    assert rest.endswith("<tr><td>999</td></tr></tbody></table>")
+    assert str(d) == "<table><tbody></tbody></table>"
+
+    # Functions are only called when rendering, every time
+    calls: list[bool] = []
+
+    def section() -> BaseElement:
+        calls.append(True)
+        return e.Section("expensive")
+
+    d = e.Main(LazyNode(section), e.P(("foo", 1, e.Br())), [])
+    assert not calls
+    expected = "<main><section>expensive</section><p>foo1<br></p></main>"
+    assert str(d) == expected
+    assert d.render_bytes() == expected.encode()
+    assert calls == [True, True]
+
+    # Functions can return lists, and lists are rendered every time
+    d = e.Ul(LazyNode(lambda: [e.Li("a"), "b"]), [e.Li(i) for i in range(2)])
+    expected = "<ul><li>a</li>b<li>0</li><li>1</li></ul>"
+    assert str(d) == expected
+    assert str(d) == expected
+    assert d.render(minify=True) == "<ul><li>a</li>b<li>0<li>1</li></ul>"
+    ol = cast("BaseElement", pickle.loads(pickle.dumps(e.Ol([e.Li("x")]))))
+    assert str(ol) == "<ol><li>x</li></ol>"
+
+    # Elements created while rendering are not added to open `with` blocks
+    d = e.Tbody(rows(2))
+    with e.Div() as div:
+        assert str(d) == "<tbody><tr><td>0</td></tr><tr><td>1</td></tr></tbody>"
+    assert str(div) == "<div></div>"
+
+    # Elements in a list belong to the node, not to the open `with` block, while the
+    # elements produced by a generator are only created when rendering
+    with e.Div() as div:
+        e.Ul([e.Li(x) for x in "ab"])
+        e.Ol(e.Li(x) for x in "cd")
+    assert str(div) == (
+        "<div><ul><li>a</li><li>b</li></ul><ol><li>c</li><li>d</li></ol></div>"
+    )
+
+    # Pre-built elements produced by a generator in a `with` block are only rendered
+    # once, inside the node
+    lis = [e.Li(i) for i in range(2)]
+    with e.Ul() as ul:
+        e.Div(x for x in lis)
+    assert str(ul) == "<ul><div><li>0</li><li>1</li></div></ul>"
+
+    # Changing an element in a list clears the cache of its ancestors
+    items = [e.Li("x")]
+    d = e.Ul(items, _cache=True)
+    assert str(d) == "<ul><li>x</li></ul>"
+    items[0]["class"] = "k"
+    assert str(d) == '<ul><li class="k">x</li></ul>'
+
+    # Functions, dicts, bytes and other objects are still rendered as text, unless
+    # wrapped in a `LazyNode`
+    assert str(e.P(cast("str", {"a": 1}))) == "<p>{&#x27;a&#x27;: 1}</p>"
+    assert str(e.P(cast("str", section))).startswith("<p>&lt;function ")
+    assert str(e.P(b"<", cast("str", None))) == "<p>b&#x27;&lt;&#x27;None</p>"
+
+
 def test_asyncio():
     async def main() -> None:
         async def task1() -> None:
@@ -298,3 +982,43 @@ def test_asyncio():
     with e.Div(), e.Span():
         e.I()
     asyncio.run(main())
+
+
+def test_arender():
+    async def fetch(value: str, delay: float = 0.2) -> str:
+        await asyncio.sleep(delay)
+        return value
+
+    async def fetch_element() -> BaseElement:
+        await asyncio.sleep(0.2)
+        return e.Span(fetch("nested"), fetch("<escaped>"))
+
+    d = e.Div(e.P(fetch("foo")), fetch_element(), "bar")
+    d.add(fetch("baz"))
+    d[2:2] = [fetch("qux")]
+    start = time.perf_counter()
+    assert (
+        asyncio.run(d.arender())
+        == "<div><p>foo</p><span>nested&lt;escaped&gt;</span>quxbarbaz</div>"
+    )
+    assert time.perf_counter() - start < 0.8
+    assert asyncio.run(d.arender()) == str(d)
+
+    # Awaitables shared by several elements are awaited once
+    shared = e.Span(fetch("foo"))
+    d = e.Div(shared, e.P(shared))
+    assert (
+        asyncio.run(d.arender()) == "<div><span>foo</span><p><span>foo</span></p></div>"
+    )
+
+    node = e.AwaitableNode(fetch("foo"))
+    asyncio.run(node.resolve())
+    asyncio.run(node.resolve())
+    assert node.resolved
+    assert str(node) == "foo"
+
+    coro = fetch("foo")
+    d = e.Div(coro)
+    with pytest.raises(exc.UnresolvedAwaitableError):
+        str(d)
+    coro.close()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import pytest
+
+from domify import html_elements as e
+from domify.base_element import BaseElement, FrozenNode
+from domify.batch import render_many
+
+initialized: list[bool] = []
+navigations: list[FrozenNode] = []
+
+
+def navigation() -> FrozenNode:
+    if not navigations:
+        navigations.append(e.Nav(*(e.A(i, href=f"/{i}") for i in range(10))).freeze())
+    return navigations[0]
+
+
+def page(record: tuple[str, int]) -> BaseElement:
+    name, count = record
+    if count < 0:
+        msg = "Invalid count"
+        raise ValueError(msg)
+    return e.Html(
+        e.Head(e.Title(f"Hello {name}")),
+        e.Body(
+            navigation(),
+            e.P(f"You have {count} new messages", class_="messages"),
+            # Built once per process
+            e.Footer(len(navigations)),
+        ),
+    )
+
+
+def initialize() -> None:
+    initialized.append(True)
+
+
+RECORDS = [(f"user <{i}>", i) for i in range(200)]
+
+
+def test_render_many():
+    expected = [str(page(record)) for record in RECORDS]
+    assert all("<footer>1</footer>" in x for x in expected)
+
+    results = list(render_many(page, iter(RECORDS), workers=2, chunksize=7))
+    assert results == expected
+
+    unordered = list(render_many(page, RECORDS, workers=2, ordered=False))
+    assert sorted(unordered) == list(enumerate(expected))
+
+    encoded = render_many(page, RECORDS, workers=0, encoding="latin-1", minify=True)
+    assert list(encoded) == [
+        page(record).render(minify=True).encode("latin-1") for record in RECORDS
+    ]
+
+    # Each worker builds its navigation once, when it starts
+    encoded = render_many(
+        page, RECORDS, pool="interpreters", encoding="utf-8", initializer=navigation
+    )
+    assert list(encoded) == [x.encode() for x in expected]
+
+    results = list(render_many(page, RECORDS, workers=0, initializer=initialize))
+    assert results == expected
+    assert initialized == [True]
+
+    pairs = render_many(page, RECORDS, workers=0, ordered=False, encoding="utf-8")
+    assert [x for _, x in sorted(pairs)] == [x.encode() for x in expected]
+
+    assert list(render_many(page, [])) == []
+
+
+def test_render_many_errors():
+    records = [*RECORDS, ("foo", -1), *RECORDS]
+    with pytest.raises(ValueError, match="Invalid count"):
+        list(render_many(page, records, workers=2, chunksize=10))
+
+    # Stopping early cancels the chunks which are not being rendered yet
+    for result in render_many(page, iter(RECORDS * 1000), workers=2, chunksize=10):
+        assert result == str(page(RECORDS[0]))
+        break
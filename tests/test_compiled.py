@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from domify import exc
+from domify import html_elements as e
+from domify.base_element import BaseElement
+from domify.compiled import compiled
+
+calls: list[str] = []
+
+
+def card(
+    title: str, count: float, content: BaseElement | str, *, kind: str = "text"
+) -> BaseElement:
+    calls.append(title)
+    return e.Div(
+        e.H2(f"{title}!", title=title),
+        e.Input(type=kind, value=count, disabled=True),
+        content,
+        e.P("footer"),
+        class_=f"card card-{kind}",
+    )
+
+
+compiled_card = compiled(card)
+
+
+def test_compiled():
+    calls.clear()
+    for title, count, content in [
+        ("foo", 1, e.P("bar")),
+        ('<"foo">', 2.5, e.Span(e.I("&"))),
+    ]:
+        assert str(compiled_card(title, count, content)) == str(
+            card(title, count, content)
+        )
+        assert str(compiled_card(title, count, content, kind="radio")) == str(
+            card(title, count, content, kind="radio")
+        )
+        assert str(compiled_card(content=content, count=count, title=title)) == str(
+            card(content=content, count=count, title=title)
+        )
+    # Once for every combination of arguments, and once for every uncompiled call
+    assert len(calls) == 3 + 6
+
+    segments = [
+        e.Div(compiled_card("foo", 1, e.P("bar"))).render_segments(),
+        e.Div(compiled_card("baz", 2, "")).render_segments(),
+    ]
+    assert segments[0][1] is segments[1][1]
+
+
+def test_compiled_raw_text():
+    @compiled
+    def comparison(content: BaseElement | str, title: str) -> BaseElement:
+        return e.P(e.RawTextNode("a < b"), content, title=title)
+
+    # The raw `<` is not the start of a tag, `content` is not an attribute value
+    d = comparison(e.B("c"), "<d>")
+    assert str(d) == '<p title="&lt;d&gt;">a < b<b>c</b></p>'
+    with pytest.raises(TypeError):
+        comparison("c", e.B("d"))  # type: ignore[arg-type]
+
+
+def test_compiled_minify():
+    def link(text: str, title: str) -> BaseElement:
+        return e.A(text, title=title)
+
+    # Whitespace is only collapsed in the text, not in attribute values
+    d = compiled(link)("foo \n bar", "a\n  b")
+    assert d.render(minify=True) == '<a title="a\n  b">foo bar</a>'
+    assert str(d) == str(link("foo \n bar", "a\n  b"))
+
+
+def test_compiled_context_manager():
+    @compiled
+    def paragraph(text: str) -> BaseElement:
+        return e.P(text, e.Br())
+
+    with e.Section() as section:
+        e.H1("foo")
+        paragraph("bar")
+    assert str(section) == "<section><h1>foo</h1><p>bar<br></p></section>"
+
+    assert str(compiled(e.TextNode)("<foo>")) == "&lt;foo&gt;"
+
+
+def test_compiled_awaitable():
+    async def fetch() -> str:
+        await asyncio.sleep(0.1)
+        return "<foo>"
+
+    d = compiled_card("foo", 1, e.P(fetch()))
+    assert asyncio.run(d.arender()) == str(card("foo", 1, e.P("<foo>")))
+
+
+def test_compiled_errors():
+    @compiled
+    def unused(title: str, content: str) -> BaseElement:  # noqa: ARG001
+        return e.P(title)
+
+    @compiled
+    def condition(flag: bool) -> BaseElement:
+        return e.P() if flag else e.Br()
+
+    @compiled
+    def modified(text: str) -> BaseElement:
+        return e.P(text[1:])
+
+    with pytest.raises(exc.CompiledTemplateError, match="`content`"):
+        unused(title="foo", content="bar")
+    with pytest.raises(exc.CompiledTemplateError, match="`#0`"):
+        condition(False)
+    with pytest.raises(exc.CompiledTemplateError, match="modified"):
+        modified("foo")
+    with pytest.raises(TypeError):
+        compiled_card("foo", e.P(), "")  # type: ignore[arg-type]
+
+    @compiled
+    def button(text: str, disabled: bool | None) -> BaseElement:
+        return e.Button(text, disabled=disabled)
+
+    for disabled in (False, True, None):
+        with pytest.raises(exc.CompiledTemplateError, match="boolean"):
+            button("foo", disabled)
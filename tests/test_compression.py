@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import zlib
+from collections.abc import Callable
+from typing import cast
+
+import pytest
+
+from domify import html_elements as e
+from domify.base_element import BaseElement
+from domify.compression import _adler32_combine, _crc32_combine, _SharedText
+from domify.deferred import Deferred
+
+NAV = e.Nav(*(e.A(f"link {i}", href=f"/{i}") for i in range(200))).freeze()
+
+
+def page(main: BaseElement, footer: BaseElement) -> BaseElement:
+    return e.Html(e.Head(e.Title("Title")), e.Body(NAV, main, footer, NAV))
+
+
+def test_iter_compressed():
+    footer = e.Footer(*(e.P(f"footer {i}") for i in range(300)), _cache=True)
+    decompressors: list[tuple[str, Callable[[bytes], bytes]]] = [
+        ("gzip", gzip.decompress),
+        ("deflate", zlib.decompress),
+    ]
+    for content_encoding, decompress in decompressors:
+        for level in (0, 1, 6, 9):
+            d = page(e.Main(*(e.P(f"row {i}") for i in range(1000))), footer)
+            chunks = list(
+                d.iter_compressed(
+                    content_encoding, 4096, flush_after=["head"], level=level
+                )
+            )
+            assert decompress(b"".join(chunks)) == str(d).encode()
+            # The head can be decompressed before the rest of the document arrives
+            decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+            assert decompressor.decompress(chunks[0]) == (
+                b"<!DOCTYPE html><html><head><title>Title</title></head>"
+            )
+
+            compressed = d.iter_compressed(content_encoding, level=level, minify=True)
+            assert decompress(b"".join(compressed)) == d.render(minify=True).encode()
+
+    assert gzip.decompress(b"".join(BaseElement().iter_compressed())) == b""
+    with pytest.raises(ValueError, match="br"):
+        list(e.P().iter_compressed("br"))
+
+
+def test_iter_compressed_shared():
+    nav = e.Nav(*(e.A("è", href=f"/{i}") for i in range(1000))).freeze("latin-1")
+    footer = e.Footer(*(e.P(f"footer {i}") for i in range(1000)), _cache=True)
+    outputs = []
+    for _ in range(3):
+        d = page(nav, footer)
+        outputs.append(b"".join(d.iter_compressed(encoding="latin-1")))
+        assert gzip.decompress(outputs[-1]) == str(d).encode("latin-1")
+
+    # Frozen and cached elements are compressed only once, the first time they are
+    # rendered with the same encodings and compression level
+    compressed = cast("_SharedText", nav._text).compressed  # noqa: SLF001
+    assert list(compressed) == [("gzip", "iso8859-1", 6)]
+    assert outputs[1] == outputs[2]
+
+    d = page(nav, footer)
+    assert gzip.decompress(b"".join(d.iter_compressed())) == str(d).encode()
+    assert len(compressed) == 2
+
+
+def test_iter_compressed_encodings():
+    # Shared text can't be copied as it is with `utf-16`, which starts with a byte
+    # order mark, while `iso2022_jp` has to switch back to ASCII before it
+    for encoding in ("utf-16", "iso2022_jp"):
+        nav = e.Nav(*(e.A("あ", href=f"/{i}") for i in range(1000))).freeze(encoding)
+        d = BaseElement(e.P("x" * 10_000), "あ", nav, "あ")
+        for _ in range(2):
+            compressed = b"".join(d.iter_compressed(encoding=encoding))
+            assert gzip.decompress(compressed) == str(d).encode(encoding)
+
+
+def test_aiter_compressed():
+    async def fetch(value: str, delay: float) -> str:
+        await asyncio.sleep(delay)
+        return value
+
+    async def main() -> list[bytes]:
+        d = e.Div(
+            e.H1(fetch("title", 0.1)),
+            NAV,
+            Deferred(fetch("slow", 0.2), fallback="..."),
+        )
+        return [chunk async for chunk in d.aiter_compressed("deflate", level=9)]
+
+    chunks = asyncio.run(main())
+    expected = e.Div(e.H1("title"), NAV, Deferred("slow", fallback="..."))
+    assert zlib.decompress(b"".join(chunks)) == "".join(expected.iter_render()).encode()
+
+
+def test_checksum_combine():
+    first = b"foo" * 10000
+    second = b"bar baz" * 30000
+    assert _crc32_combine(
+        zlib.crc32(first), zlib.crc32(second), len(second)
+    ) == zlib.crc32(first + second)
+    assert _adler32_combine(
+        zlib.adler32(first), zlib.adler32(second), len(second)
+    ) == zlib.adler32(first + second)
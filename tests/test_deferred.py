@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from domify import html_elements as e
+from domify.deferred import Deferred
+
+SCRIPT = (
+    "<script>(function(i){"
+    "var s=document.getElementById(i),"
+    'e=document.getElementById(i+"-end"),'
+    'c=document.getElementById(i+"-content");'
+    "while(s.nextSibling!==e)s.nextSibling.remove();"
+    "e.replaceWith(...c.content.childNodes);"
+    "s.remove();c.remove();document.currentScript.remove()"
+    '})("domify-deferred-IDX")</script>'
+)
+
+
+def placeholder(idx: int, fallback: str = "") -> str:
+    return (
+        f'<template id="domify-deferred-{idx}"></template>{fallback}'
+        f'<template id="domify-deferred-{idx}-end"></template>'
+    )
+
+
+def fragment(idx: int, content: str) -> str:
+    return (
+        f'<template id="domify-deferred-{idx}-content">{content}</template>'
+        + SCRIPT.replace("IDX", str(idx))
+    )
+
+
+async def fetch(value: str, delay: float) -> str:
+    await asyncio.sleep(delay)
+    return value
+
+
+def test_render():
+    d = e.Div(Deferred(lambda: e.P("foo"), fallback="loading"), e.Span())
+    assert str(d) == "<div><p>foo</p><span></span></div>"
+    assert str(d) == "<div><p>foo</p><span></span></div>"
+
+    with e.Div() as d:
+        Deferred(e.B("bar"), fallback=e.I("baz"))
+    assert str(d) == "<div><b>bar</b></div>"
+
+
+def test_iter_render():
+    calls = []
+
+    def content() -> str:
+        calls.append(1)
+        return "<foo>"
+
+    d = e.Div(Deferred(content, fallback=e.I("loading")), e.Span())
+    chunks = []
+    for chunk in d.iter_render():
+        chunks.append(chunk)
+        if len(chunks) == 1:
+            # The rest of the document is rendered before the deferred content
+            assert (
+                chunk == f"<div>{placeholder(0, '<i>loading</i>')}<span></span></div>"
+            )
+            assert not calls
+    assert chunks[1:] == [fragment(0, "&lt;foo&gt;")]
+    assert calls == [1]
+
+    d = e.Div(Deferred(e.P(Deferred("bar"))), Deferred("baz"))
+    assert "".join(d.iter_render()) == (
+        f"<div>{placeholder(0)}{placeholder(1)}</div>"
+        + fragment(0, f"<p>{placeholder(2)}</p>")
+        + fragment(1, "baz")
+        + fragment(2, "bar")
+    )
+
+
+def test_iter_render_table():
+    # Rows are only kept by the parser in a table or in a template
+    d = e.Table(e.Tbody(e.Tr(e.Td("foo")), Deferred(lambda: e.Tr(e.Td("bar")))))
+    assert "".join(d.iter_render()) == (
+        f"<table><tbody><tr><td>foo</td></tr>{placeholder(0)}</tbody></table>"
+        + fragment(0, "<tr><td>bar</td></tr>")
+    )
+
+
+def test_iter_render_cache():
+    d = e.Div(e.Span(Deferred(e.P("foo")), _cache=True), e.Span("bar", _cache=True))
+    assert str(d) == "<div><span><p>foo</p></span><span>bar</span></div>"
+    # The cached output of elements containing deferred ones is not used when streaming
+    for _ in range(2):
+        assert "".join(d.iter_render()) == (
+            f"<div><span>{placeholder(0)}</span><span>bar</span></div>"
+            + fragment(0, "<p>foo</p>")
+        )
+    assert d[0].cache_info() == (0, 1)
+    assert d[1].cache_info() == (1, 2)
+
+
+def test_iter_render_minify():
+    d = e.Ul(e.Li("foo"), Deferred(lambda: e.Li("bar"), fallback=e.Li("...")))
+    # The siblings of deferred elements are unknown, so their tags are kept
+    assert "".join(d.iter_render(minify=True)) == (
+        "<ul><li>foo</li><template id=domify-deferred-0></template><li>...</li>"
+        "<template id=domify-deferred-0-end></template></ul>"
+        "<template id=domify-deferred-0-content><li>bar</li></template>"
+        + SCRIPT.replace("IDX", "0")
+    )
+
+
+def test_arender():
+    d = e.Div(Deferred(fetch("foo", 0.1)), Deferred(lambda: e.P("bar")))
+    assert asyncio.run(d.arender()) == "<div>foo<p>bar</p></div>"
+
+
+def test_aiter_render():
+    async def main() -> list[str]:
+        d = e.Div(
+            e.H1(fetch("title", 0.1)),
+            Deferred(fetch("slow", 0.4), fallback="..."),
+            Deferred(e.P(fetch("fast", 0.2), Deferred(fetch("nested", 0.1)))),
+        )
+        return [chunk async for chunk in d.aiter_render()]
+
+    assert asyncio.run(main()) == [
+        f"<div><h1>title</h1>{placeholder(0, '...')}{placeholder(1)}</div>",
+        fragment(1, f"<p>fast{placeholder(2)}</p>"),
+        fragment(2, "nested"),
+        fragment(0, "slow"),
+    ]
+
+
+def test_aiter_render_close():
+    async def main() -> None:
+        coro = fetch("slow", 10)
+        async with aclosing(e.Div(Deferred(coro)).aiter_render()) as chunks:
+            async for chunk in chunks:
+                assert chunk == f"<div>{placeholder(0)}</div>"
+                break
+        coro.close()
+
+    asyncio.run(main())
+
+
+def test_aiter_render_error():
+    async def fail() -> str:
+        await asyncio.sleep(0.1)
+        raise ValueError
+
+    async def main() -> None:
+        d = e.Div(Deferred(fail()))
+        async for _ in d.aiter_render():
+            pass
+
+    with pytest.raises(ValueError):  # noqa: PT011
+        asyncio.run(main())
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+import warnings
+from collections.abc import Iterator
+
+import pytest
+
+from domify import exc, validation
+from domify import html_elements as e
+from domify.compiled import compiled
+
+
+@pytest.fixture(autouse=True)
+def restore_mode() -> Iterator[None]:
+    mode = validation.get_mode()
+    yield
+    validation.set_mode(mode)
+
+
+def test_modes():
+    assert validation.get_mode() == "warn"
+    with pytest.warns(exc.InvalidAttributeWarning):
+        e.Div(href="foo.html")
+
+    with validation.using("off"):
+        assert validation.get_mode() == "off"
+        d = e.Div(href="foo.html", translate="foobar")
+        d["hidden"] = 14
+        assert str(d) == '<div href="foo.html" translate="foobar" hidden="14"></div>'
+
+        with validation.using("strict"):
+            with pytest.raises(exc.InvalidAttributeWarning):
+                e.Div(href="foo.html")
+            with pytest.raises(exc.InvalidAttributeValueWarning):
+                e.Div()["translate"] = "foobar"
+            assert str(e.Div(translate="no")) == '<div translate="no"></div>'
+        assert validation.get_mode() == "off"
+    assert validation.get_mode() == "warn"
+
+    validation.set_mode("strict")
+    with pytest.raises(exc.InvalidAttributeValueWarning):
+        e.Input(size=0)
+
+    # Rejected elements are not added to the current `with` block
+    with e.Div() as d:
+        with pytest.raises(exc.InvalidAttributeWarning):
+            e.A("foo", hreff="/")
+        e.A("bar", href="/")
+    assert str(d) == '<div><a href="/">bar</a></div>'
+
+    # Templates are compiled with placeholders as attribute values
+    @compiled
+    def link(url: str) -> e.A:
+        return e.A("link", href=url, tabindex=url)
+
+    assert str(link("/foo")) == '<a href="/foo" tabindex="/foo">link</a>'
+
+    with pytest.raises(ValueError, match="foo"):
+        validation.set_mode("foo")  # type: ignore[arg-type]
+
+
+def test_sampled():
+    validation.set_mode(validation.sampled(0.25))
+    assert validation.get_mode() == validation.Sampled(0.25)
+
+    random.seed(0)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        for _ in range(1000):
+            # All the attributes of an element are validated, or none of them
+            e.Div(href="foo.html", translate="foobar")
+    names = [x for x in caught if isinstance(x.message, exc.InvalidAttributeWarning)]
+    assert 200 < len(names) < 300
+    assert len(caught) == len(names) * 2
+
+    with validation.using(validation.sampled(0)):
+        e.Div(href="foo.html")
+
+    for rate in (-0.1, 1.5):
+        with pytest.raises(ValueError, match="rate"):
+            validation.set_mode(validation.sampled(rate))
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from functools import partial
+
+import pytest
+
+from domify import exc
+from domify import html_elements as e
+from domify import validators as v
+
+
+def test_numbers():
+    assert v.attribute_int(-3)
+    assert not v.attribute_int(2.5)
+    assert not v.attribute_int("3")
+    assert v.attribute_int_ge_zero(0)
+    assert not v.attribute_int_gt_zero(0)
+    assert v.attribute_float(2.5)
+    assert not v.attribute_float_gt_zero(-0.5)
+    # Bounds can still be passed as keyword arguments
+    assert partial(v.attribute_int, ge=0, lt=10)(9)
+    assert not partial(v.attribute_int, ge=0, lt=10)(10)
+    assert not v.attribute_int_ge_zero(5, le=4)
+    assert v.attribute_float(2.5, le=3)
+
+    between = v.attribute_number(ge=0, le=8)
+    assert between(0)
+    assert between(8)
+    assert not between(9)
+
+    step = v.attribute_number(is_float=True, gt=0, keywords=("any",))
+    assert step(0.1)
+    assert step("any")
+    assert not step(0)
+    assert not step("all")
+
+
+def test_strings():
+    assert v.attribute_str("foo")
+    assert not v.attribute_str(True)
+    assert v.attribute_str_ci("FOO", values=("foo",))
+    assert not v.attribute_str("FOO", values=("foo",))
+
+    charset = v.attribute_str_literal_ci("UTF-8")
+    assert charset("utf-8")
+    assert charset("Utf-8")
+    assert not charset("latin-1")
+    assert not charset(True)
+    assert not v.attribute_str_literal("utf-8")("UTF-8")
+
+
+def test_tokens():
+    assert v.attribute_unique_set("foo bar")
+    assert v.attribute_unique_set("")
+    assert not v.attribute_unique_set("foo bar foo")
+    assert not v.attribute_unique_set(False)
+    assert not v.attribute_unique_set_ci("foo FOO")
+    assert v.attribute_unique_set("b,a", values=("a", "b"), sep=",")
+    assert not v.attribute_unique_set("a c", values=("a", "b"))
+    assert v.attribute_unique_set_ci("B A", values=("a", "b"))
+
+    accesskey = v.attribute_tokens("[^ ]")
+    assert accesskey("a")
+    assert accesskey("a b 1")
+    assert not accesskey("a b a")
+    assert not accesskey("ab")
+    assert not accesskey("")
+
+    sandbox = v.attribute_unique_set_literal_ci(
+        "allow-popups", "allow-popups-to-escape-sandbox"
+    )
+    assert sandbox("allow-popups-to-escape-sandbox ALLOW-POPUPS")
+    assert not sandbox("allow-popups Allow-Popups")
+    assert not sandbox("allow-forms")
+    assert v.attribute_unique_set_literal("a", "b", sep=",")("b,a")
+    assert not v.attribute_unique_set_literal("a", "b", sep=",")("b a")
+
+
+def test_combined():
+    positive_or_auto = v.attribute_any(
+        v.attribute_int_gt_zero, v.attribute_str_literal("auto")
+    )
+    assert positive_or_auto(1)
+    assert positive_or_auto("auto")
+    assert not positive_or_auto(0)
+
+    short_tokens = v.attribute_all(v.attribute_unique_set, lambda x: len(str(x)) < 5)
+    assert short_tokens("a b")
+    assert not short_tokens("a b c")
+    assert not short_tokens("a a")
+
+
+def test_custom_element():
+    class Meter(e.HtmlElement):
+        element_attributes = {  # noqa: RUF012
+            "low": partial(v.attribute_int, ge=0),
+            "marks": partial(v.attribute_unique_set, values=("a", "b")),
+        }
+
+    assert str(Meter(low=1, marks="a b")) == '<meter low="1" marks="a b"></meter>'
+    with pytest.warns(exc.InvalidAttributeValueWarning):
+        Meter(low=-1)
+    with pytest.warns(exc.InvalidAttributeValueWarning):
+        Meter(marks="c")